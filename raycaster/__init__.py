@@ -0,0 +1,5 @@
+import os
+
+# pygame prints a banner to stdout on import; keep stdout clean for
+# machine-readable output such as `raycaster bench`.
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
@@ -0,0 +1,35 @@
+"""
+Backend loader: exports the compiled Cython routines when the extension
+has been built, and the pure Python/NumPy reference implementations from
+api.py otherwise. The choice is made once, at import time.
+"""
+
+try:
+    from .cython_backend import (
+        cast_rays,
+        fill_floor_ceiling,
+        fill_textured_columns,
+        fill_textured_floor,
+        fill_wall_columns,
+    )
+
+    BACKEND = "cython"
+except ImportError:
+    from .api import (
+        cast_rays,
+        fill_floor_ceiling,
+        fill_textured_columns,
+        fill_textured_floor,
+        fill_wall_columns,
+    )
+
+    BACKEND = "numpy"
+
+__all__ = [
+    "BACKEND",
+    "cast_rays",
+    "fill_floor_ceiling",
+    "fill_textured_columns",
+    "fill_textured_floor",
+    "fill_wall_columns",
+]
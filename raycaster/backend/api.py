@@ -0,0 +1,214 @@
+"""
+Backend API: the performance-critical routines used by the renderer.
+
+Every function here is the reference (pure Python/NumPy) implementation
+and documents the contract that cython_backend.pyx must match. The
+loader in backend/__init__.py exports the compiled version of each
+routine when the extension is built, and these otherwise.
+
+Conventions shared by all routines:
+
+- grid: 2D C-contiguous integer array indexed [y, x], nonzero = wall.
+- framebuffer: uint8 array of shape (width, height, 3) indexed [x, y],
+  the layout used by pygame.surfarray.
+- Colors are (r, g, b) tuples; palette is a (n, 3) uint8 array indexed
+  by wall id modulo n.
+- Textures come from a TextureAtlas (raycaster.core.textures): texels is
+  its (n, 3) uint8 array holding every mip level of every texture, and
+  level_offsets / level_sizes give each level's first texel and edge
+  length. Within a level, texture t's texel (u, v) is at
+  offset + (t * size + u) * size + v, so a texture column is contiguous.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+from ..core.raycast import RayHits
+from ..core.raycast import cast_rays as _numpy_cast_rays
+
+Color = Tuple[int, int, int]
+
+# Added to world coordinates so truncation floors them in
+# fill_textured_floor (positions are assumed to lie above -CELL_OFFSET).
+CELL_OFFSET = 1 << 20
+
+
+def cast_rays(
+    grid: np.ndarray,
+    pos_x: float,
+    pos_y: float,
+    ray_dx: np.ndarray,
+    ray_dy: np.ndarray,
+    max_distance: Optional[float] = None,
+) -> RayHits:
+    """
+    Trace one ray per element of (ray_dx, ray_dy) from (pos_x, pos_y).
+    Returns RayHits with perpendicular distance, wall id, side, texture u
+    and hit cell per ray; see raycaster.core.raycast for conventions.
+    """
+    return _numpy_cast_rays(grid, pos_x, pos_y, ray_dx, ray_dy, max_distance)
+
+
+def wall_spans(
+    distance: np.ndarray, height: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the (top, bottom) screen rows of the wall slice for each
+    perpendicular distance; rows [top, bottom) are wall.
+    """
+    with np.errstate(divide="ignore"):
+        line_height = np.minimum(height / distance, height)
+    top = ((height - line_height) // 2).astype(np.int32)
+    bottom = ((height + line_height) // 2).astype(np.int32)
+    return top, bottom
+
+
+def fill_wall_columns(
+    framebuffer: np.ndarray,
+    x0: int,
+    distance: np.ndarray,
+    side: np.ndarray,
+    wall: np.ndarray,
+    palette: np.ndarray,
+) -> None:
+    """
+    Draw flat-shaded wall slices into framebuffer columns
+    [x0, x0 + len(distance)). Slices are centered vertically and are
+    height / distance rows tall; y-side hits are drawn at half brightness.
+    Rows outside each slice are left untouched.
+    """
+    height = framebuffer.shape[1]
+    top, bottom = wall_spans(distance, height)
+    colors = palette[wall % len(palette)]
+    colors[side == 1] //= 2
+    rows = np.arange(height)
+    mask = (rows >= top[:, None]) & (rows < bottom[:, None])
+    x1 = x0 + distance.shape[0]
+    strip = framebuffer[x0:x1]
+    np.copyto(strip, colors[:, None, :], where=mask[:, :, None])
+
+
+def mip_levels(line_height: np.ndarray, level_sizes: np.ndarray) -> np.ndarray:
+    """
+    Mip level for wall slices line_height rows tall: the finest level
+    with no more than one texel per screen row.
+    """
+    with np.errstate(divide="ignore"):
+        ratio = level_sizes[0] / line_height
+        level = np.floor(np.log2(np.maximum(ratio, 1.0)))
+    return np.minimum(level, len(level_sizes) - 1).astype(np.intp)
+
+
+def fill_textured_columns(
+    framebuffer: np.ndarray,
+    x0: int,
+    distance: np.ndarray,
+    side: np.ndarray,
+    wall: np.ndarray,
+    tex_u: np.ndarray,
+    texels: np.ndarray,
+    level_offsets: np.ndarray,
+    level_sizes: np.ndarray,
+    num_textures: int,
+) -> None:
+    """
+    Draw texture-mapped wall slices into framebuffer columns
+    [x0, x0 + len(distance)), covering the same rows as
+    fill_wall_columns. Wall id w uses texture (w - 1) % num_textures,
+    sampled at column tex_u from the mip level chosen by mip_levels;
+    y-side hits are drawn at half brightness.
+    """
+    height = framebuffer.shape[1]
+    top, bottom = wall_spans(distance, height)
+    with np.errstate(divide="ignore"):
+        line = height / distance
+    level = mip_levels(line, level_sizes)
+    size = level_sizes[level]
+    texture = (wall.astype(np.intp) - 1) % num_textures
+    u = np.minimum((tex_u * size).astype(np.intp), size - 1)
+    base = level_offsets[level] + (texture * size + u) * size
+
+    rows = np.arange(height)
+    mask = (rows >= top[:, None]) & (rows < bottom[:, None])
+    # Texture row of every screen row, from the unclipped slice top
+    with np.errstate(divide="ignore", invalid="ignore"):
+        v = (rows - (height - line[:, None]) / 2.0) / line[:, None]
+    v = np.where(mask, v * size[:, None], 0.0).astype(np.intp)
+    np.clip(v, 0, size[:, None] - 1, out=v)
+    colors = texels[base[:, None] + v]
+    colors[side == 1] //= 2
+    x1 = x0 + distance.shape[0]
+    strip = framebuffer[x0:x1]
+    np.copyto(strip, colors, where=mask[:, :, None])
+
+
+def fill_textured_floor(
+    framebuffer: np.ndarray,
+    x0: int,
+    ray_dx: np.ndarray,
+    ray_dy: np.ndarray,
+    pos_x: float,
+    pos_y: float,
+    first_row: int,
+    scale: np.ndarray,
+    level_offsets: np.ndarray,
+    level_sizes: np.ndarray,
+    texels: np.ndarray,
+    floor_texture: int,
+    ceiling_texture: int,
+) -> None:
+    """
+    Texture the floor rows [first_row, height) of framebuffer columns
+    [x0, x0 + len(ray_dx)), and the ceiling rows mirroring them across
+    the horizon, given each column's ray direction. Per floor row,
+    scale is the floor distance times the mip edge (texels per unit of
+    ray) and level_offsets / level_sizes give its mip level (see
+    FloorCaster.table). The floor point of column x in row y lies at
+    (pos + ray * distance), wrapped to its cell; texture floor_texture
+    is drawn below the horizon and ceiling_texture above.
+    """
+    height = framebuffer.shape[1]
+    size = level_sizes
+    # Floor texel coordinates, (columns, rows): world coordinates in
+    # texels of each row's mip level, wrapped to the cell
+    u = np.multiply.outer(ray_dx, scale)
+    u += (pos_x + CELL_OFFSET) * size
+    v = np.multiply.outer(ray_dy, scale)
+    v += (pos_y + CELL_OFFSET) * size
+    texel = u.astype(np.intp)
+    texel &= size - 1
+    texel *= size
+    v_texel = v.astype(np.intp)
+    v_texel &= size - 1
+    texel += v_texel
+    texel += level_offsets
+    level_area = size * size
+    x1 = x0 + len(ray_dx)
+    # Gather whole 3-byte texels at once
+    whole = texels.view("V3").ravel()
+    colors = framebuffer.view("V3")[..., 0]
+    # Floor rows run down to the bottom edge; the ceiling rows mirror
+    # them across the horizon, from the top edge down
+    mirrored = height - first_row
+    colors[x0:x1, first_row:] = np.take(
+        whole, texel + floor_texture * level_area
+    )
+    texel += ceiling_texture * level_area
+    colors[x0:x1, :mirrored] = np.take(whole, texel[:, ::-1])
+
+
+def fill_floor_ceiling(
+    framebuffer: np.ndarray,
+    x0: int,
+    x1: int,
+    ceiling: Color,
+    floor: Color,
+) -> None:
+    """
+    Fill framebuffer columns [x0, x1): the upper half with the ceiling
+    color and the lower half with the floor color.
+    """
+    horizon = framebuffer.shape[1] // 2
+    framebuffer[x0:x1, :horizon] = ceiling
+    framebuffer[x0:x1, horizon:] = floor
@@ -0,0 +1,339 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+# cython: cdivision=True, initializedcheck=False
+"""
+Compiled implementations of the routines declared in api.py.
+Signatures and results match api.py exactly; the inner loops run
+without the GIL.
+
+Build in place with:
+    poetry run cythonize -i raycaster/backend/cython_backend.pyx
+"""
+
+import numpy as np
+
+from libc.math cimport INFINITY
+from libc.math cimport floor as cfloor
+from libc.math cimport log2
+
+from ..core.raycast import RayHits
+from .api import CELL_OFFSET
+
+ctypedef fused grid_t:
+    unsigned char
+    unsigned short
+    int
+    long long
+
+# Grid dtypes with a compiled specialization; others are widened first
+_GRID_DTYPES = tuple(
+    np.dtype(t) for t in (np.uint8, np.uint16, np.intc, np.longlong)
+)
+
+
+cdef inline void _cast_one(
+    const grid_t[:, ::1] grid,
+    double pos_x,
+    double pos_y,
+    double ray_dx,
+    double ray_dy,
+    double max_distance,
+    double* out_distance,
+    int* out_wall,
+    signed char* out_side,
+    double* out_u,
+    int* out_x,
+    int* out_y,
+) noexcept nogil:
+    cdef Py_ssize_t rows = grid.shape[0], cols = grid.shape[1]
+    cdef long map_x = <long>cfloor(pos_x), map_y = <long>cfloor(pos_y)
+    cdef double delta_x = INFINITY, delta_y = INFINITY
+    cdef double side_x = INFINITY, side_y = INFINITY
+    cdef double dist, wall_pos, u
+    cdef long step_x = 1, step_y = 1, cell
+    cdef signed char side
+
+    if ray_dx != 0:
+        delta_x = 1.0 / ray_dx if ray_dx > 0 else -1.0 / ray_dx
+        if ray_dx < 0:
+            step_x = -1
+            side_x = (pos_x - map_x) * delta_x
+        else:
+            side_x = (map_x + 1.0 - pos_x) * delta_x
+    if ray_dy != 0:
+        delta_y = 1.0 / ray_dy if ray_dy > 0 else -1.0 / ray_dy
+        if ray_dy < 0:
+            step_y = -1
+            side_y = (pos_y - map_y) * delta_y
+        else:
+            side_y = (map_y + 1.0 - pos_y) * delta_y
+
+    while True:
+        if side_x < side_y:
+            map_x += step_x
+            dist = side_x
+            side = 0
+            side_x += delta_x
+        else:
+            map_y += step_y
+            dist = side_y
+            side = 1
+            side_y += delta_y
+        if dist > max_distance:
+            out_distance[0] = INFINITY
+            out_wall[0] = 0
+            out_side[0] = 0
+            out_u[0] = 0.0
+            out_x[0] = map_x
+            out_y[0] = map_y
+            return
+        if 0 <= map_y < rows and 0 <= map_x < cols:
+            cell = <long>grid[map_y, map_x]
+        else:
+            cell = -1
+        if cell != 0:
+            if side == 0:
+                wall_pos = pos_y + dist * ray_dy
+            else:
+                wall_pos = pos_x + dist * ray_dx
+            u = wall_pos - cfloor(wall_pos)
+            if (side == 0 and ray_dx > 0) or (side == 1 and ray_dy < 0):
+                u = 1.0 - u
+            out_distance[0] = dist
+            out_wall[0] = cell
+            out_side[0] = side
+            out_u[0] = u
+            out_x[0] = map_x
+            out_y[0] = map_y
+            return
+
+
+def _cast_rays(
+    const grid_t[:, ::1] grid,
+    double pos_x,
+    double pos_y,
+    const double[::1] ray_dx,
+    const double[::1] ray_dy,
+    double max_distance,
+):
+    cdef Py_ssize_t n = ray_dx.shape[0], i
+    distance = np.empty(n, dtype=np.float64)
+    wall = np.empty(n, dtype=np.int32)
+    side = np.empty(n, dtype=np.int8)
+    tex_u = np.empty(n, dtype=np.float64)
+    map_x = np.empty(n, dtype=np.int32)
+    map_y = np.empty(n, dtype=np.int32)
+    cdef double[::1] distance_v = distance, tex_u_v = tex_u
+    cdef int[::1] wall_v = wall, map_x_v = map_x, map_y_v = map_y
+    cdef signed char[::1] side_v = side
+    with nogil:
+        for i in range(n):
+            _cast_one(
+                grid,
+                pos_x,
+                pos_y,
+                ray_dx[i],
+                ray_dy[i],
+                max_distance,
+                &distance_v[i],
+                &wall_v[i],
+                &side_v[i],
+                &tex_u_v[i],
+                &map_x_v[i],
+                &map_y_v[i],
+            )
+    return RayHits(distance, wall, side, tex_u, map_x, map_y)
+
+
+def cast_rays(grid, pos_x, pos_y, ray_dx, ray_dy, max_distance=None):
+    """Compiled cast_rays; see api.cast_rays."""
+    grid = np.asarray(grid)
+    if grid.dtype not in _GRID_DTYPES:
+        grid = grid.astype(np.int64)
+    return _cast_rays(
+        np.ascontiguousarray(grid),
+        pos_x,
+        pos_y,
+        np.ascontiguousarray(ray_dx, dtype=np.float64),
+        np.ascontiguousarray(ray_dy, dtype=np.float64),
+        INFINITY if max_distance is None else max_distance,
+    )
+
+
+def fill_wall_columns(
+    unsigned char[:, :, :] framebuffer,
+    int x0,
+    const double[::1] distance,
+    const signed char[::1] side,
+    const int[::1] wall,
+    const unsigned char[:, ::1] palette,
+):
+    """Compiled fill_wall_columns; see api.fill_wall_columns."""
+    cdef Py_ssize_t n = distance.shape[0], i, y, top, bottom
+    cdef Py_ssize_t height = framebuffer.shape[1]
+    cdef Py_ssize_t colors = palette.shape[0], c
+    cdef double line
+    cdef unsigned char r, g, b
+    with nogil:
+        for i in range(n):
+            line = height / distance[i]
+            if line > height:
+                line = height
+            top = <Py_ssize_t>cfloor((height - line) / 2.0)
+            bottom = <Py_ssize_t>cfloor((height + line) / 2.0)
+            c = wall[i] % colors
+            if c < 0:
+                c += colors
+            r = palette[c, 0]
+            g = palette[c, 1]
+            b = palette[c, 2]
+            if side[i] == 1:
+                r //= 2
+                g //= 2
+                b //= 2
+            for y in range(top, bottom):
+                framebuffer[x0 + i, y, 0] = r
+                framebuffer[x0 + i, y, 1] = g
+                framebuffer[x0 + i, y, 2] = b
+
+
+def fill_textured_columns(
+    unsigned char[:, :, :] framebuffer,
+    int x0,
+    const double[::1] distance,
+    const signed char[::1] side,
+    const int[::1] wall,
+    const double[::1] tex_u,
+    const unsigned char[:, ::1] texels,
+    const long long[::1] level_offsets,
+    const long long[::1] level_sizes,
+    long long num_textures,
+):
+    """Compiled fill_textured_columns; see api.fill_textured_columns."""
+    cdef Py_ssize_t n = distance.shape[0], i, y, top, bottom
+    cdef Py_ssize_t height = framebuffer.shape[1]
+    cdef Py_ssize_t levels = level_sizes.shape[0], level
+    cdef long long size, texture, u, v, base, t
+    cdef double line, clipped, ratio, start
+    cdef bint dark
+    with nogil:
+        for i in range(n):
+            line = height / distance[i]
+            clipped = line
+            if clipped > height:
+                clipped = height
+            top = <Py_ssize_t>cfloor((height - clipped) / 2.0)
+            bottom = <Py_ssize_t>cfloor((height + clipped) / 2.0)
+            if bottom <= top:
+                continue
+            ratio = level_sizes[0] / line
+            level = 0
+            if ratio > 1.0:
+                level = <Py_ssize_t>cfloor(log2(ratio))
+                if level > levels - 1:
+                    level = levels - 1
+            size = level_sizes[level]
+            texture = (wall[i] - 1) % num_textures
+            if texture < 0:
+                texture += num_textures
+            u = <long long>(tex_u[i] * size)
+            if u > size - 1:
+                u = size - 1
+            base = level_offsets[level] + (texture * size + u) * size
+            start = (height - line) / 2.0
+            dark = side[i] == 1
+            for y in range(top, bottom):
+                v = <long long>((y - start) / line * size)
+                if v < 0:
+                    v = 0
+                elif v > size - 1:
+                    v = size - 1
+                t = base + v
+                if dark:
+                    framebuffer[x0 + i, y, 0] = texels[t, 0] // 2
+                    framebuffer[x0 + i, y, 1] = texels[t, 1] // 2
+                    framebuffer[x0 + i, y, 2] = texels[t, 2] // 2
+                else:
+                    framebuffer[x0 + i, y, 0] = texels[t, 0]
+                    framebuffer[x0 + i, y, 1] = texels[t, 1]
+                    framebuffer[x0 + i, y, 2] = texels[t, 2]
+
+
+def fill_textured_floor(
+    unsigned char[:, :, :] framebuffer,
+    int x0,
+    const double[::1] ray_dx,
+    const double[::1] ray_dy,
+    double pos_x,
+    double pos_y,
+    int first_row,
+    const double[::1] scale,
+    const long long[::1] level_offsets,
+    const long long[::1] level_sizes,
+    const unsigned char[:, ::1] texels,
+    long long floor_texture,
+    long long ceiling_texture,
+):
+    """Compiled fill_textured_floor; see api.fill_textured_floor."""
+    cdef Py_ssize_t n = ray_dx.shape[0], i, j, y, mirror
+    cdef Py_ssize_t height = framebuffer.shape[1]
+    cdef Py_ssize_t rows = height - first_row
+    if rows <= 0:
+        return
+    # Per-row terms, computed as api.fill_textured_floor does
+    sizes = np.asarray(level_sizes)
+    cdef const double[::1] base_u = (pos_x + CELL_OFFSET) * sizes
+    cdef const double[::1] base_v = (pos_y + CELL_OFFSET) * sizes
+    cdef const long long[::1] floor_at = (
+        np.asarray(level_offsets) + floor_texture * sizes * sizes
+    )
+    cdef const long long[::1] ceiling_at = (
+        np.asarray(level_offsets) + ceiling_texture * sizes * sizes
+    )
+    cdef long long size, mask, t, f, c
+    cdef double dx, dy
+    with nogil:
+        for i in range(n):
+            dx = ray_dx[i]
+            dy = ray_dy[i]
+            # Down the column: its rows are contiguous in the framebuffer
+            for j in range(rows):
+                size = level_sizes[j]
+                mask = size - 1
+                t = (
+                    ((<long long>(dx * scale[j] + base_u[j])) & mask) * size
+                    + ((<long long>(dy * scale[j] + base_v[j])) & mask)
+                )
+                f = floor_at[j] + t
+                c = ceiling_at[j] + t
+                y = first_row + j
+                mirror = height - 1 - y
+                framebuffer[x0 + i, y, 0] = texels[f, 0]
+                framebuffer[x0 + i, y, 1] = texels[f, 1]
+                framebuffer[x0 + i, y, 2] = texels[f, 2]
+                framebuffer[x0 + i, mirror, 0] = texels[c, 0]
+                framebuffer[x0 + i, mirror, 1] = texels[c, 1]
+                framebuffer[x0 + i, mirror, 2] = texels[c, 2]
+
+
+def fill_floor_ceiling(
+    unsigned char[:, :, :] framebuffer,
+    int x0,
+    int x1,
+    ceiling,
+    floor,
+):
+    """Compiled fill_floor_ceiling; see api.fill_floor_ceiling."""
+    cdef Py_ssize_t x, y, height = framebuffer.shape[1]
+    cdef Py_ssize_t horizon = height // 2
+    cdef unsigned char cr = ceiling[0], cg = ceiling[1], cb = ceiling[2]
+    cdef unsigned char fr = floor[0], fg = floor[1], fb = floor[2]
+    with nogil:
+        for x in range(x0, x1):
+            for y in range(horizon):
+                framebuffer[x, y, 0] = cr
+                framebuffer[x, y, 1] = cg
+                framebuffer[x, y, 2] = cb
+            for y in range(horizon, height):
+                framebuffer[x, y, 0] = fr
+                framebuffer[x, y, 1] = fg
+                framebuffer[x, y, 2] = fb
@@ -0,0 +1,333 @@
+"""
+Headless rendering benchmark: `raycaster bench`.
+
+Drives the player along a deterministic camera path for a fixed number
+of frames with no frame cap, rendering headless, and prints (or writes)
+a JSON report with frames/sec, per-phase timing percentiles and peak
+memory for every combination of the requested resolutions, worker
+counts and raycast engines, so runs can be compared directly:
+
+    raycaster bench --resolution 320x240 640x480 --workers 1 4 \\
+        --engine backend numpy --frames 300 --output bench.json
+
+Camera paths are "spin" (turn in place at the map's start position),
+"walk" (seeded random walk that turns away from walls) or a JSON file of
+[x, y, angle] poses, e.g. one saved by PathRecorder during a play
+session.
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import backend
+from .core.config import EngineConfig
+from .core.engine import load_map
+from .core.player import Player
+from .core.profiler import FrameProfiler, clock
+from .core.raycast import RAYCAST_ENGINES
+from .core.renderer import Renderer
+
+Pose = Tuple[float, float, float]
+
+DEFAULT_MAP = os.path.join(
+    os.path.dirname(__file__), "examples", "maps", "basic_map.json"
+)
+
+
+def spin_path(start: Sequence[float], frames: int) -> List[Pose]:
+    """One full turn in place at start."""
+    x, y = start
+    return [(x, y, 2 * math.pi * i / frames) for i in range(frames)]
+
+
+def walk_path(
+    game_map, start: Sequence[float], frames: int, seed: int = 0
+) -> List[Pose]:
+    """
+    Seeded random walk: move forward, drift the heading slightly and
+    turn by a random angle whenever the next step would enter a wall.
+    """
+    rng = random.Random(seed)
+    x, y = start
+    angle = 0.0
+    speed = 0.05
+    poses = []
+    for _ in range(frames):
+        poses.append((x, y, angle))
+        angle += rng.uniform(-0.02, 0.02)
+        for _ in range(16):
+            nx = x + math.cos(angle) * speed
+            ny = y + math.sin(angle) * speed
+            if not game_map.is_wall(nx, ny):
+                x, y = nx, ny
+                break
+            angle += rng.uniform(math.pi / 4, math.pi)
+    return poses
+
+
+def load_path(path: str, frames: int) -> List[Pose]:
+    """Recorded poses from a JSON file, cycled to frames entries."""
+    with open(path, "r") as f:
+        data = json.load(f)
+    poses = data["poses"] if isinstance(data, dict) else data
+    if not poses:
+        raise ValueError(f"Camera path has no poses: {path}")
+    return [tuple(poses[i % len(poses)]) for i in range(frames)]
+
+
+def camera_path(name: str, game_map, frames: int, seed: int = 0) -> List[Pose]:
+    """Resolve a path name ("spin", "walk") or JSON file to poses."""
+    if name == "spin":
+        return spin_path(game_map.start_position, frames)
+    if name == "walk":
+        return walk_path(game_map, game_map.start_position, frames, seed)
+    return load_path(name, frames)
+
+
+class PathRecorder:
+    """
+    Post-update hook that records the player's pose every frame:
+        recorder = PathRecorder(engine.player)
+        engine.register_post_update(recorder)
+        ...
+        recorder.save("path.json")
+    """
+
+    def __init__(self, player: Player):
+        self.player = player
+        self.poses: List[Pose] = []
+
+    def __call__(self):
+        p = self.player
+        self.poses.append((p.x, p.y, p.angle))
+
+    def save(self, path: str):
+        with open(path, "w") as f:
+            json.dump({"poses": self.poses}, f)
+
+
+def _peak_rss_linux() -> Optional[float]:
+    """VmHWM of this process image in MiB, or None off Linux."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _max_rss_mb() -> Dict[str, Optional[float]]:
+    """
+    Peak resident set size of this process and its reaped children over
+    the whole process lifetime, not just the current run. On Linux the
+    own figure is VmHWM, since ru_maxrss also carries the peak of the
+    process that spawned us across exec.
+    """
+    try:
+        import resource
+    except ImportError:  # Windows
+        return {"self": None, "children": None}
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    peak = _peak_rss_linux()
+    if peak is None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+    return {
+        "self": peak,
+        "children": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        / scale,
+    }
+
+
+def run_benchmark(
+    map_path: str,
+    resolution: Tuple[int, int],
+    num_workers: int,
+    engine: str,
+    poses: Sequence[Pose],
+    warmup: int = 10,
+    trace_memory: bool = False,
+    chunk_size: int = 32,
+) -> dict:
+    """
+    Render one frame per pose headless and return the run's report.
+    Warm-up frames (from the start of the path) are not measured. The
+    max_rss figures cover the calling process's lifetime; main runs
+    each combination in a fresh process (see run_isolated) so they
+    belong to that run alone.
+    """
+    config = EngineConfig(
+        resolution=resolution,
+        map_path=map_path,
+        num_workers=num_workers,
+        chunk_size=chunk_size,
+        raycast_engine=engine,
+    )
+    game_map = load_map(map_path)
+    player = Player(game_map.start_position)
+    renderer = Renderer(game_map, player, config, headless=True)
+    profiler = FrameProfiler(window=max(len(poses), 1), enabled=False)
+    renderer.profiler = profiler
+    try:
+        for x, y, angle in poses[:warmup]:
+            player.x, player.y, player.angle = x, y, angle
+            renderer.render_frame()
+
+        if trace_memory:
+            tracemalloc.start()
+        profiler.enabled = True
+        started = time.perf_counter()
+        for x, y, angle in poses:
+            frame_start = clock()
+            player.x, player.y, player.angle = x, y, angle
+            renderer.render_frame()
+            mark = profiler.lap("render", frame_start)
+            renderer.flip()
+            profiler.lap("flip", mark)
+            profiler.lap("frame", frame_start)
+        seconds = time.perf_counter() - started
+        traced_peak = None
+        if trace_memory:
+            traced_peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+            tracemalloc.stop()
+    finally:
+        renderer.cleanup()
+        if hasattr(game_map, "close"):
+            game_map.close()
+
+    return {
+        "resolution": list(resolution),
+        "num_workers": num_workers,
+        "engine": engine,
+        "frames": len(poses),
+        "seconds": seconds,
+        "fps": len(poses) / seconds if seconds > 0 else None,
+        "phases": profiler.stats(),
+        "peak_memory_mb": {
+            "traced": traced_peak,
+            "max_rss": _max_rss_mb(),
+        },
+    }
+
+
+def run_isolated(*args, **kwargs) -> dict:
+    """run_benchmark in a fresh spawned process, for per-run max_rss."""
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(run_benchmark, *args, **kwargs).result()
+
+
+def _resolution(text: str) -> Tuple[int, int]:
+    try:
+        width, height = map(int, text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "Invalid resolution format. Use WIDTHxHEIGHT, e.g., 800x600."
+        ) from None
+    return width, height
+
+
+def main(argv=None):
+    """Parse bench arguments, run every combination and emit JSON."""
+    parser = argparse.ArgumentParser(
+        prog="raycaster bench", description="Headless rendering benchmark"
+    )
+    parser.add_argument("--map", default=DEFAULT_MAP, help="Map to render")
+    parser.add_argument(
+        "--resolution",
+        type=_resolution,
+        nargs="+",
+        default=[(640, 480)],
+        help="One or more resolutions, e.g. 320x240 640x480",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=[1],
+        help="One or more render worker counts",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=RAYCAST_ENGINES,
+        nargs="+",
+        default=["backend"],
+        help="One or more raycast engines",
+    )
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument(
+        "--path",
+        default="walk",
+        help='Camera path: "spin", "walk" or a JSON file of poses',
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Also track peak Python/NumPy allocations (slower frames)",
+    )
+    parser.add_argument("--output", help="Write the JSON report here")
+    args = parser.parse_args(argv)
+
+    poses = camera_path(args.path, load_map(args.map), args.frames, args.seed)
+    runs = []
+    for resolution in args.resolution:
+        for workers in args.workers:
+            for engine in args.engine:
+                run = run_isolated(
+                    args.map,
+                    resolution,
+                    workers,
+                    engine,
+                    poses,
+                    warmup=args.warmup,
+                    trace_memory=args.trace_memory,
+                )
+                print(
+                    f"[Bench] {resolution[0]}x{resolution[1]} "
+                    f"workers={workers} engine={engine}: "
+                    f"{run['fps']:.1f} fps",
+                    file=sys.stderr,
+                )
+                runs.append(run)
+
+    report = {
+        "meta": {
+            "map": args.map,
+            "path": args.path,
+            "seed": args.seed,
+            "frames": args.frames,
+            "backend": backend.BACKEND,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "runs": runs,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+    return report
+
+
+if __name__ == "__main__":
+    main()
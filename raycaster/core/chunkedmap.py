@@ -0,0 +1,260 @@
+"""
+ChunkedGameMap: an open-world map streamed from disk tile by tile.
+"""
+
+import json
+import math
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+import numpy as np
+
+from .map import BORDER_WALL
+from .mapformat import MANIFEST, tile_filename
+
+TileKey = Tuple[int, int]
+
+
+class ChunkedGameMap:
+    """
+    Map stored as fixed-size tiles in a directory (see
+    mapformat.write_chunked_map) and loaded on demand.
+
+    Tiles live in a bounded LRU cache. The renderer marches rays through
+    a window of (2 * view_radius + 1)^2 tiles centred on the player's
+    tile (raycast_view); rays that leave the window hit nothing (the
+    floor and ceiling show through), so view_radius * tile_size cells
+    is the draw distance. A background
+    thread prefetches the ring of tiles just beyond the window in the
+    direction of travel, so crossing a tile boundary finds the next
+    window already cached.
+
+    Same query interface as GameMap: is_wall, is_wall_many, raycast_view
+    and start_position. Everything outside the world reads as a wall.
+    """
+
+    def __init__(
+        self,
+        map_dir: str,
+        view_radius: int = 2,
+        cache_tiles: int = 64,
+        prefetch: bool = True,
+    ):
+        manifest_path = os.path.join(map_dir, MANIFEST)
+        if not os.path.exists(manifest_path):
+            raise FileNotFoundError(f"Map manifest not found: {manifest_path}")
+        with open(manifest_path, "r") as f:
+            manifest = json.load(f)
+        if view_radius < 0:
+            raise ValueError("view_radius must be non-negative.")
+        # The window (plus the prefetch ring around it) must fit, or
+        # loading tiles would evict the ones being drawn.
+        window = 2 * view_radius + (3 if prefetch else 1)
+        if cache_tiles < window**2:
+            raise ValueError(
+                f"cache_tiles must be at least {window ** 2} to hold the "
+                "view window and its prefetch ring."
+            )
+
+        self.map_dir = map_dir
+        self.width: int = manifest["width"]
+        self.height: int = manifest["height"]
+        self.tile_size: int = manifest["tile_size"]
+        self.dtype = np.dtype(manifest.get("dtype", "uint8"))
+        self.start_position = tuple(manifest.get("start_position", (1.5, 1.5)))
+        self.tiles_x = -(-self.width // self.tile_size)
+        self.tiles_y = -(-self.height // self.tile_size)
+        self.view_radius = view_radius
+        self.cache_tiles = cache_tiles
+
+        self._tiles: "OrderedDict[TileKey, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        # is_wall fast path: the tile of the previous lookup
+        self._last_key: Optional[TileKey] = None
+        self._last_tile: Optional[np.ndarray] = None
+
+        self._view_key: Optional[TileKey] = None
+        self._view: Optional[Tuple[np.ndarray, int, int]] = None
+        self._last_pos: Optional[Tuple[float, float]] = None
+
+        self._pending: Set[TileKey] = set()
+        self._wake = threading.Condition(self._lock)
+        self._closed = False
+        self._prefetcher: Optional[threading.Thread] = None
+        if prefetch:
+            self._prefetcher = threading.Thread(
+                target=self._prefetch_loop, name="map-prefetch", daemon=True
+            )
+            self._prefetcher.start()
+
+    # --- tile cache ---
+
+    def _load_tile(self, key: TileKey) -> np.ndarray:
+        """Read a tile from disk; missing files are empty tiles."""
+        path = os.path.join(self.map_dir, tile_filename(*key))
+        if not os.path.exists(path):
+            return np.zeros((self.tile_size, self.tile_size), self.dtype)
+        return np.load(path)
+
+    def _store_tile(self, key: TileKey, tile: np.ndarray) -> np.ndarray:
+        """Insert a tile under the lock, evicting least recently used ones."""
+        cached = self._tiles.setdefault(key, tile)
+        self._tiles.move_to_end(key)
+        while len(self._tiles) > self.cache_tiles:
+            self._tiles.popitem(last=False)
+        return cached
+
+    def tile(self, tx: int, ty: int) -> np.ndarray:
+        """
+        Return tile (tx, ty), loading it if it isn't cached. Callers must
+        only ask for tiles inside the world.
+        """
+        key = (tx, ty)
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is not None:
+                self._tiles.move_to_end(key)
+                return tile
+        # Disk I/O happens outside the lock so the prefetcher and the
+        # game thread never wait on each other's reads.
+        tile = self._load_tile(key)
+        with self._lock:
+            return self._store_tile(key, tile)
+
+    def cached_tiles(self):
+        """Keys of the tiles currently held in memory."""
+        with self._lock:
+            return list(self._tiles)
+
+    # --- prefetching ---
+
+    def _prefetch_loop(self):
+        while True:
+            with self._wake:
+                while not self._pending and not self._closed:
+                    self._wake.wait()
+                if self._closed:
+                    return
+                key = self._pending.pop()
+                if key in self._tiles:
+                    continue
+            tile = self._load_tile(key)
+            with self._lock:
+                self._store_tile(key, tile)
+
+    def prefetch(self, x: float, y: float, dx: float, dy: float):
+        """
+        Queue the tiles one ring beyond the view window on the sides the
+        player at (x, y) is moving towards, (dx, dy) being the movement.
+        """
+        if self._prefetcher is None or (dx == 0 and dy == 0):
+            return
+        tx = math.floor(x) // self.tile_size
+        ty = math.floor(y) // self.tile_size
+        reach = self.view_radius + 1
+        span = range(-reach, reach + 1)
+        wanted: Set[TileKey] = set()
+        if dx:
+            edge = tx + (reach if dx > 0 else -reach)
+            wanted.update((edge, ty + j) for j in span)
+        if dy:
+            edge = ty + (reach if dy > 0 else -reach)
+            wanted.update((tx + i, edge) for i in span)
+        with self._wake:
+            for key in wanted:
+                if self._in_world(key) and key not in self._tiles:
+                    self._pending.add(key)
+            if self._pending:
+                self._wake.notify()
+
+    def close(self):
+        """Stop the prefetch thread."""
+        if self._prefetcher is not None:
+            with self._wake:
+                self._closed = True
+                self._wake.notify()
+            self._prefetcher.join()
+            self._prefetcher = None
+
+    # --- GameMap interface ---
+
+    def _in_world(self, key: TileKey) -> bool:
+        return 0 <= key[0] < self.tiles_x and 0 <= key[1] < self.tiles_y
+
+    def raycast_view(self, x: float, y: float) -> Tuple[np.ndarray, int, int]:
+        """
+        Return (grid, origin_x, origin_y): the tile window around (x, y)
+        assembled into one array, with the world cell of grid[0, 0].
+        The same array is returned until the player changes tile.
+        """
+        if self._last_pos is not None:
+            self.prefetch(x, y, x - self._last_pos[0], y - self._last_pos[1])
+        self._last_pos = (x, y)
+
+        size = self.tile_size
+        key = (math.floor(x) // size, math.floor(y) // size)
+        view = self._view
+        if view is None or key != self._view_key:
+            view = self._view = self._assemble_view(key)
+            self._view_key = key
+        return view
+
+    def _assemble_view(self, center: TileKey) -> Tuple[np.ndarray, int, int]:
+        size = self.tile_size
+        radius = self.view_radius
+        span = (2 * radius + 1) * size
+        tx0, ty0 = center[0] - radius, center[1] - radius
+        grid = np.full((span, span), BORDER_WALL, dtype=self.dtype)
+        tiles: Dict[TileKey, np.ndarray] = {}
+        for j in range(2 * radius + 1):
+            for i in range(2 * radius + 1):
+                key = (tx0 + i, ty0 + j)
+                if self._in_world(key):
+                    tiles[key] = self.tile(*key)
+                    rows = slice(j * size, (j + 1) * size)
+                    cols = slice(i * size, (i + 1) * size)
+                    grid[rows, cols] = tiles[key]
+        # Cells past the world's right/bottom edge inside the last tiles
+        # are walls, like the rest of the outside.
+        x_end = self.width - tx0 * size
+        y_end = self.height - ty0 * size
+        if 0 <= x_end < span:
+            grid[:, x_end:] = BORDER_WALL
+        if 0 <= y_end < span:
+            grid[y_end:, :] = BORDER_WALL
+        return grid, tx0 * size, ty0 * size
+
+    def is_wall(self, x: float, y: float) -> bool:
+        """
+        Returns True if the given (x, y) position is a wall.
+        Positions outside the world are walls.
+        """
+        xi = math.floor(x)
+        yi = math.floor(y)
+        if not (0 <= xi < self.width and 0 <= yi < self.height):
+            return True
+        size = self.tile_size
+        key = (xi // size, yi // size)
+        tile = self._last_tile
+        if tile is None or key != self._last_key:
+            tile = self._last_tile = self.tile(*key)
+            self._last_key = key
+        return bool(tile[yi % size, xi % size])
+
+    def is_wall_many(self, xs, ys) -> np.ndarray:
+        """Vectorized is_wall for arrays of positions."""
+        xi = np.floor(np.asarray(xs, dtype=np.float64)).astype(np.intp)
+        yi = np.floor(np.asarray(ys, dtype=np.float64)).astype(np.intp)
+        result = np.ones(xi.shape, dtype=bool)
+        inside = (xi >= 0) & (xi < self.width) & (yi >= 0) & (yi < self.height)
+        size = self.tile_size
+        keys = (yi // size) * self.tiles_x + xi // size
+        for flat_key in np.unique(keys[inside]):
+            tile = self.tile(
+                int(flat_key % self.tiles_x), int(flat_key // self.tiles_x)
+            )
+            sel = inside & (keys == flat_key)
+            result[sel] = tile[yi[sel] % size, xi[sel] % size] > 0
+        return result
@@ -2,7 +2,9 @@
 EngineConfig: holds all engine configuration parameters.
 """
 
-from typing import Any, Tuple
+from typing import Any, Optional, Tuple
+
+from .raycast import RAYCAST_ENGINES
 
 
 class EngineConfig:
@@ -11,6 +13,15 @@ class EngineConfig:
         resolution: Tuple[int, int] = (640, 480),
         fov: float = 60.0,
         map_path: str = "assets/maps/basic_map.json",
+        num_workers: Optional[int] = None,
+        chunk_size: int = 32,
+        raycast_engine: str = "backend",
+        tick_rate: float = 60.0,
+        max_updates_per_frame: int = 5,
+        target_frame_time: Optional[float] = None,
+        min_scale: float = 0.5,
+        max_scale: float = 1.0,
+        skip_unchanged_frames: bool = True,
         **kwargs: Any,
     ):
         if (
@@ -18,15 +29,73 @@ class EngineConfig:
             or len(resolution) != 2
             or not all(isinstance(x, int) and x > 0 for x in resolution)
         ):
-            raise ValueError("resolution must be a tuple of two positive integers")
+            raise ValueError(
+                "resolution must be a tuple of two positive integers"
+            )
         if not isinstance(fov, (int, float)) or fov <= 0:
             raise ValueError("fov must be a positive number")
         if not isinstance(map_path, str) or not map_path:
             raise ValueError("map_path must be a non-empty string")
+        if num_workers is not None and (
+            not isinstance(num_workers, int) or num_workers <= 0
+        ):
+            raise ValueError("num_workers must be a positive integer or None")
+        if not isinstance(chunk_size, int) or chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer")
+        if raycast_engine not in RAYCAST_ENGINES:
+            raise ValueError(
+                f"raycast_engine must be one of {RAYCAST_ENGINES}"
+            )
+        if not isinstance(tick_rate, (int, float)) or tick_rate <= 0:
+            raise ValueError("tick_rate must be a positive number")
+        if (
+            not isinstance(max_updates_per_frame, int)
+            or max_updates_per_frame <= 0
+        ):
+            raise ValueError(
+                "max_updates_per_frame must be a positive integer"
+            )
+        if target_frame_time is not None and (
+            not isinstance(target_frame_time, (int, float))
+            or target_frame_time <= 0
+        ):
+            raise ValueError(
+                "target_frame_time must be a positive number or None"
+            )
+        if (
+            not isinstance(min_scale, (int, float))
+            or not isinstance(max_scale, (int, float))
+            or not 0 < min_scale <= max_scale
+        ):
+            raise ValueError(
+                "min_scale and max_scale must satisfy 0 < min <= max"
+            )
+        if not isinstance(skip_unchanged_frames, bool):
+            raise ValueError("skip_unchanged_frames must be a bool")
 
         self.resolution = resolution
         self.fov = fov
         self.map_path = map_path
+        # Render worker pool: None means one worker per CPU core.
+        self.num_workers = num_workers
+        # Number of screen columns handed to a worker per task.
+        self.chunk_size = chunk_size
+        # Column raycaster: "backend" (compiled when built), "numpy"
+        # (batched DDA) or "python" (per column).
+        self.raycast_engine = raycast_engine
+        # Fixed simulation ticks per second, independent of frame rate.
+        self.tick_rate = tick_rate
+        # Ticks simulated per frame at most; the backlog beyond is dropped.
+        self.max_updates_per_frame = max_updates_per_frame
+        # Dynamic resolution: with a target render time (seconds) set,
+        # the 3D view is rendered at a fraction of resolution between
+        # min_scale and max_scale, adjusted to hold the target.
+        self.target_frame_time = target_frame_time
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        # Skip rendering and flipping frames identical to the last one
+        # (same pose, world and plugin state; see Renderer.needs_redraw).
+        self.skip_unchanged_frames = skip_unchanged_frames
         # Add more config options as needed
         for k, v in kwargs.items():
             setattr(self, k, v)
@@ -3,14 +3,31 @@ Main game engine loop and application entry point.
 Supports pluggable backends for rendering and input.
 """
 
-from typing import Callable, List, Optional
+import os
+from typing import Callable, Dict, List, Optional
 
+from ..ecs.ecs import World
+from .chunkedmap import ChunkedGameMap
 from .config import EngineConfig
-from .events import EventDispatcher
-from .interfaces import BaseRenderer
+from .events import EventDispatcher, EventQueue
+from .interfaces import BaseInputHandler, BaseRenderer
+from .map import GameMap
+from .pipeline import Pipeline, RateLimitedLogger, Step, hook_steps
+from .player import Player
+from .profiler import FrameProfiler, clock
 from .renderer import Renderer
 
 
+def load_map(map_path: str):
+    """
+    Load the map at map_path: a directory is a chunked open-world map
+    streamed tile by tile, anything else a GameMap (JSON or binary).
+    """
+    if os.path.isdir(map_path):
+        return ChunkedGameMap(map_path)
+    return GameMap(map_path)
+
+
 class RaycastingEngine:
     """
     The main engine class. Handles the game loop, plugin hooks,
@@ -19,8 +36,10 @@ class RaycastingEngine:
 
     def __init__(self, config: EngineConfig, backend: str = "pygame"):
         self.config = config
-        self.map = GameMap(config.map_path)
+        self.map = load_map(config.map_path)
         self.player = Player(self.map.start_position)
+        # Entities (sprites, projectiles, ...); systems run once per tick
+        self.world = World(getattr(config, "ecs_workers", None))
 
         # Declare attributes ONCE here
         self.renderer: BaseRenderer
@@ -39,7 +58,22 @@ class RaycastingEngine:
             raise ValueError(f"Unknown backend: {backend}")
 
         self.running: bool = True
+        # Render frame cap passed to renderer.tick (0 = uncapped)
         self.framerate: int = getattr(config, "framerate", 60)
+        # Fixed simulation rate (ticks per second) and the most ticks
+        # simulated per rendered frame before the backlog is dropped
+        self.tick_rate: float = getattr(config, "tick_rate", 60.0)
+        self.max_updates_per_frame: int = getattr(
+            config, "max_updates_per_frame", 5
+        )
+        self.dropped_updates: int = 0
+        # Frames not drawn because nothing changed (see run)
+        self.skipped_frames: int = 0
+        self.skip_unchanged_frames: bool = getattr(
+            config, "skip_unchanged_frames", True
+        )
+        # Fraction of a tick between the last simulated state and now
+        self.alpha: float = 1.0
 
         # Hooks for plugins and custom logic
         self.pre_update_hooks: List[Callable[[], None]] = []
@@ -47,31 +81,118 @@ class RaycastingEngine:
         self.pre_render_hooks: List[Callable[[], None]] = []
         self.post_render_hooks: List[Callable[[], None]] = []
         self.event_handlers: List[Callable] = []
+        # Hooks whose errors are caught and logged; errors from the
+        # others propagate and stop the loop
+        self.isolated_hooks: List[Callable] = []
+        # Errors of isolated hooks and engine calls, each at most once
+        # per error_log_interval seconds
+        self.error_log = RateLimitedLogger(
+            getattr(config, "error_log_interval", 5.0)
+        )
+        # Built from the hooks, input handler and renderer on first use
+        # (see _build_pipelines); None when stale
+        self._pipelines: Optional[Dict[str, Pipeline]] = None
+        self._process_events: Optional[Callable] = None
 
         self.event_dispatcher = EventDispatcher()
+        # Deferred events, drained once per frame (see run); with
+        # config.queue_events, dispatch_event queues too
+        self.event_queue = EventQueue(
+            self.event_dispatcher, getattr(config, "event_queue_size", 256)
+        )
+        self.queue_events: bool = getattr(config, "queue_events", False)
+
+        # Frame timing; off unless config.profile is set (toggle with
+        # self.profiler.enabled at any time).
+        self.profiler = FrameProfiler(
+            getattr(config, "profile_window", 240),
+            enabled=getattr(config, "profile", False),
+        )
+        # Renderers that support it time their own plugins and stages
+        if hasattr(self.renderer, "profiler"):
+            self.renderer.profiler = self.profiler
+        self.world.scheduler.profiler = self.profiler
+        # Renderers with a sprite pass draw the world's Renderables
+        if hasattr(self.renderer, "world"):
+            self.renderer.world = self.world
 
-    def register_pre_update(self, func: Callable[[], None]):
-        """Register a function to be called before each update."""
-        self.pre_update_hooks.append(func)
+    def _register(self, hooks: list, func: Callable[[], None], isolate):
+        hooks.append(func)
+        if isolate:
+            self.isolated_hooks.append(func)
+        self.rebuild_pipeline()
 
-    def register_post_update(self, func: Callable[[], None]):
+    def register_pre_update(self, func: Callable[[], None], isolate=False):
+        """
+        Register a function to be called before each update. With
+        isolate=True its errors are logged instead of propagated (the
+        same for every register_* method).
+        """
+        self._register(self.pre_update_hooks, func, isolate)
+
+    def register_post_update(self, func: Callable[[], None], isolate=False):
         """Register a function to be called after each update."""
-        self.post_update_hooks.append(func)
+        self._register(self.post_update_hooks, func, isolate)
 
-    def register_pre_render(self, func: Callable[[], None]):
+    def register_pre_render(self, func: Callable[[], None], isolate=False):
         """Register a function to be called before each render."""
-        self.pre_render_hooks.append(func)
+        self._register(self.pre_render_hooks, func, isolate)
 
-    def register_post_render(self, func: Callable[[], None]):
+    def register_post_render(self, func: Callable[[], None], isolate=False):
         """Register a function to be called after each render."""
-        self.post_render_hooks.append(func)
+        self._register(self.post_render_hooks, func, isolate)
+
+    def unregister_hook(self, func: Callable[[], None]):
+        """Remove func from every hook list it is registered in."""
+        for hooks in (
+            self.pre_update_hooks,
+            self.post_update_hooks,
+            self.pre_render_hooks,
+            self.post_render_hooks,
+            self.isolated_hooks,
+        ):
+            hooks[:] = [hook for hook in hooks if hook is not func]
+        self.rebuild_pipeline()
+
+    def rebuild_pipeline(self):
+        """
+        Have the pipelines rebuilt before the next tick. The register
+        methods do this; call it after editing the hook lists, or
+        replacing the input handler, renderer, player or world, directly.
+        """
+        self._pipelines = None
 
     def register_event_handler(self, event_name, handler):
         self.event_dispatcher.register(event_name, handler)
 
-    def dispatch_event(self, event_name, data=None):
+    def dispatch_event(self, event_name, data=None, priority=0):
+        """
+        Dispatch a named event and return the number of listeners
+        called. With queue_events set it is queued instead (returning
+        0), to be delivered with the frame's other events by priority.
+        """
+        if self.queue_events:
+            self.event_queue.push(event_name, data, priority)
+            return 0
         return self.event_dispatcher.dispatch(event_name, data)
 
+    def invalidate(self):
+        """Have the next frame drawn even if nothing seems to have changed."""
+        if hasattr(self.renderer, "invalidate"):
+            self.renderer.invalidate()
+
+    def _needs_redraw(self) -> bool:
+        if not self.skip_unchanged_frames:
+            return True
+        needs_redraw = getattr(self.renderer, "needs_redraw", None)
+        if needs_redraw is None:
+            return True
+        try:
+            return needs_redraw()
+        except Exception as e:
+            print(f"[Engine] Renderer needs_redraw error: {e}")
+            return True
+
     def clear_hooks(self):
         """Clear all hooks and event handlers (useful for tests)."""
         self.pre_update_hooks.clear()
@@ -79,74 +200,192 @@ class RaycastingEngine:
         self.pre_render_hooks.clear()
         self.post_render_hooks.clear()
         self.event_handlers.clear()
+        self.isolated_hooks.clear()
+        self.rebuild_pipeline()
+
+    def _build_pipelines(self) -> Dict[str, Pipeline]:
+        """
+        Flatten the per-tick and per-frame calls into Pipelines: "update"
+        (pre-update hooks, input, player update, ECS systems,
+        post-update hooks), "pre_render" (its hooks) and "draw" (render,
+        post-render hooks, flip). Engine calls are always isolated.
+        """
+        isolated = self.isolated_hooks
+        input_steps = []
+        process_input = getattr(self.input_handler, "process_input", None)
+        if process_input is not None:
+            input_steps.append(Step(process_input, True, "Input handler"))
+        log = self.error_log
+        return {
+            "update": Pipeline(
+                [
+                    (
+                        "pre_update",
+                        hook_steps(
+                            self.pre_update_hooks, "Pre-update", isolated
+                        ),
+                    ),
+                    ("input", input_steps),
+                    (
+                        "update",
+                        [Step(self.player.update, True, "Player update")],
+                    ),
+                    ("ecs", [Step(self.world.update, True, "ECS update")]),
+                    (
+                        "post_update",
+                        hook_steps(
+                            self.post_update_hooks, "Post-update", isolated
+                        ),
+                    ),
+                ],
+                log,
+            ),
+            "pre_render": Pipeline(
+                [
+                    (
+                        "pre_render",
+                        hook_steps(
+                            self.pre_render_hooks, "Pre-render", isolated
+                        ),
+                    )
+                ],
+                log,
+            ),
+            "draw": Pipeline(
+                [
+                    (
+                        "render",
+                        [Step(self.renderer.render_frame, True, "Renderer")],
+                    ),
+                    (
+                        "post_render",
+                        hook_steps(
+                            self.post_render_hooks, "Post-render", isolated
+                        ),
+                    ),
+                    (
+                        "flip",
+                        [Step(self.renderer.flip, True, "Renderer flip")],
+                    ),
+                ],
+                log,
+            ),
+        }
+
+    @property
+    def pipelines(self) -> Dict[str, Pipeline]:
+        """The current pipelines, rebuilt first if stale."""
+        if self._pipelines is None:
+            self._pipelines = self._build_pipelines()
+            self._process_events = getattr(
+                self.input_handler, "process_events", None
+            )
+        return self._pipelines
 
     def run(self):
         """
         Main engine loop: handles input, updates game state, renders frames.
         Supports plugin hooks and custom event handlers.
+
+        The simulation advances in fixed ticks of 1 / tick_rate seconds
+        (the "update" pipeline), decoupled from rendering: each frame
+        runs as many ticks as real time calls for, then renders with the
+        player pose interpolated between the last two ticks
+        (renderer.alpha). When
+        the loop falls behind, at most max_updates_per_frame ticks run
+        per frame and the rest are dropped (counted in dropped_updates),
+        so a slow frame can't snowball into ever longer ones.
+
+        Frames that would repeat the last one (the renderer's
+        needs_redraw says nothing changed) are neither rendered nor
+        flipped, and post-render hooks don't run; they are counted in
+        skipped_frames. Pre-render hooks still run and may call
+        invalidate(). The loop keeps ticking at framerate meanwhile.
+
+        Queued events (event_queue) are delivered after the simulation
+        and before the pre-render hooks, so what their listeners change
+        is drawn the same frame; the drain is recorded in
+        event_queue.stats.
+
+        Hooks, input and rendering run as prebuilt Pipelines (see
+        _build_pipelines), rebuilt only after hooks are registered or
+        removed. Errors of isolated hooks and of the engine's own calls
+        are logged through error_log; other hooks' errors stop the loop.
+
+        When self.profiler is enabled every phase, hook and renderer plugin
+        is timed; see FrameProfiler.
         """
+        step = 1.0 / self.tick_rate
+        save_state = getattr(self.player, "save_state", None)
+        interpolates = hasattr(self.renderer, "alpha")
+        event_queue = self.event_queue
+        # Start one tick in, so the first frame shows a simulated state
+        accumulator = step
+        previous = clock()
         try:
             while self.running:
+                now = clock()
+                accumulator += now - previous
+                previous = now
+                # Checked once per frame so profiling can be toggled live
+                prof = self.profiler if self.profiler.enabled else None
+                if prof is not None:
+                    frame_start = mark = now
+
+                pipelines = self.pipelines
+
                 # Event handling (backend-specific)
-                if self.input_handler and hasattr(self.input_handler, "process_events"):
-                    for event in self.input_handler.process_events():
+                if self._process_events is not None:
+                    for event in self._process_events():
                         if getattr(event, "type", None) == "QUIT":
                             self.running = False
                         for handler in self.event_handlers:
                             try:
                                 handler(event)
                             except Exception as e:
-                                print(f"[Engine] Event handler error: {e}")
-
-                for hook in self.pre_update_hooks:
-                    try:
-                        hook()
-                    except Exception as e:
-                        print(f"[Engine] Pre-update hook error: {e}")
+                                self.error_log.error("Event handler", e)
+                if prof is not None:
+                    mark = prof.lap("events", mark)
 
-                if self.input_handler and hasattr(self.input_handler, "process_input"):
-                    try:
-                        self.input_handler.process_input()
-                    except Exception as e:
-                        print(f"[Engine] Input handler error: {e}")
+                updates = 0
+                update = pipelines["update"]
+                while accumulator >= step:
+                    if updates == self.max_updates_per_frame:
+                        dropped = int(accumulator // step)
+                        self.dropped_updates += dropped
+                        accumulator -= dropped * step
+                        break
+                    if save_state is not None:
+                        save_state()
+                    update.run(prof)
+                    accumulator -= step
+                    updates += 1
+                self.alpha = accumulator / step
+                if interpolates:
+                    self.renderer.alpha = self.alpha
+                if prof is not None:
+                    mark = prof.lap("simulation", mark)
 
-                try:
-                    self.player.update()
-                except Exception as e:
-                    print(f"[Engine] Player update error: {e}")
+                event_queue.drain()
+                if prof is not None:
+                    mark = prof.lap("event_queue", mark)
 
-                for hook in self.post_update_hooks:
-                    try:
-                        hook()
-                    except Exception as e:
-                        print(f"[Engine] Post-update hook error: {e}")
-
-                for hook in self.pre_render_hooks:
-                    try:
-                        hook()
-                    except Exception as e:
-                        print(f"[Engine] Pre-render hook error: {e}")
-
-                try:
-                    self.renderer.render_frame()
-                except Exception as e:
-                    print(f"[Engine] Renderer error: {e}")
-
-                for hook in self.post_render_hooks:
-                    try:
-                        hook()
-                    except Exception as e:
-                        print(f"[Engine] Post-render hook error: {e}")
-
-                try:
-                    self.renderer.flip()
-                except Exception as e:
-                    print(f"[Engine] Renderer flip error: {e}")
+                pipelines["pre_render"].run(prof)
+                if self._needs_redraw():
+                    pipelines["draw"].run(prof)
+                else:
+                    # The last frame stays on screen
+                    self.skipped_frames += 1
+                if prof is not None:
+                    mark = clock()
 
                 try:
                     self.renderer.tick(self.framerate)
                 except Exception as e:
-                    print(f"[Engine] Renderer tick error: {e}")
+                    self.error_log.error("Renderer tick", e)
+                if prof is not None:
+                    prof.lap("tick", mark)
+                    prof.lap("frame", frame_start)
 
         except Exception as e:
             print(f"Engine encountered an error: {e}")
@@ -157,3 +396,9 @@ class RaycastingEngine:
                     self.renderer.cleanup()
                 except Exception as e:
                     print(f"[Engine] Renderer cleanup error: {e}")
+            if hasattr(self.map, "close"):
+                try:
+                    self.map.close()
+                except Exception as e:
+                    print(f"[Engine] Map cleanup error: {e}")
+            self.world.close()
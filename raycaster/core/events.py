@@ -1,9 +1,35 @@
 """
 Event system: allows registering and dispatching custom events
 for plugins and engine hooks.
+
+Two kinds of events are supported. Named events (dispatch) carry a
+data dict and are allocated per call. Typed events (dispatch_typed,
+dispatch_many) are TypedEvent subclasses with __slots__ fields, taken
+from per-type pools and returned after dispatch. Hot paths that send
+thousands of events per frame don't allocate.
+
+EventQueue defers either kind: events are pushed into a ring buffer and
+dispatched together, by priority, when the queue is drained (the engine
+does so once per frame, see RaycastingEngine.run). Repeats of
+coalescible events are merged while they wait.
 """
 
-from typing import Callable, Dict, List, Optional
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from .profiler import clock
 
 
 class Event:
@@ -16,6 +42,52 @@ class Event:
         self.data = data or {}
 
 
+class TypedEvent:
+    """
+    Base class for typed events. Subclasses declare their fields in
+    __slots__ and must be constructible without arguments, e.g.
+
+        class Footstep(TypedEvent):
+            __slots__ = ("x", "y", "surface")
+
+    Pooled events are reused: set every field after acquire, and don't
+    keep a reference after dispatch (copy what a listener needs).
+    """
+
+    __slots__ = ()
+
+    @property
+    def name(self) -> str:
+        return type(self).__name__
+
+
+E = TypeVar("E", bound=TypedEvent)
+
+
+class EventPool(Generic[E]):
+    """
+    Free list of preallocated events of one type. acquire creates a new
+    event only when the pool is empty; released events are reused.
+    """
+
+    def __init__(self, event_type: Type[E], size: int = 64):
+        self.event_type = event_type
+        self._free: List[E] = [event_type() for _ in range(size)]
+
+    def __len__(self) -> int:
+        return len(self._free)
+
+    def acquire(self) -> E:
+        free = self._free
+        return free.pop() if free else self.event_type()
+
+    def release(self, event: E):
+        self._free.append(event)
+
+    def release_all(self, events: Sequence[E]):
+        self._free.extend(events)
+
+
 class EventDispatcher:
     """
     Manages event listeners and dispatches events to them.
@@ -23,6 +95,13 @@ class EventDispatcher:
 
     def __init__(self):
         self.listeners: Dict[str, List[Callable]] = {}
+        # Typed listeners by event type: (per event, per batch)
+        self.typed_listeners: Dict[type, Tuple[List, List]] = {}
+        self.pools: Dict[type, EventPool] = {}
+        # Per event type: its listeners and those of its bases, resolved
+        # on first dispatch (and again after typed listeners change),
+        # and its pool
+        self._resolved: Dict[type, Tuple[tuple, tuple, EventPool]] = {}
 
     def register(self, event_name: str, listener: Callable):
         """
@@ -42,6 +121,8 @@ class EventDispatcher:
         Remove all listeners (useful for tests).
         """
         self.listeners.clear()
+        self.typed_listeners.clear()
+        self._resolved.clear()
 
     def dispatch(self, event_name: str, data: Optional[dict] = None) -> int:
         """
@@ -55,6 +136,329 @@ class EventDispatcher:
             try:
                 listener(event)
             except Exception as e:
-                print(f"[EventDispatcher] Error in listener for '{event_name}': {e}")
+                print(
+                    f"[EventDispatcher] Error in listener for '{event_name}': {e}"
+                )
                 # Do not raise, continue to next listener
         return count
+
+    # --- typed events ---
+
+    def register_typed(
+        self, event_type: type, listener: Callable, batch: bool = False
+    ):
+        """
+        Register a listener for event_type and its subclasses. It is
+        called with each event, or with batch=True once per
+        dispatch_many with the whole list (and with a one-element tuple
+        by dispatch_typed).
+        """
+        single, batched = self.typed_listeners.setdefault(event_type, ([], []))
+        (batched if batch else single).append(listener)
+        self._resolved.clear()
+
+    def unregister_typed(self, event_type: type, listener: Callable):
+        """Unregister a typed listener, per event or batch."""
+        lists = self.typed_listeners.get(event_type)
+        if lists is not None:
+            for listeners in lists:
+                if listener in listeners:
+                    listeners.remove(listener)
+        self._resolved.clear()
+
+    def _resolve(self, event_type: type) -> Tuple[tuple, tuple, EventPool]:
+        single: List[Callable] = []
+        batched: List[Callable] = []
+        for cls in reversed(event_type.__mro__):
+            lists = self.typed_listeners.get(cls)
+            if lists is not None:
+                single.extend(lists[0])
+                batched.extend(lists[1])
+        resolved = self._resolved[event_type] = (
+            tuple(single),
+            tuple(batched),
+            self.pool(event_type),
+        )
+        return resolved
+
+    def pool(self, event_type: Type[E], size: int = 64) -> EventPool:
+        """The event pool of event_type, created with size events."""
+        pool = self.pools.get(event_type)
+        if pool is None:
+            pool = self.pools[event_type] = EventPool(event_type, size)
+        return pool
+
+    def acquire(self, event_type: Type[E]) -> E:
+        """A pooled event of event_type to fill in and dispatch."""
+        resolved = self._resolved.get(event_type)
+        if resolved is None:
+            resolved = self._resolve(event_type)
+        return resolved[2].acquire()
+
+    def _failed(self, event_type: type, e: Exception):
+        print(
+            f"[EventDispatcher] Error in listener for "
+            f"'{event_type.__name__}': {e}"
+        )
+
+    def dispatch_typed(self, event: TypedEvent, release: bool = True) -> int:
+        """
+        Dispatch a typed event to the listeners of its type and bases,
+        then (with release) return it to its type's pool. Returns the
+        number of listeners called.
+        """
+        event_type = type(event)
+        resolved = self._resolved.get(event_type)
+        if resolved is None:
+            resolved = self._resolve(event_type)
+        single, batched, pool = resolved
+        for listener in single:
+            try:
+                listener(event)
+            except Exception as e:
+                self._failed(event_type, e)
+        if batched:
+            events = (event,)
+            for listener in batched:
+                try:
+                    listener(events)
+                except Exception as e:
+                    self._failed(event_type, e)
+        if release:
+            pool.release(event)
+        return len(single) + len(batched)
+
+    def dispatch_many(
+        self,
+        event_type: type,
+        events: Sequence[TypedEvent],
+        release: bool = True,
+    ) -> int:
+        """
+        Dispatch a batch of events of event_type: batch listeners get
+        the whole sequence in one call, per-event listeners each event.
+        With release the events go back to the pool afterwards. Returns
+        the number of listener calls.
+        """
+        if not events:
+            return 0
+        resolved = self._resolved.get(event_type)
+        if resolved is None:
+            resolved = self._resolve(event_type)
+        single, batched, pool = resolved
+        for listener in batched:
+            try:
+                listener(events)
+            except Exception as e:
+                self._failed(event_type, e)
+        count = len(events)
+        for listener in single:
+            index = 0
+            while index < count:
+                try:
+                    for index in range(index, count):
+                        listener(events[index])
+                    break
+                except Exception as e:
+                    # Carry on with the event after the failing one
+                    self._failed(event_type, e)
+                    index += 1
+        if release:
+            pool.release_all(events)
+        return len(batched) + len(single) * count
+
+
+class QueueStats(NamedTuple):
+    """What one EventQueue.drain handled."""
+
+    # Events pushed since the previous drain
+    queued: int = 0
+    # Pushes merged into an event already pending
+    coalesced: int = 0
+    # Events dispatched (queued - coalesced)
+    delivered: int = 0
+    # Seconds spent dispatching
+    drain_time: float = 0.0
+
+
+class EventQueue:
+    """
+    Deferred events for dispatcher. push (named) and push_typed store
+    events in a ring buffer; drain dispatches everything pending,
+    highest priority first and in push order within a priority. Events
+    pushed by listeners during a drain wait for the next one.
+
+    Event names and types marked with coalesce are merged while
+    pending: pushing one with the same coalescing key as a pending
+    event replaces that event's data (or typed event) in place, with
+    the higher of the two priorities. The replaced typed event goes
+    back to its pool.
+    """
+
+    def __init__(self, dispatcher: EventDispatcher, capacity: int = 256):
+        if not isinstance(capacity, int) or capacity <= 0:
+            raise ValueError("capacity must be a positive integer")
+        self.dispatcher = dispatcher
+        # Ring buffer of pending events, [head, head + size) modulo the
+        # capacity: event name or type, data or typed event, priority
+        self._kinds: List[Any] = [None] * capacity
+        self._payloads: List[Any] = [None] * capacity
+        self._priorities: List[int] = [0] * capacity
+        self._head = 0
+        self._size = 0
+        # Coalescible event names and types -> key function (or None)
+        self._coalesce: Dict[Any, Optional[Callable]] = {}
+        # (name or type, key) -> slot of the pending event
+        self._pending: Dict[Tuple[Any, Hashable], int] = {}
+        # Since the last drain
+        self._queued = 0
+        self._coalesced = 0
+        self._prioritized = False
+        # Stats of the last drain
+        self.stats = QueueStats()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return len(self._kinds)
+
+    def coalesce(self, kind: Any, key: Optional[Callable] = None):
+        """
+        Merge pending repeats of kind, an event name or TypedEvent
+        subclass. By default all pending events of kind are one; with
+        key, those for which key(data) (named) or key(event) (typed)
+        are equal, e.g. key=lambda e: e.entity for per-entity moves.
+        """
+        self._coalesce[kind] = key
+
+    def push(
+        self, event_name: str, data: Optional[dict] = None, priority: int = 0
+    ):
+        """Queue a named event for the next drain."""
+        self._push(event_name, data, priority)
+
+    def push_typed(self, event: TypedEvent, priority: int = 0):
+        """
+        Queue a typed event for the next drain. It is returned to its
+        pool once dispatched (or replaced by a coalesced push).
+        """
+        event_type = type(event)
+        replaced = self._push(event_type, event, priority)
+        if replaced is not None:
+            self.dispatcher.pool(event_type).release(replaced)
+
+    def _push(self, kind: Any, payload: Any, priority: int):
+        """Queue payload; returns the pending payload it replaced."""
+        self._queued += 1
+        if priority:
+            self._prioritized = True
+        coalesce = self._coalesce
+        if kind in coalesce:
+            key = coalesce[kind]
+            pending = (kind, None if key is None else key(payload))
+            slot = self._pending.get(pending)
+            if slot is not None:
+                self._coalesced += 1
+                replaced = self._payloads[slot]
+                self._payloads[slot] = payload
+                if priority > self._priorities[slot]:
+                    self._priorities[slot] = priority
+                return replaced
+            self._pending[pending] = self._append(kind, payload, priority)
+        else:
+            self._append(kind, payload, priority)
+        return None
+
+    def _append(self, kind: Any, payload: Any, priority: int) -> int:
+        capacity = len(self._kinds)
+        if self._size == capacity:
+            self._grow()
+            capacity = len(self._kinds)
+        slot = (self._head + self._size) % capacity
+        self._kinds[slot] = kind
+        self._payloads[slot] = payload
+        self._priorities[slot] = priority
+        self._size += 1
+        return slot
+
+    def _grow(self):
+        """Double the capacity, moving the pending events to the front."""
+        head, capacity = self._head, len(self._kinds)
+        for name in ("_kinds", "_payloads", "_priorities"):
+            ring = getattr(self, name)
+            filler = 0 if name == "_priorities" else None
+            setattr(
+                self, name, ring[head:] + ring[:head] + [filler] * capacity
+            )
+        self._pending = {
+            key: (slot - head) % capacity
+            for key, slot in self._pending.items()
+        }
+        self._head = 0
+
+    def drain(self) -> int:
+        """
+        Dispatch every pending event and record this drain in stats.
+        Consecutive typed events of one type go out in one
+        dispatch_many. Returns the number of events dispatched.
+        """
+        count = self._size
+        if not count:
+            self.stats = QueueStats()
+            return 0
+        start = clock()
+        queued, coalesced = self._queued, self._coalesced
+        prioritized = self._prioritized
+        # Take the pending events out of the ring first, so pushes made
+        # by listeners can't overwrite them
+        head, capacity = self._head, len(self._kinds)
+        stop = head + count
+        kinds, payloads, priorities = (
+            self._kinds,
+            self._payloads,
+            self._priorities,
+        )
+        if stop <= capacity:
+            taken = slice(head, stop)
+            order = list(zip(kinds[taken], payloads[taken], priorities[taken]))
+            kinds[taken] = payloads[taken] = [None] * count
+        else:
+            wrapped = slice(0, stop - capacity)
+            order = list(
+                zip(
+                    kinds[head:] + kinds[wrapped],
+                    payloads[head:] + payloads[wrapped],
+                    priorities[head:] + priorities[wrapped],
+                )
+            )
+            kinds[head:] = payloads[head:] = [None] * (capacity - head)
+            kinds[wrapped] = payloads[wrapped] = [None] * (stop - capacity)
+        self._head = stop % capacity
+        self._size = 0
+        self._pending.clear()
+        self._queued = self._coalesced = 0
+        self._prioritized = False
+        if prioritized:
+            # Stable, so push order holds within a priority
+            order.sort(key=lambda entry: entry[2], reverse=True)
+
+        dispatcher = self.dispatcher
+        index = 0
+        while index < count:
+            kind, payload, _ = order[index]
+            index += 1
+            if kind.__class__ is str:
+                dispatcher.dispatch(kind, payload)
+                continue
+            first = index - 1
+            while index < count and order[index][0] is kind:
+                index += 1
+            if index == first + 1:
+                dispatcher.dispatch_typed(payload)
+            else:
+                events = [order[i][1] for i in range(first, index)]
+                dispatcher.dispatch_many(kind, events)
+        self.stats = QueueStats(queued, coalesced, count, clock() - start)
+        return count
@@ -0,0 +1,119 @@
+"""
+Floor and ceiling casting: textures the rows below and above the
+horizon, per column chunk, with backend.fill_textured_floor.
+
+Screen row y below the horizon sees the floor at a fixed distance from
+the camera plane, whatever the column. That row-distance table, and the
+mip level per row, depend only on the frame size, the FOV and the
+texture size. It is built once per (width, height, fov) and reused
+every frame. Each column then scales its ray direction by the table to
+get floor world coordinates. The ceiling row mirrored across the
+horizon sees the same coordinates, so both are sampled at the same
+texel.
+"""
+
+import math
+from typing import Dict, NamedTuple, Tuple
+
+import numpy as np
+
+from .. import backend
+from .textures import TextureAtlas
+
+
+class RowTable(NamedTuple):
+    """Per-row constants for the floor rows [horizon, height)."""
+
+    rows: np.ndarray  # int64 screen rows below the horizon
+    distance: np.ndarray  # float64 perpendicular distance to the floor
+    offset: np.ndarray  # int64 first texel of each row's mip level
+    size: np.ndarray  # int64 edge of each row's mip level
+    scale: np.ndarray  # float64 distance * size: texels per unit of ray
+
+
+class FloorCaster:
+    """
+    Draws textured floors and ceilings from atlas. floor_texture and
+    ceiling_texture are wall ids (texture (id - 1) % atlas.count).
+    """
+
+    def __init__(
+        self,
+        atlas: TextureAtlas,
+        floor_texture: int = 7,
+        ceiling_texture: int = 3,
+    ):
+        self.atlas = atlas
+        self.floor_texture = (floor_texture - 1) % atlas.count
+        self.ceiling_texture = (ceiling_texture - 1) % atlas.count
+        self._tables: Dict[Tuple[int, int, float], RowTable] = {}
+
+    def table(self, width: int, height: int, fov: float) -> RowTable:
+        """The cached RowTable for a frame size and FOV."""
+        key = (width, height, fov)
+        table = self._tables.get(key)
+        if table is None:
+            # Resolution or FOV changed: the old tables are stale
+            self._tables.clear()
+            table = self._tables[key] = self._build(width, height, fov)
+        return table
+
+    def _build(self, width: int, height: int, fov: float) -> RowTable:
+        atlas = self.atlas
+        horizon = height // 2
+        rows = np.arange(horizon, height)
+        # Camera at half a wall's height: matches wall_spans, where a
+        # wall at distance d reaches row (height + height / d) / 2
+        distance = height / (2.0 * (rows + 0.5) - height)
+        # World units spanned by one screen column at that distance
+        footprint = 2.0 * math.tan(math.radians(fov) / 2.0) * distance / width
+        level = np.floor(np.log2(np.maximum(footprint * atlas.size, 1.0)))
+        level = np.minimum(level, atlas.levels - 1).astype(np.intp)
+        size = atlas.level_sizes[level]
+        return RowTable(
+            rows,
+            distance,
+            atlas.level_offsets[level],
+            size,
+            distance * size,
+        )
+
+    def draw(
+        self,
+        pixels: np.ndarray,
+        start: int,
+        pose: Tuple[float, float, float],
+        ray_dx: np.ndarray,
+        ray_dy: np.ndarray,
+        fov: float,
+        first_row: int = 0,
+    ) -> None:
+        """
+        Texture floor and ceiling in columns [start, start + len(ray_dx))
+        of pixels ((width, height, 3), indexed [x, y]), given each
+        column's ray direction. Floor rows above first_row (and their
+        mirrored ceiling rows) are skipped, e.g. because walls will
+        cover them.
+        """
+        width, height = pixels.shape[:2]
+        table = self.table(width, height, fov)
+        skip = max(first_row - int(table.rows[0]), 0)
+        rows = table.rows[skip:]
+        if not len(rows):
+            return
+        pos_x, pos_y, _ = pose
+        backend.fill_textured_floor(
+            pixels,
+            start,
+            ray_dx,
+            ray_dy,
+            pos_x,
+            pos_y,
+            int(rows[0]),
+            table.scale[skip:],
+            table.offset[skip:],
+            table.size[skip:],
+            self.atlas.texels,
+            self.floor_texture,
+            self.ceiling_texture,
+        )
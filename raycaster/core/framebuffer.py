@@ -0,0 +1,80 @@
+"""
+SharedFramebuffer: frame pixels in shared memory, shared by the renderer
+and its worker processes. SharedArray is the general form, used for any
+other per-frame array the workers need (such as a streamed map window).
+"""
+
+import weakref
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+def _release(shm: shared_memory.SharedMemory, owner: bool):
+    try:
+        shm.close()
+    except BufferError:
+        # Views of the pixels are still alive somewhere; the mapping goes
+        # away with them.
+        pass
+    if owner:
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedArray:
+    """
+    A NumPy array backed by multiprocessing.shared_memory. The creating
+    side (name=None) owns the block; other processes attach by name with
+    the same shape and dtype.
+    """
+
+    def __init__(
+        self, shape: Tuple[int, ...], dtype, name: Optional[str] = None
+    ):
+        dtype = np.dtype(dtype)
+        size = max(int(np.prod(shape)) * dtype.itemsize, 1)
+        self._owner = name is None
+        if self._owner:
+            self._shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+        self.array: np.ndarray = np.ndarray(
+            shape, dtype=dtype, buffer=self._shm.buf
+        )
+        self._finalizer = weakref.finalize(
+            self, _release, self._shm, self._owner
+        )
+
+    @property
+    def name(self) -> str:
+        """Shared memory block name, used by workers to attach."""
+        return self._shm.name
+
+    def close(self):
+        """
+        Detach from the shared block; the creating side also frees it.
+        Runs automatically when the array is garbage collected.
+        """
+        self._finalizer()
+
+
+class SharedFramebuffer(SharedArray):
+    """
+    An RGB framebuffer backed by multiprocessing.shared_memory and viewed
+    as a NumPy array of shape (width, height, 3), indexed [x, y] like
+    pygame.surfarray.
+
+    The renderer creates it once; pool workers attach to it by name and
+    write their column strips straight into pixels, so no pixel data is
+    ever pickled between processes.
+    """
+
+    def __init__(self, width: int, height: int, name: Optional[str] = None):
+        super().__init__((width, height, 3), np.uint8, name)
+        self.width = width
+        self.height = height
+        self.pixels: np.ndarray = self.array
@@ -3,11 +3,32 @@ GameMap: handles map data, loading, and collision logic.
 """
 
 import json
+import math
 import os
-from typing import Optional  # Removed unused Any, List, Tuple
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .mapformat import is_binary_map, pad_grid, read_binary_map
+
+# Cell value of the wall ring padded around every map.
+BORDER_WALL = 1
 
 
 class GameMap:
+    """
+    Grid map stored as one contiguous NumPy array.
+
+    The grid is padded with a one-cell wall border: world cell (x, y) is
+    grid[y + 1, x + 1]. Anything at or beyond the map edge therefore reads
+    as a wall, so ray marchers starting inside the map never need bounds
+    checks.
+
+    Maps load from JSON or from the binary format in mapformat, which is
+    memory-mapped rather than read. Optional named layers (e.g. floor or
+    ceiling texture ids) are kept in layers, padded like grid.
+    """
+
     def __init__(
         self,
         map_path: Optional[str] = None,
@@ -29,6 +50,12 @@ class GameMap:
     def _load_from_file(self, map_path: str):
         if not os.path.exists(map_path):
             raise FileNotFoundError(f"Map file not found: {map_path}")
+        if is_binary_map(map_path):
+            binary = read_binary_map(map_path)
+            self._set_grid(binary.grid)
+            self.layers = binary.layers
+            self.start_position = binary.start_position
+            return
         with open(map_path, "r") as f:
             data = json.load(f)
         self._load_from_data(data)
@@ -36,15 +63,75 @@ class GameMap:
     def _load_from_data(self, data: dict):
         if "grid" not in data:
             raise ValueError("Map data missing 'grid' key.")
-        self.map_data = data["grid"]
+        cells = self._cells_from_data(data["grid"], "grid")
+        self._set_grid(pad_grid(cells, BORDER_WALL))
+        self.layers = {}
+        for name, layer in data.get("layers", {}).items():
+            layer_cells = self._cells_from_data(layer, f"layers.{name}")
+            if layer_cells.shape != cells.shape:
+                raise ValueError(f"Map layer '{name}' must match the grid.")
+            self.layers[name] = pad_grid(layer_cells, 0)
         self.start_position = tuple(data.get("start_position", (1.5, 1.5)))
 
+    @staticmethod
+    def _cells_from_data(rows, key: str) -> np.ndarray:
+        """Validate a 2D list of cell values and return it as uint8/16."""
+        try:
+            cells = np.asarray(rows)
+        except ValueError:
+            raise ValueError(
+                f"Map '{key}' rows must all have the same length."
+            ) from None
+        if cells.ndim != 2 or cells.size == 0:
+            raise ValueError(f"Map '{key}' must be a non-empty 2D list.")
+        if not np.issubdtype(cells.dtype, np.integer):
+            raise ValueError(f"Map '{key}' cells must be integers.")
+        if cells.min() < 0 or cells.max() > np.iinfo(np.uint16).max:
+            raise ValueError(f"Map '{key}' cells must be in 0..65535.")
+        dtype = (
+            np.uint8 if cells.max() <= np.iinfo(np.uint8).max else np.uint16
+        )
+        return cells.astype(dtype)
+
+    def _set_grid(self, grid: np.ndarray):
+        """Install a padded grid and cache everything lookups need."""
+        self.grid = grid
+        # Unpadded view, indexed [y, x]
+        self.map_data = grid[1:-1, 1:-1]
+        self.height, self.width = self.map_data.shape
+        self._stride = grid.shape[1]
+        self._max_x = grid.shape[1] - 1
+        self._max_y = grid.shape[0] - 1
+        self._cells = grid.reshape(-1).data
+
+    def raycast_view(self, x: float, y: float) -> Tuple[np.ndarray, int, int]:
+        """
+        Return (grid, origin_x, origin_y) for ray marching from (x, y):
+        the array to march through and the world cell of grid[0, 0].
+        """
+        return self.grid, -1, -1
+
     def is_wall(self, x: float, y: float) -> bool:
         """
         Returns True if the given (x, y) position is a wall.
         Handles out-of-bounds gracefully (returns True for out-of-bounds).
         """
-        xi, yi = int(x), int(y)
-        if yi < 0 or yi >= len(self.map_data) or xi < 0 or xi >= len(self.map_data[0]):
-            return True  # Treat out-of-bounds as wall
-        return self.map_data[yi][xi] > 0
+        xi = math.floor(x) + 1
+        yi = math.floor(y) + 1
+        # The border ring covers the first cell outside the map; only
+        # positions further out take the early return.
+        if 0 <= xi <= self._max_x and 0 <= yi <= self._max_y:
+            return self._cells[yi * self._stride + xi] > 0
+        return True  # Treat out-of-bounds as wall
+
+    def is_wall_many(self, xs, ys) -> np.ndarray:
+        """
+        Vectorized is_wall for arrays of positions.
+        Returns a boolean array; out-of-bounds positions clamp onto the
+        wall border.
+        """
+        xi = np.floor(np.asarray(xs, dtype=np.float64)).astype(np.intp) + 1
+        yi = np.floor(np.asarray(ys, dtype=np.float64)).astype(np.intp) + 1
+        np.clip(xi, 0, self._max_x, out=xi)
+        np.clip(yi, 0, self._max_y, out=yi)
+        return self.grid[yi, xi] > 0
@@ -0,0 +1,317 @@
+"""
+Binary map format: a compact, memory-mappable alternative to JSON maps.
+
+Layout (little-endian):
+
+    header   magic "RCMAP\\0", version u16, width u32, height u32,
+             layer count u16, grid dtype u8, pad u8,
+             start_x f64, start_y f64
+    layers   one entry per layer: name (16 bytes, utf-8, NUL padded),
+             dtype u8, pad 7 bytes, data offset u64
+    grid     (height + 2) x (width + 2) cells, row-major, already padded
+             with the wall border GameMap uses
+    layer i  same shape as the grid, at its recorded offset
+
+Every data section starts on a 64-byte boundary, so GameMap can open the
+grid and layers with numpy.memmap: loading is near-instant and pages are
+only read from disk when touched.
+
+Convert an existing JSON map with:
+    python -m raycaster.core.mapformat maps/level.json maps/level.rcmap
+
+Open worlds too large for one file (or for RAM) use the chunked layout
+instead: a directory holding manifest.json and one .npy file per
+tile_size x tile_size tile, named "<tx>_<ty>.npy". Tiles that are
+entirely empty are not written. Produce one with --tile-size:
+    python -m raycaster.core.mapformat level.json level_tiles --tile-size 64
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+from typing import Dict, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+MAGIC = b"RCMAP\x00"
+MANIFEST = "manifest.json"
+VERSION = 1
+ALIGNMENT = 64
+
+HEADER = struct.Struct("<6sHIIHBxdd")
+LAYER = struct.Struct("<16sB7xQ")
+
+DTYPE_CODES: Dict[int, np.dtype] = {
+    1: np.dtype(np.uint8),
+    2: np.dtype(np.uint16),
+}
+_CODE_FOR_DTYPE = {dtype: code for code, dtype in DTYPE_CODES.items()}
+
+
+class BinaryMap(NamedTuple):
+    """A memory-mapped binary map."""
+
+    grid: np.ndarray  # padded grid, indexed [y, x]
+    start_position: tuple
+    layers: Dict[str, np.ndarray]  # padded like grid
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _cell_dtype(cells: np.ndarray) -> np.dtype:
+    if cells.size and (cells.min() < 0 or cells.max() > 0xFFFF):
+        raise ValueError("Map cells must be in 0..65535.")
+    if not cells.size or cells.max() <= 0xFF:
+        return np.dtype(np.uint8)
+    return np.dtype(np.uint16)
+
+
+def pad_grid(cells: np.ndarray, fill: int, dtype=None) -> np.ndarray:
+    """Return cells surrounded by a one-cell ring of fill."""
+    dtype = cells.dtype if dtype is None else dtype
+    padded = np.full(
+        (cells.shape[0] + 2, cells.shape[1] + 2), fill, dtype=dtype
+    )
+    padded[1:-1, 1:-1] = cells
+    return padded
+
+
+def is_binary_map(path: str) -> bool:
+    """True if the file at path starts with the binary map magic."""
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def write_binary_map(
+    path: str,
+    grid: np.ndarray,
+    start_position: Sequence[float] = (1.5, 1.5),
+    layers: Optional[Dict[str, np.ndarray]] = None,
+    border: int = 1,
+) -> None:
+    """
+    Write an unpadded grid (indexed [y, x]) and optional same-sized
+    layers to path. The grid gets a wall border of value border; layers
+    are padded with 0.
+    """
+    cells = np.asarray(grid)
+    if cells.ndim != 2 or cells.size == 0:
+        raise ValueError("Map grid must be a non-empty 2D array.")
+    layers = {
+        name: np.asarray(layer) for name, layer in (layers or {}).items()
+    }
+    for name, layer in layers.items():
+        if layer.shape != cells.shape:
+            raise ValueError(f"Layer '{name}' must match the grid shape.")
+        if len(name.encode("utf-8")) > 16:
+            raise ValueError(f"Layer name '{name}' is longer than 16 bytes.")
+
+    height, width = cells.shape
+    sections = [pad_grid(cells, border, _cell_dtype(cells))]
+    sections += [
+        pad_grid(layer, 0, _cell_dtype(layer)) for layer in layers.values()
+    ]
+
+    offset = _align(HEADER.size + LAYER.size * len(layers))
+    offsets = []
+    for section in sections:
+        offsets.append(offset)
+        offset = _align(offset + section.nbytes)
+
+    with open(path, "wb") as f:
+        f.write(
+            HEADER.pack(
+                MAGIC,
+                VERSION,
+                width,
+                height,
+                len(layers),
+                _CODE_FOR_DTYPE[sections[0].dtype],
+                float(start_position[0]),
+                float(start_position[1]),
+            )
+        )
+        for name, section, layer_offset in zip(
+            layers, sections[1:], offsets[1:]
+        ):
+            f.write(
+                LAYER.pack(
+                    name.encode("utf-8"),
+                    _CODE_FOR_DTYPE[section.dtype],
+                    layer_offset,
+                )
+            )
+        for section, section_offset in zip(sections, offsets):
+            f.seek(section_offset)
+            f.write(np.ascontiguousarray(section).tobytes())
+
+
+def read_binary_map(path: str) -> BinaryMap:
+    """
+    Open a binary map. The grid and layers are read-only numpy.memmap
+    arrays, so nothing beyond the header is read until it is accessed.
+    """
+    with open(path, "rb") as f:
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size or not header.startswith(MAGIC):
+            raise ValueError(f"Not a binary map file: {path}")
+        (
+            _,
+            version,
+            width,
+            height,
+            layer_count,
+            dtype_code,
+            start_x,
+            start_y,
+        ) = HEADER.unpack(header)
+        if version != VERSION:
+            raise ValueError(f"Unsupported binary map version: {version}")
+        entries = [
+            LAYER.unpack(f.read(LAYER.size)) for _ in range(layer_count)
+        ]
+
+    shape = (height + 2, width + 2)
+    grid_offset = _align(HEADER.size + LAYER.size * layer_count)
+    grid = np.memmap(
+        path,
+        dtype=DTYPE_CODES[dtype_code],
+        mode="r",
+        offset=grid_offset,
+        shape=shape,
+    )
+    layers: Dict[str, np.ndarray] = {
+        name.rstrip(b"\x00").decode("utf-8"): np.memmap(
+            path, dtype=DTYPE_CODES[code], mode="r", offset=offset, shape=shape
+        )
+        for name, code, offset in entries
+    }
+    return BinaryMap(grid, (start_x, start_y), layers)
+
+
+def tile_filename(tx: int, ty: int) -> str:
+    """File name of tile (tx, ty) inside a chunked map directory."""
+    return f"{tx}_{ty}.npy"
+
+
+def write_chunked_map(
+    directory: str,
+    grid: np.ndarray,
+    tile_size: int = 64,
+    start_position: Sequence[float] = (1.5, 1.5),
+) -> None:
+    """
+    Split an unpadded grid (indexed [y, x]) into tiles under directory,
+    the layout ChunkedGameMap streams from.
+    """
+    cells = np.asarray(grid)
+    if cells.ndim != 2 or cells.size == 0:
+        raise ValueError("Map grid must be a non-empty 2D array.")
+    if tile_size <= 0:
+        raise ValueError("tile_size must be a positive integer.")
+    cells = cells.astype(_cell_dtype(cells))
+    os.makedirs(directory, exist_ok=True)
+    height, width = cells.shape
+    for ty in range(0, height, tile_size):
+        for tx in range(0, width, tile_size):
+            tile = np.zeros((tile_size, tile_size), dtype=cells.dtype)
+            y1, x1 = ty + tile_size, tx + tile_size
+            part = cells[ty:y1, tx:x1]
+            if not part.any():
+                continue
+            tile[: part.shape[0], : part.shape[1]] = part
+            name = tile_filename(tx // tile_size, ty // tile_size)
+            np.save(os.path.join(directory, name), tile)
+    manifest = {
+        "width": width,
+        "height": height,
+        "tile_size": tile_size,
+        "dtype": cells.dtype.name,
+        "start_position": [float(v) for v in start_position],
+    }
+    with open(os.path.join(directory, MANIFEST), "w") as f:
+        json.dump(manifest, f)
+
+
+def share_grid(grid: np.ndarray):
+    """
+    Return a picklable handle for grid to hand to worker processes.
+    A grid opened by read_binary_map travels as its file location, so
+    workers map the same pages instead of unpickling a copy; any other
+    array travels as itself.
+    """
+    if isinstance(grid, np.memmap) and isinstance(grid.base, mmap.mmap):
+        return (
+            "memmap",
+            grid.filename,
+            grid.offset,
+            grid.shape,
+            grid.dtype.str,
+        )
+    return ("array", grid)
+
+
+def attach_grid(handle) -> np.ndarray:
+    """Open a grid from a handle made by share_grid."""
+    if handle[0] == "memmap":
+        _, filename, offset, shape, dtype = handle
+        return np.memmap(
+            filename,
+            dtype=np.dtype(dtype),
+            mode="r",
+            offset=offset,
+            shape=shape,
+        )
+    return handle[1]
+
+
+def convert_json_map(
+    json_path: str, out_path: str, tile_size: Optional[int] = None
+) -> None:
+    """
+    Convert a JSON map ({"grid": ..., "start_position": ...,
+    optional "layers": {name: grid}}) to the binary format, or to a
+    chunked map directory when tile_size is given (layers are dropped).
+    """
+    with open(json_path, "r") as f:
+        data = json.load(f)
+    if "grid" not in data:
+        raise ValueError("Map data missing 'grid' key.")
+    if tile_size is not None:
+        write_chunked_map(
+            out_path,
+            np.asarray(data["grid"]),
+            tile_size,
+            data.get("start_position", (1.5, 1.5)),
+        )
+        return
+    write_binary_map(
+        out_path,
+        np.asarray(data["grid"]),
+        data.get("start_position", (1.5, 1.5)),
+        data.get("layers"),
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Convert a JSON map to the binary map format"
+    )
+    parser.add_argument("json_path", help="Source JSON map")
+    parser.add_argument("out_path", help="Destination binary map")
+    parser.add_argument(
+        "--tile-size",
+        type=int,
+        default=None,
+        help="Write a chunked map directory with tiles of this size",
+    )
+    args = parser.parse_args(argv)
+    convert_json_map(args.json_path, args.out_path, args.tile_size)
+
+
+if __name__ == "__main__":
+    main()
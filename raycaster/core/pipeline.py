@@ -0,0 +1,129 @@
+"""
+Hook pipeline: the engine's per-tick and per-frame calls (hooks, input,
+updates, rendering) flattened into lists of bound callables, built once
+and rebuilt only when hooks are registered or removed.
+
+Running a pipeline is a plain loop of calls. Only steps built with
+isolate=True get a try/except, and their errors go to a
+RateLimitedLogger, so a hook that fails every frame can't flood the
+console. Errors from other steps propagate to the caller.
+"""
+
+from typing import Callable, Dict, List, NamedTuple, Sequence, Tuple
+
+from .profiler import clock
+
+
+class RateLimitedLogger:
+    """
+    Prints error messages, each distinct label at most once per interval
+    seconds. Messages dropped in between are counted and mentioned in
+    the next one printed for that label.
+    """
+
+    def __init__(self, interval: float = 5.0, prefix: str = "[Engine]"):
+        self.interval = interval
+        self.prefix = prefix
+        # label -> [time of last print, messages suppressed since]
+        self._last: Dict[str, list] = {}
+        # Total messages suppressed, for diagnostics
+        self.suppressed = 0
+
+    def error(self, label: str, error: BaseException) -> bool:
+        """Report error raised by label; returns whether it was printed."""
+        now = clock()
+        entry = self._last.get(label)
+        if entry is not None and now - entry[0] < self.interval:
+            entry[1] += 1
+            self.suppressed += 1
+            return False
+        message = f"{self.prefix} {label} error: {error}"
+        if entry is not None and entry[1]:
+            message += f" ({entry[1]} more since last report)"
+        self._last[label] = [now, 0]
+        print(message)
+        return True
+
+
+class Step(NamedTuple):
+    """One call of a pipeline."""
+
+    call: Callable[[], None]
+    # Wrap the call in try/except and log errors under label
+    isolate: bool = False
+    label: str = ""
+    # Hooks are timed individually when profiling
+    hook: bool = False
+
+
+class Pipeline:
+    """
+    Runs the steps of its phases in order. phases is a sequence of
+    (phase name, steps); the names are only used when profiling.
+    """
+
+    def __init__(
+        self,
+        phases: Sequence[Tuple[str, Sequence[Step]]],
+        logger: RateLimitedLogger,
+    ):
+        self.logger = logger
+        self.phases = [
+            (name, [(step, self._bind(step)) for step in steps])
+            for name, steps in phases
+        ]
+        self.calls: List[Callable[[], None]] = [
+            call for _, steps in self.phases for _, call in steps
+        ]
+
+    def __len__(self) -> int:
+        return len(self.calls)
+
+    def _bind(self, step: Step) -> Callable[[], None]:
+        if not step.isolate:
+            return step.call
+        call, label, logger = step.call, step.label, self.logger
+
+        def isolated():
+            try:
+                call()
+            except Exception as e:
+                logger.error(label, e)
+
+        return isolated
+
+    def run(self, prof=None) -> None:
+        """
+        Call every step. With a FrameProfiler, each phase is lapped and
+        each hook recorded as "<phase>:<hook>" (see FrameProfiler.label).
+        """
+        if prof is None:
+            for call in self.calls:
+                call()
+            return
+        mark = clock()
+        for phase, steps in self.phases:
+            for step, call in steps:
+                if step.hook:
+                    start = clock()
+                    call()
+                    prof.record(prof.label(phase, step.call), clock() - start)
+                else:
+                    call()
+            mark = prof.lap(phase, mark)
+
+
+def hook_steps(
+    hooks: Sequence[Callable[[], None]],
+    label: str,
+    isolated: Sequence[Callable] = (),
+) -> List[Step]:
+    """
+    Steps for a hook list, logged as "<label> hook"; hooks in isolated
+    (compared by identity) get error isolation.
+    """
+    isolated_ids = {id(hook) for hook in isolated}
+    return [
+        Step(hook, id(hook) in isolated_ids, f"{label} hook", hook=True)
+        for hook in hooks
+    ]
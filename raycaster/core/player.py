@@ -2,6 +2,7 @@
 Player: handles player state and movement.
 """
 
+import math
 from typing import Tuple
 
 
@@ -21,8 +22,27 @@ class Player:
         self.angle = 0.0
         self.move_speed = move_speed
         self.turn_speed = turn_speed
+        # Pose at the previous simulation tick, for render interpolation
+        self.prev_x, self.prev_y, self.prev_angle = self.x, self.y, self.angle
         # Future: self.health = 100, self.inventory = []
 
+    def save_state(self):
+        """Remember the current pose; called before each simulation tick."""
+        self.prev_x, self.prev_y, self.prev_angle = self.x, self.y, self.angle
+
+    def interpolate(self, alpha: float) -> Tuple[float, float, float]:
+        """
+        Pose (x, y, angle) a fraction alpha of the way from the previous
+        tick's pose to the current one; the angle turns the short way.
+        """
+        turn = self.angle - self.prev_angle
+        turn = (turn + math.pi) % math.tau - math.pi
+        return (
+            self.prev_x + (self.x - self.prev_x) * alpha,
+            self.prev_y + (self.y - self.prev_y) * alpha,
+            self.prev_angle + turn * alpha,
+        )
+
     def update(self):
         """
         Update player state.
@@ -6,6 +6,11 @@ class RendererPlugin:
     Base class for renderer plugins.
     Plugins can override pre_render, post_render, and render_override
     to inject custom logic.
+
+    Frames are only redrawn when something changed (see
+    Renderer.needs_redraw). A plugin whose output changes on its own
+    either calls renderer.invalidate() when it does, or overrides
+    needs_redraw.
     """
 
     def pre_render(self, renderer: Any) -> None:
@@ -22,3 +27,10 @@ class RendererPlugin:
         Override in your plugin if you want to take over rendering.
         """
         return False
+
+    def needs_redraw(self, renderer: Any) -> bool:
+        """
+        Called before each frame that would otherwise be skipped as
+        unchanged. Return True to have it drawn anyway.
+        """
+        return False
@@ -0,0 +1,111 @@
+"""
+FrameProfiler: per-frame timing of engine phases, hooks and plugins.
+"""
+
+import time
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+# High-resolution clock used for every measurement (seconds).
+clock = time.perf_counter
+
+PERCENTILES = (50, 95, 99)
+
+
+class FrameProfiler:
+    """
+    Records durations by name into fixed-size ring buffers and reports
+    rolling percentiles over the last `window` samples of each name.
+
+    Instrumented code checks `enabled` once per frame and skips all
+    timing when it is off, so a disabled profiler costs a branch per
+    phase. Names are free-form. The engine records its phases ("events",
+    "simulation", "event_queue", "pre_render", "render", "post_render",
+    "flip", "tick"), once per simulation tick "pre_update", "input", "update"
+    and "post_update", "frame" for the whole loop iteration and
+    "<phase>:<hook>" per registered hook. Renderer records
+    "render.reproject", "render.columns", "render.sprites", "render.blit"
+    and "plugin_<hook>:<Plugin>" per plugin call.
+    """
+
+    def __init__(self, window: int = 240, enabled: bool = False):
+        if not isinstance(window, int) or window <= 0:
+            raise ValueError("window must be a positive integer")
+        self.window = window
+        self.enabled = enabled
+        # name -> [ring buffer, total samples recorded]
+        self._rings: Dict[str, list] = {}
+        self._labels: Dict[Any, str] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        """Add one duration sample for name."""
+        ring = self._rings.get(name)
+        if ring is None:
+            ring = self._rings[name] = [np.zeros(self.window), 0]
+        count = ring[1]
+        ring[0][count % self.window] = seconds
+        ring[1] = count + 1
+
+    def lap(self, name: str, start: float) -> float:
+        """Record the time since start under name; returns the current time."""
+        now = clock()
+        self.record(name, now - start)
+        return now
+
+    def label(self, phase: str, obj: Any) -> str:
+        """
+        Stable sample name for a hook or plugin called during phase,
+        e.g. "pre_render:FPSCounterPlugin" or "post_update:my_hook".
+        """
+        key = (phase, obj)
+        name = self._labels.get(key)
+        if name is None:
+            owner = getattr(obj, "__self__", None)
+            if owner is None and not hasattr(obj, "__qualname__"):
+                owner = obj  # a plugin instance
+            base = getattr(obj, "__qualname__", None)
+            if owner is not None:
+                base = type(owner).__name__
+            name = self._labels[key] = f"{phase}:{base}"
+        return name
+
+    def samples(self, name: str) -> np.ndarray:
+        """The retained samples for name (seconds), oldest first."""
+        ring = self._rings.get(name)
+        if ring is None:
+            return np.zeros(0)
+        samples, count = ring
+        if count < self.window:
+            return samples[:count].copy()
+        return np.roll(samples, -(count % self.window))
+
+    def percentiles(self, name: str) -> Optional[Dict[str, float]]:
+        """
+        Rolling {"p50", "p95", "p99", "mean", "count"} for name, with
+        times in milliseconds; None if nothing was recorded.
+        """
+        ring = self._rings.get(name)
+        if ring is None:
+            return None
+        return self._summarize(*ring)
+
+    def _summarize(self, samples: np.ndarray, count: int) -> Dict[str, float]:
+        retained = samples[: min(count, self.window)] * 1000.0
+        stats = {
+            f"p{p}": float(v)
+            for p, v in zip(PERCENTILES, np.percentile(retained, PERCENTILES))
+        }
+        stats["mean"] = float(retained.mean())
+        stats["count"] = count
+        return stats
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """percentiles() for every recorded name."""
+        return {
+            name: self._summarize(*ring) for name, ring in self._rings.items()
+        }
+
+    def reset(self) -> None:
+        """Forget all samples."""
+        self._rings.clear()
@@ -17,11 +17,33 @@ class PygameRenderer(BaseRenderer):
         self.map_obj = map_obj
         self.player = player
         self.config = config
+        # Player pose of the last drawn frame (see needs_redraw), and
+        # whether a redraw was requested since
+        self._drawn = None
+        self._invalidated = True
+
+    def _pose(self):
+        player = self.player
+        return (player.x, player.y, getattr(player, "angle", 0.0))
+
+    def invalidate(self):
+        """Have the next frame drawn even if the player hasn't moved."""
+        self._invalidated = True
+
+    def needs_redraw(self) -> bool:
+        """
+        False if the next frame would repeat the last one: same player
+        pose and no invalidate() since. Rendering code that draws
+        anything else that changes should call invalidate().
+        """
+        return self._invalidated or self._pose() != self._drawn
 
     def render_frame(self):
         # Example: fill screen with a color (replace with real rendering)
         self.screen.fill((0, 0, 0))
         # ...your pygame rendering code...
+        self._drawn = self._pose()
+        self._invalidated = False
 
     def flip(self):
         pygame.display.flip()
@@ -0,0 +1,323 @@
+"""
+Raycasting kernels: DDA (digital differential analyzer) grid traversal.
+
+Two interchangeable implementations are provided:
+
+- cast_rays: traces every screen column of a frame in batched NumPy
+  calls (the "numpy" engine, and the backend's fallback when the
+  compiled extension isn't built).
+- cast_ray: traces a single ray with a plain Python loop. Kept as the
+  reference implementation and for the per-column "python" engine.
+
+For a 640-column frame on 8-128 cell maps, cast_rays takes 0.2-1.7 ms
+against 0.9-12.5 ms for cast_ray looped over the columns: 3-4.5x on
+small or cluttered maps, where rays are short and NumPy's fixed per-call
+cost (about 0.2 ms) dominates, up to 7.5x on open 128-cell maps. That is
+short of an order of magnitude; the compiled backend.cast_rays, at
+0.02-0.2 ms, is the engine to use when speed matters.
+
+Both return the same data: the perpendicular (fisheye-free) distance to
+the first wall, the wall id from the grid, which side of the cell was
+hit (0 = vertical grid line, 1 = horizontal grid line), the horizontal
+texture coordinate in [0, 1) and the grid cell that was hit.
+Rays that leave the grid stop at its edge and report wall id -1; rays
+that travel further than max_distance report an infinite distance and
+wall id 0.
+"""
+
+import math
+from typing import NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Engines selectable through EngineConfig.raycast_engine: the backend
+# routine (compiled when available), the NumPy batch kernel below, or the
+# scalar Python loop.
+RAYCAST_ENGINES = ("backend", "numpy", "python")
+
+
+class RayHits(NamedTuple):
+    """Per-column results of a raycast, one array element per ray."""
+
+    distance: np.ndarray  # float64 perpendicular distance
+    wall: np.ndarray  # int32 grid value of the wall hit
+    side: np.ndarray  # int8, 0 = x side, 1 = y side
+    tex_u: np.ndarray  # float64 texture coordinate in [0, 1)
+    map_x: np.ndarray  # int32 grid column of the hit cell
+    map_y: np.ndarray  # int32 grid row of the hit cell
+
+
+def camera_plane(fov: float, angle: float) -> Tuple[float, ...]:
+    """
+    Return (dir_x, dir_y, plane_x, plane_y) for a camera looking along
+    angle (radians) with a horizontal field of view of fov (degrees).
+    """
+    dir_x, dir_y = math.cos(angle), math.sin(angle)
+    half = math.tan(math.radians(fov) / 2.0)
+    return dir_x, dir_y, -dir_y * half, dir_x * half
+
+
+def camera_rays(
+    width: int, fov: float, angle: float, start: int = 0, stop=None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Ray directions for screen columns [start, stop) of a width-wide frame.
+    Directions are dir + plane * camera_x, so distances measured along
+    them are already perpendicular to the camera plane.
+    """
+    stop = width if stop is None else stop
+    dir_x, dir_y, plane_x, plane_y = camera_plane(fov, angle)
+    camera_x = 2.0 * np.arange(start, stop, dtype=np.float64) / width - 1.0
+    return dir_x + plane_x * camera_x, dir_y + plane_y * camera_x
+
+
+class CameraTable(NamedTuple):
+    """
+    Per-column camera constants for one (width, fov): column rays are
+    the view direction rotated from (1, offset), see rotate_rays.
+    """
+
+    offset: np.ndarray  # float64 camera-plane offset, tan(fov/2) * camera_x
+    # float64 cosine of each ray's angle off the view axis: multiplies a
+    # Euclidean distance into a perpendicular (fisheye-free) one. Rays
+    # from rotate_rays are unnormalized, so DDA distances along them are
+    # perpendicular already.
+    correction: np.ndarray
+
+
+def camera_table(width: int, fov: float) -> CameraTable:
+    """Build the CameraTable for a width-column frame and fov degrees."""
+    half = math.tan(math.radians(fov) / 2.0)
+    camera_x = 2.0 * np.arange(width, dtype=np.float64) / width - 1.0
+    offset = half * camera_x
+    correction = 1.0 / np.sqrt(1.0 + offset * offset)
+    offset.flags.writeable = False
+    correction.flags.writeable = False
+    return CameraTable(offset, correction)
+
+
+def rotate_rays(
+    table: CameraTable, angle: float, start: int = 0, stop=None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Ray directions for columns [start, stop): (1, offset) rotated by the
+    view angle. Same rays as camera_rays, without recomputing the plane.
+    """
+    offset = table.offset[start:stop]
+    cos, sin = math.cos(angle), math.sin(angle)
+    return cos - sin * offset, sin + cos * offset
+
+
+def _first_walls(
+    flat: np.ndarray,
+    stop: np.ndarray,
+    b0: np.ndarray,
+    slope: np.ndarray,
+    base: np.ndarray,
+    a_step: np.ndarray,
+    stride_b: np.ndarray,
+    block: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find, for every traced row, the first crossing k < stop that enters
+    a wall. Crossing k enters the cell at flat index
+    base + k * a_step + floor(b0 + k * slope) * stride_b; a whole block
+    of crossings is looked up per NumPy call instead of stepping one
+    cell at a time. Returns (crossing, cell value), crossing -1 if none.
+    """
+    crossing = np.full(len(stop), -1, dtype=np.int64)
+    cell = np.zeros(len(stop), dtype=np.int32)
+    block = max(1, min(block, int(stop.max(initial=0))))
+    # Rows still tracing; None = all of them, to skip the gathers
+    idx = None
+    k0 = 0
+    with np.errstate(invalid="ignore"):
+        while True:
+            rows = [b0, slope, base, a_step, stride_b, stop]
+            if idx is not None:
+                rows = [a[idx] for a in rows]
+            row_b0, row_slope, row_base, row_step, row_stride, live = rows
+            k = np.arange(k0, k0 + block)
+            # Truncation floors every cell inside the grid; cells it gets
+            # wrong lie past where the ray left the grid along b, which
+            # the other axis reports nearer
+            index = np.multiply.outer(row_slope, k)
+            index += row_b0[:, None]
+            index = index.astype(np.intp)
+            index *= row_stride[:, None]
+            index += np.multiply.outer(row_step, k)
+            index += row_base[:, None]
+            values = flat.take(index, mode="clip")
+            # The first solid lookup is the hit if it lies before stop;
+            # lookups from stop on are out of range or out of reach
+            col = (values != 0).argmax(axis=1)
+            value = values[np.arange(len(col)), col]
+            col += k0
+            found = col < live
+            found &= value != 0
+            ray = found.nonzero()[0] if idx is None else idx[found]
+            crossing[ray] = col[found]
+            cell[ray] = value[found]
+            k0 += block
+            more = live > k0
+            more &= ~found
+            if not more.any():
+                return crossing, cell
+            idx = more.nonzero()[0] if idx is None else idx[more]
+            # Survivors are the long rays: give them bigger blocks.
+            block *= 2
+
+
+def cast_rays(
+    grid: np.ndarray,
+    pos_x: float,
+    pos_y: float,
+    ray_dx: np.ndarray,
+    ray_dy: np.ndarray,
+    max_distance: Optional[float] = None,
+    block: int = 8,
+) -> RayHits:
+    """
+    Trace all rays through grid (2D array, nonzero = wall) at once.
+    Every ray is traced twice in one stacked batch, once over its
+    crossings of horizontal grid lines and once over vertical ones
+    (see _first_walls), and the nearer wall of the two wins. Rays are
+    not traced further than max_distance.
+    """
+    rows, cols = grid.shape
+    flat = np.ascontiguousarray(grid).ravel()
+    n = ray_dx.shape[0]
+    start_x, start_y = math.floor(pos_x), math.floor(pos_y)
+    # Row 0 follows crossings of horizontal lines (axis a = y, b = x),
+    # row 1 those of vertical lines (a = x, b = y). Crossing k of a row
+    # happens at t = first + k * delta, into the cell start_a +
+    # step * (k + 1) along a and b0 + k * slope along b.
+    da = np.concatenate((ray_dy, ray_dx)).reshape(2, n)
+    db = np.concatenate((ray_dx, ray_dy)).reshape(2, n)
+    neg = da < 0
+    frac = np.array([[pos_y - start_y], [pos_x - start_x]])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        delta = np.abs(1.0 / da)
+        first = np.where(neg, frac, 1.0 - frac)
+        first *= delta
+        b0 = first * db
+        b0 += np.array([[pos_x], [pos_y]])
+        slope = delta * db
+        # Crossing at which a ray leaves the grid along a; it reports
+        # the boundary (-1). Leaving along b is found, earlier, by the
+        # other row.
+        exit_k = np.where(
+            neg,
+            np.array([[start_y], [start_x]]),
+            np.array([[rows - 1 - start_y], [cols - 1 - start_x]]),
+        )
+        if max_distance is None:
+            stop = exit_k.copy()
+            boundary = da != 0
+        else:
+            reach = np.floor((max_distance - first) / delta)
+            stop = np.minimum(reach + 1, exit_k).astype(np.int64)
+            boundary = exit_k <= reach
+    stop[da == 0] = 0
+    a_step = np.where(neg, -1, 1) * np.array([[cols], [1]])
+    base = np.array([[start_y * cols], [start_x]]) + a_step
+
+    crossing, cell = _first_walls(
+        flat,
+        stop.ravel(),
+        b0.ravel(),
+        slope.ravel(),
+        base.ravel(),
+        a_step.ravel(),
+        np.repeat([1, cols], n),
+        block,
+    )
+    boundary = boundary.ravel() & (crossing < 0)
+    crossing[boundary] = exit_k.ravel()[boundary]
+    cell[boundary] = -1
+    with np.errstate(invalid="ignore"):
+        dist = first.ravel() + crossing * delta.ravel()
+    dist[crossing < 0] = np.inf
+
+    # Ties go to the y side, matching the scalar DDA's step order.
+    y_side = dist[:n] <= dist[n:]
+    pick = np.arange(n)
+    pick[~y_side] += n
+    distance = dist[pick]
+    wall = cell[pick]
+    crossing = crossing[pick]
+    with np.errstate(invalid="ignore"):
+        wall_pos = b0.ravel()[pick] + crossing * slope.ravel()[pick]
+        b_cell = np.floor(wall_pos)
+        tex_u = wall_pos - b_cell
+    neg = neg.ravel()[pick]
+    a_cell = np.where(neg, -1 - crossing, crossing + 1)
+    a_cell += np.where(y_side, start_y, start_x)
+    flip = neg == y_side
+    tex_u[flip] = 1.0 - tex_u[flip]
+    missed = crossing < 0
+    tex_u[missed] = 0.0
+    b_cell[missed] = 0
+    a_cell[missed] = 0
+    b_cell = b_cell.astype(np.int32)
+    a_cell = a_cell.astype(np.int32)
+    map_x = np.where(y_side, b_cell, a_cell)
+    map_y = np.where(y_side, a_cell, b_cell)
+    side = y_side.astype(np.int8)
+    return RayHits(distance, wall, side, tex_u, map_x, map_y)
+
+
+def cast_ray(
+    grid: Sequence[Sequence[int]],
+    pos_x: float,
+    pos_y: float,
+    ray_dx: float,
+    ray_dy: float,
+    max_distance: Optional[float] = None,
+) -> Tuple[float, int, int, float, int, int]:
+    """
+    Trace a single ray with a scalar Python DDA loop.
+    Returns (distance, wall, side, tex_u, map_x, map_y) with the same
+    conventions as cast_rays.
+    """
+    rows, cols = len(grid), len(grid[0])
+    if max_distance is None:
+        max_distance = math.inf
+    map_x, map_y = math.floor(pos_x), math.floor(pos_y)
+    delta_x = abs(1.0 / ray_dx) if ray_dx != 0 else math.inf
+    delta_y = abs(1.0 / ray_dy) if ray_dy != 0 else math.inf
+    if ray_dx < 0:
+        step_x, side_x = -1, (pos_x - map_x) * delta_x
+    else:
+        step_x = 1
+        side_x = (map_x + 1.0 - pos_x) * delta_x if ray_dx else math.inf
+    if ray_dy < 0:
+        step_y, side_y = -1, (pos_y - map_y) * delta_y
+    else:
+        step_y = 1
+        side_y = (map_y + 1.0 - pos_y) * delta_y if ray_dy else math.inf
+
+    while True:
+        if side_x < side_y:
+            map_x += step_x
+            dist, side = side_x, 0
+            side_x += delta_x
+        else:
+            map_y += step_y
+            dist, side = side_y, 1
+            side_y += delta_y
+        if dist > max_distance:
+            return math.inf, 0, 0, 0.0, map_x, map_y
+        if 0 <= map_y < rows and 0 <= map_x < cols:
+            cell = int(grid[map_y][map_x])
+        else:
+            cell = -1
+        if cell != 0:
+            if side == 0:
+                wall_pos = pos_y + dist * ray_dy
+            else:
+                wall_pos = pos_x + dist * ray_dx
+            tex_u = wall_pos - math.floor(wall_pos)
+            if (side == 0 and ray_dx > 0) or (side == 1 and ray_dy < 0):
+                tex_u = 1.0 - tex_u
+            return dist, cell, side, tex_u, map_x, map_y
@@ -2,28 +2,303 @@
 Raycasting renderer: handles drawing the scene from the player's perspective.
 """
 
+import math
+import multiprocessing
 import os
 from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
+import numpy as np
 import pygame
 
+from .. import backend
+from .baserenderer import BaseRenderer
 from .config import EngineConfig
+from .floorcast import FloorCaster
+from .framebuffer import SharedArray, SharedFramebuffer
 from .map import GameMap
+from .mapformat import attach_grid, share_grid
 from .player import Player
 from .plugin import RendererPlugin
-from .baserenderer import BaseRenderer
+from .profiler import FrameProfiler, clock
+from .raycast import (
+    CameraTable,
+    RayHits,
+    camera_table,
+    cast_ray,
+    cast_rays,
+    rotate_rays,
+)
+from .reproject import reproject_hits
+from .resolution import ResolutionScaler
+from .sprites import render_sprites
+from .textures import DEFAULT_TEXTURE_DIR, TextureAtlas, load_textures
+
+# Render state of a pool worker process, installed once by _init_worker.
+_WORKER_STATE: dict = {}
+
+# Shared hit buffers hold one float64 row per RayHits field; fields are
+# converted back to these types when loaded.
+HIT_DTYPES = (np.float64, np.int32, np.int8, np.float64, np.int32, np.int32)
+HIT_FIELDS = len(HIT_DTYPES)
+
+# Wall colors indexed by wall id (modulo the palette size); y-side hits
+# are drawn darker.
+WALL_COLORS = np.array(
+    [
+        (0, 0, 0),
+        (200, 60, 60),
+        (60, 180, 60),
+        (60, 90, 200),
+        (200, 180, 60),
+        (160, 60, 180),
+        (60, 170, 170),
+        (90, 90, 90),
+    ],
+    dtype=np.uint8,
+)
 
 
-def raycast_column(args):
+class FrameParams(NamedTuple):
+    """Per-frame inputs shared by every column task of a frame."""
+
+    width: int
+    fov: float
+    pose: Tuple[float, float, float]  # (x, y, angle)
+    engine: str
+    ceiling: Tuple[int, int, int]
+    floor: Tuple[int, int, int]
+    # Set when the map view moved since the workers were started (streamed
+    # maps): (shared block name, shape, dtype, origin) of the new grid.
+    view: Optional[tuple] = None
+    # Rows rendered; frames narrower or shorter than the framebuffer
+    # (dynamic resolution) use its top-left corner. None = all rows.
+    height: Optional[int] = None
+    # The frame's hits are already in the shared hit buffer (temporal
+    # reprojection, see Renderer.reproject): draw them, don't trace.
+    reuse: bool = False
+
+
+def _init_worker(
+    grid_handle,
+    origin,
+    framebuffer_name: str,
+    depth_name: str,
+    width: int,
+    height: int,
+    textures: Optional[TextureAtlas] = None,
+    floors: Optional[FloorCaster] = None,
+    hits_name: Optional[str] = None,
+):
     """
-    Standalone function for raycasting a single vertical column.
-    Must be at module level for ProcessPoolExecutor.
-    Replace this logic with your actual raycasting.
+    Pool initializer: open the map grid (see mapformat.share_grid) and
+    attach to the shared framebuffer, z-buffer and (when reprojecting)
+    hit buffer, once per worker process. textures and floors are
+    pickled to each worker once, here.
     """
-    x, width = args
-    # Example: return a color based on x (replace with real raycasting)
-    color = (x % 255, 100, 255 - (x % 255))
-    return x, color
+    framebuffer = SharedFramebuffer(width, height, name=framebuffer_name)
+    depth = SharedArray((width,), np.float64, name=depth_name)
+    _WORKER_STATE["grid"] = attach_grid(grid_handle)
+    _WORKER_STATE["origin"] = origin
+    _WORKER_STATE["pixels"] = framebuffer.pixels
+    _WORKER_STATE["framebuffer"] = framebuffer
+    _WORKER_STATE["depth"] = depth.array
+    _WORKER_STATE["depth_buffer"] = depth
+    if textures is not None:
+        _WORKER_STATE["textures"] = textures
+    if floors is not None:
+        _WORKER_STATE["floors"] = floors
+    if hits_name is not None:
+        hits = SharedArray((HIT_FIELDS, width), np.float64, name=hits_name)
+        _WORKER_STATE["hits"] = hits.array
+        _WORKER_STATE["hit_buffer"] = hits
+
+
+def camera(state: dict, width: int, fov: float) -> CameraTable:
+    """
+    The CameraTable for (width, fov), cached in state (the renderer's or
+    a worker's) and rebuilt whenever the resolution or FOV changes.
+    """
+    key = (width, fov)
+    if state.get("camera_key") != key:
+        state["camera"] = camera_table(width, fov)
+        state["camera_key"] = key
+    return state["camera"]
+
+
+def store_hits(buffer: np.ndarray, start: int, hits: RayHits) -> None:
+    """Write hits into columns start.. of a (HIT_FIELDS, width) buffer."""
+    stop = start + len(hits.distance)
+    for row, values in zip(buffer, hits):
+        row[start:stop] = values
+
+
+def load_hits(buffer: np.ndarray, start: int, stop: int) -> RayHits:
+    """The RayHits of columns [start, stop) stored in buffer."""
+    return RayHits(
+        *(
+            buffer[field, start:stop].astype(dtype)
+            for field, dtype in enumerate(HIT_DTYPES)
+        )
+    )
+
+
+def trace_rays(state: dict, pose, ray_dx, ray_dy, engine: str) -> RayHits:
+    """
+    Raycast the rays (ray_dx, ray_dy) from pose (grid coordinates) with
+    the named engine.
+    """
+    pos_x, pos_y, _ = pose
+    if engine == "python" and len(ray_dx):
+        if "rows" not in state:
+            state["rows"] = state["grid"].tolist()
+        columns = [
+            cast_ray(state["rows"], pos_x, pos_y, float(dx), float(dy))
+            for dx, dy in zip(ray_dx, ray_dy)
+        ]
+        distance, wall, side, tex_u, map_x, map_y = zip(*columns)
+        hits = RayHits(
+            np.array(distance),
+            np.array(wall, dtype=np.int32),
+            np.array(side, dtype=np.int8),
+            np.array(tex_u),
+            np.array(map_x, dtype=np.int32),
+            np.array(map_y, dtype=np.int32),
+        )
+    else:
+        cast = backend.cast_rays if engine == "backend" else cast_rays
+        hits = cast(state["grid"], pos_x, pos_y, ray_dx, ray_dy)
+    # Rays that leave the grid ran past the edge of a streamed map's
+    # view window (GameMap grids are walled in): nothing is drawn there
+    escaped = hits.wall < 0
+    if escaped.any():
+        hits.distance[escaped] = np.inf
+        hits.wall[escaped] = 0
+        hits.side[escaped] = 0
+        hits.tex_u[escaped] = 0.0
+    return hits
+
+
+def grid_pose(state: dict, pose):
+    """pose shifted by the map view's origin: rays march in grid cells."""
+    origin_x, origin_y = state["origin"]
+    x, y, angle = pose
+    return (x - origin_x, y - origin_y, angle)
+
+
+def trace_columns(state: dict, start: int, stop: int, params) -> RayHits:
+    """Raycast the contiguous run of columns [start, stop)."""
+    pose = grid_pose(state, params.pose)
+    table = camera(state, params.width, params.fov)
+    ray_dx, ray_dy = rotate_rays(table, pose[2], start, stop)
+    return trace_rays(state, pose, ray_dx, ray_dy, params.engine)
+
+
+def render_columns(state: dict, start: int, stop: int, params) -> None:
+    """
+    Raycast columns [start, stop) and draw them straight into the
+    framebuffer held by state, texture-mapped when state holds a
+    TextureAtlas and flat-shaded otherwise; floors and ceilings likewise
+    with a FloorCaster in state. Each column's wall distance
+    is recorded in the z-buffer (state["depth"]) for the sprite pass,
+    and its hit in the hit buffer (state["hits"]) when there is one;
+    with params.reuse the hits are read from there instead of traced.
+    """
+    if params.reuse:
+        hits = load_hits(state["hits"], start, stop)
+    else:
+        hits = trace_columns(state, start, stop, params)
+        hit_buffer = state.get("hits")
+        if hit_buffer is not None:
+            store_hits(hit_buffer, start, hits)
+    pixels = state["pixels"]
+    if params.height is not None:
+        width, height = params.width, params.height
+        pixels = pixels[:width, :height]
+    if "depth" in state:
+        state["depth"][start:stop] = hits.distance
+    floors = state.get("floors")
+    if floors is None:
+        backend.fill_floor_ceiling(
+            pixels, start, stop, params.ceiling, params.floor
+        )
+    else:
+        height = pixels.shape[1]
+        # Walls paint over every floor row above the shortest wall's
+        # bottom in the chunk
+        line = height / max(float(hits.distance.max()), 1e-9)
+        first_row = int((height + min(line, height)) // 2)
+        ray_dx, ray_dy = rotate_rays(
+            camera(state, params.width, params.fov),
+            params.pose[2],
+            start,
+            stop,
+        )
+        floors.draw(
+            pixels, start, params.pose, ray_dx, ray_dy, params.fov, first_row
+        )
+    textures = state.get("textures")
+    if textures is None:
+        backend.fill_wall_columns(
+            pixels, start, hits.distance, hits.side, hits.wall, WALL_COLORS
+        )
+        return
+    backend.fill_textured_columns(
+        pixels,
+        start,
+        hits.distance,
+        hits.side,
+        hits.wall,
+        hits.tex_u,
+        textures.texels,
+        textures.level_offsets,
+        textures.level_sizes,
+        textures.count,
+    )
+
+
+def render_chunk(args) -> None:
+    """
+    Render one chunk of columns inside a pool worker.
+    Runs inside the persistent worker pool: one task covers a whole chunk,
+    and the pixels land in shared memory, so nothing but the small task
+    tuple crosses the process boundary.
+    """
+    start, stop, params = args
+    if params.view is not None:
+        _attach_view(_WORKER_STATE, params.view)
+    render_columns(_WORKER_STATE, start, stop, params)
+
+
+def _attach_view(state: dict, view: tuple) -> None:
+    """Switch a worker to the shared map view described by view."""
+    name, shape, dtype, origin = view
+    current = state.get("view")
+    if current is not None and current.name == name:
+        return
+    shared = SharedArray(shape, dtype, name=name)
+    state["grid"] = shared.array
+    state["origin"] = origin
+    state["view"] = shared
+    state.pop("rows", None)
+    if current is not None:
+        current.close()
+
+
+def column_chunks(width: int, chunk_size: int) -> List[Tuple[int, int]]:
+    """
+    Split the screen columns [0, width) into (start, stop) ranges of at
+    most chunk_size columns each.
+    """
+    return [
+        (start, min(start + chunk_size, width))
+        for start in range(0, width, chunk_size)
+    ]
+
+
+def _warm_up(_):
+    """No-op task used to start every pool worker ahead of the first frame."""
+    return os.getpid()
 
 
 class Renderer(BaseRenderer):
@@ -36,49 +311,447 @@ class Renderer(BaseRenderer):
         config: EngineConfig,
         headless: bool = False,
     ):
-        super().__init__(game_map, player, config, headless)
+        # Allow headless mode for CI/testing (no window)
+        if headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+        pygame.init()
+        self.screen = pygame.display.set_mode(config.resolution)
+        pygame.display.set_caption("Raycaster Engine")
+        self.clock = pygame.time.Clock()
+        self.game_map = game_map
+        self.player = player
+        self.config = config
+        self.plugins: List[RendererPlugin] = []
+        # Set by the engine; times plugins and render stages when enabled
+        self.profiler: Optional[FrameProfiler] = None
+        # Set by the engine each frame: how far between the player's last
+        # two simulation ticks to draw (1.0 = the current pose).
+        self.alpha: float = 1.0
+        # ECS world whose Renderable entities are drawn as sprites; set
+        # by the engine.
+        self.world = None
+        # What the last drawn frame showed (see needs_redraw), and
+        # whether a redraw was requested since
+        self._drawn: Optional[tuple] = None
+        self._invalidated = True
+
+        self.num_workers: int = (
+            getattr(config, "num_workers", None) or os.cpu_count() or 1
+        )
+        self.chunk_size: int = getattr(config, "chunk_size", 32)
+        self.raycast_engine: str = getattr(config, "raycast_engine", "backend")
+        self.ceiling_color = (30, 30, 40)
+        self.floor_color = (60, 60, 60)
+        # Textured walls (config.textured_walls) and floors and ceilings
+        # (config.textured_floors), flat colors otherwise; textured=True
+        # turns on both. Procedural textures stand in when texture_dir
+        # holds no images.
+        self.textures: Optional[TextureAtlas] = None
+        self.floors: Optional[FloorCaster] = None
+        textured = getattr(config, "textured", False)
+        textured_walls = getattr(config, "textured_walls", textured)
+        textured_floors = getattr(config, "textured_floors", textured)
+        if textured_walls or textured_floors:
+            atlas = load_textures(
+                getattr(config, "texture_dir", DEFAULT_TEXTURE_DIR),
+                WALL_COLORS,
+                getattr(config, "texture_size", 64),
+            )
+            if textured_walls:
+                self.textures = atlas
+            if textured_floors:
+                # Floor and ceiling textures, by wall id
+                self.floors = FloorCaster(
+                    atlas,
+                    getattr(config, "floor_texture", 7),
+                    getattr(config, "ceiling_texture", 3),
+                )
+        # Dynamic resolution: off unless config.target_frame_time is set
+        self.scaler: Optional[ResolutionScaler] = None
+        target_frame_time = getattr(config, "target_frame_time", None)
+        if target_frame_time is not None:
+            self.scaler = ResolutionScaler(
+                target_frame_time,
+                getattr(config, "min_scale", 0.5),
+                getattr(config, "max_scale", 1.0),
+            )
+        # Size the 3D view is rendered at this frame
+        width, height = config.resolution
+        self.render_size: Tuple[int, int] = (width, height)
+        # Frame is composed here by the workers, indexed [x, y] like
+        # pygame.surfarray, and presented with a single blit. With dynamic
+        # resolution it is sized for the largest scale and each frame
+        # uses its top-left render_size corner.
+        if self.scaler is not None:
+            self.render_size = self.scaler.size(config.resolution)
+            width = math.ceil(width * self.scaler.max_scale)
+            height = math.ceil(height * self.scaler.max_scale)
+        self.framebuffer = SharedFramebuffer(width, height)
+        # Per-column perpendicular wall distance from the wall pass
+        self.depth = SharedArray((width,), np.float64)
+        # Temporal reprojection: off unless config.reproject is set. Each
+        # frame's ray hits are kept in shared memory; the next frame
+        # reprojects them and traces only the columns that can't be
+        # reused, with a full trace every reproject_interval frames.
+        self.reproject: bool = getattr(config, "reproject", False)
+        self.reproject_interval: int = getattr(config, "reproject_interval", 8)
+        # Larger moves (cells) or turns (radians) since the last frame
+        # get a full trace: the further the camera moves, the more
+        # reused hits are stale
+        self.reproject_max_move: float = getattr(
+            config, "reproject_max_move", 0.1
+        )
+        self.reproject_max_turn: float = getattr(
+            config, "reproject_max_turn", 0.1
+        )
+        self.hits: Optional[SharedArray] = None
+        if self.reproject:
+            self.hits = SharedArray((HIT_FIELDS, width), np.float64)
+        # Pose, camera and grid the hits in self.hits were made for
+        self._hits_from: Optional[tuple] = None
+        self._since_full_trace = 0
+        # Columns raycast for the last frame
+        self.rays_traced = 0
+
+        grid, origin_x, origin_y = game_map.raycast_view(player.x, player.y)
+        self._state: Dict[str, Any] = {
+            "grid": grid,
+            "origin": (origin_x, origin_y),
+            "pixels": self.framebuffer.pixels,
+            "depth": self.depth.array,
+        }
+        if self.textures is not None:
+            self._state["textures"] = self.textures
+        if self.floors is not None:
+            self._state["floors"] = self.floors
+        if self.hits is not None:
+            self._state["hits"] = self.hits.array
+        # Intermediate surface for scaled frames, by render size
+        self._scaled_surface: Optional[pygame.Surface] = None
+        # Shared copy of the current map view once it has moved away from
+        # the grid the workers were started with (streamed maps only).
+        self._shared_view: Optional[SharedArray] = None
+        self._view: Optional[tuple] = None
+
+        # Long-lived worker pool, started once and reused for every frame.
+        # A single worker renders in-process: no pool, no IPC.
+        self._executor: Optional[ProcessPoolExecutor] = None
+        if self.num_workers > 1:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.num_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(
+                    share_grid(grid),
+                    (origin_x, origin_y),
+                    self.framebuffer.name,
+                    self.depth.name,
+                    width,
+                    height,
+                    self.textures,
+                    self.floors,
+                    None if self.hits is None else self.hits.name,
+                ),
+            )
+            # Processes start lazily; spin them all up now so the first
+            # frame doesn't pay for interpreter startup.
+            list(self._executor.map(_warm_up, range(self.num_workers)))
+
+    def render_pose(self) -> Tuple[float, float, float]:
+        """
+        The (x, y, angle) to draw from: the player's pose interpolated by
+        alpha when the player supports it, else its current pose.
+        """
+        player = self.player
+        if self.alpha != 1.0 and hasattr(player, "interpolate"):
+            return player.interpolate(self.alpha)
+        return (player.x, player.y, player.angle)
+
+    def camera_table(self) -> CameraTable:
+        """Per-column camera constants for the current render width and FOV."""
+        return camera(
+            self._state,
+            self.render_size[0],
+            getattr(self.config, "fov", 60.0),
+        )
+
+    def _update_view(self, pose):
+        """
+        Ask the map for the grid around the player. Streamed maps hand
+        out a new window when the player changes tile; the pool workers
+        get it through shared memory, named in FrameParams.view.
+        """
+        grid, origin_x, origin_y = self.game_map.raycast_view(pose[0], pose[1])
+        if grid is self._state["grid"]:
+            return
+        self._state["grid"] = grid
+        self._state["origin"] = (origin_x, origin_y)
+        self._state.pop("rows", None)
+        if self._executor is None:
+            return
+        previous = self._shared_view
+        self._shared_view = SharedArray(grid.shape, grid.dtype)
+        self._shared_view.array[...] = grid
+        self._view = (
+            self._shared_view.name,
+            grid.shape,
+            grid.dtype.str,
+            (origin_x, origin_y),
+        )
+        if previous is not None:
+            # Workers attached to it keep their own mapping until they
+            # switch to the new block.
+            previous.close()
+
+    def _reproject_hits(self, pose, width: int, fov: float) -> bool:
+        """
+        Fill the hit buffer for this frame from the last frame's hits
+        (see reproject.reproject_hits), tracing only the columns they
+        can't answer. False when a full trace is due instead: every
+        reproject_interval frames, after the view, resolution or FOV
+        changed, after the camera moved more than reproject_max_move or
+        turned more than reproject_max_turn, or when most columns would
+        need tracing anyway.
+        """
+        state = self._state
+        grid = state["grid"]
+        if self.hits is None or self._hits_from is None:
+            return False
+        previous, camera_key, hits_grid = self._hits_from
+        turned = (pose[2] - previous[2] + math.pi) % (2 * math.pi) - math.pi
+        if (
+            camera_key != (width, fov)
+            or hits_grid is not grid
+            or self._since_full_trace + 1 >= self.reproject_interval
+            or math.hypot(pose[0] - previous[0], pose[1] - previous[1])
+            > self.reproject_max_move
+            or abs(turned) > self.reproject_max_turn
+        ):
+            return False
+        table = camera(state, width, fov)
+        buffer = self.hits.array[:, :width]
+        current = grid_pose(state, pose)
+        hits, retrace = reproject_hits(
+            load_hits(buffer, 0, width),
+            grid_pose(state, previous),
+            current,
+            table,
+            grid,
+        )
+        columns = np.flatnonzero(retrace)
+        # Past half the screen the parallel full trace is cheaper
+        if 2 * len(columns) > width:
+            return False
+        if len(columns):
+            ray_dx, ray_dy = rotate_rays(table, current[2])
+            traced = trace_rays(
+                state,
+                current,
+                ray_dx[columns],
+                ray_dy[columns],
+                self.raycast_engine,
+            )
+            for field, values in zip(hits, traced):
+                field[columns] = values
+        store_hits(buffer, 0, hits)
+        self.rays_traced = len(columns)
+        return True
+
+    def register_plugin(self, plugin: RendererPlugin):
+        """Register a plugin to receive render hooks."""
+        self.plugins.append(plugin)
+        self.invalidate()
+
+    def invalidate(self):
+        """
+        Have the next frame drawn even if the pose and world are
+        unchanged; for plugins and hooks that change what is drawn.
+        """
+        self._invalidated = True
+
+    def _frame_key(self) -> tuple:
+        """Everything the default pass draws from, for needs_redraw."""
+        world = self.world
+        return (
+            self.render_pose(),
+            None if world is None else world.version,
+            self.render_size,
+            getattr(self.config, "fov", 60.0),
+            self.ceiling_color,
+            self.floor_color,
+        )
+
+    def needs_redraw(self) -> bool:
+        """
+        False if the next frame would repeat the last one drawn: same
+        render pose, world version (see World.version), render size and
+        colors, no invalidate() since and no plugin asking for it. The
+        engine then keeps the frame on screen and skips render_frame
+        and flip.
+        """
+        if self._invalidated or self._frame_key() != self._drawn:
+            return True
+        for plugin in self.plugins:
+            try:
+                if hasattr(plugin, "needs_redraw") and plugin.needs_redraw(
+                    self
+                ):
+                    return True
+            except Exception as e:
+                print(f"[Renderer] Plugin needs_redraw error: {e}")
+                return True
+        return False
 
     def render_frame(self):
         """
         Perform raycasting and draw a single frame using multi-core support.
         Allows plugins to override the entire rendering process.
         """
+        prof = (
+            self.profiler if self.profiler and self.profiler.enabled else None
+        )
+
         # Check if any plugin wants to override rendering
         for plugin in self.plugins:
+            if prof is not None:
+                started = clock()
             try:
                 if hasattr(plugin, "render_override") and callable(
                     plugin.render_override
                 ):
                     if plugin.render_override(self):
-                        # If plugin returns True, skip default rendering
+                        # If plugin returns True, skip default rendering;
+                        # what it drew is unknown, so never reuse it
+                        self._invalidated = True
                         return
             except Exception as e:
                 print(f"[Renderer] Plugin render_override error: {e}")
+            finally:
+                if prof is not None:
+                    prof.lap(
+                        prof.label("plugin_render_override", plugin), started
+                    )
 
         # Call pre-render hooks
         for plugin in self.plugins:
+            if prof is not None:
+                started = clock()
             try:
                 if hasattr(plugin, "pre_render"):
                     plugin.pre_render(self)
             except Exception as e:
                 print(f"[Renderer] Plugin pre_render error: {e}")
+            if prof is not None:
+                prof.lap(prof.label("plugin_pre_render", plugin), started)
 
-        width, height = self.config.resolution
-        columns = [(x, width) for x in range(width)]
+        started = frame_start = clock()
+        key = self._frame_key()
+        pose = key[0]
+        self._update_view(pose)
+        width, height = self.render_size
+        fov = getattr(self.config, "fov", 60.0)
+        reuse = self.hits is not None and self._reproject_hits(
+            pose, width, fov
+        )
+        if prof is not None and self.hits is not None:
+            started = prof.lap("render.reproject", started)
+        params = FrameParams(
+            width,
+            fov,
+            pose,
+            self.raycast_engine,
+            self.ceiling_color,
+            self.floor_color,
+            self._view,
+            height,
+            reuse,
+        )
+        if self._executor is None:
+            render_columns(self._state, 0, width, params)
+        else:
+            # Parallel rendering on the persistent pool, one task per
+            # chunk; workers write their strips into shared memory.
+            tasks = [
+                (start, stop, params)
+                for start, stop in column_chunks(width, self.chunk_size)
+            ]
+            for _ in self._executor.map(render_chunk, tasks):
+                pass
+        if prof is not None:
+            started = prof.lap("render.columns", started)
+        if not reuse:
+            self.rays_traced = width
+        if self.hits is not None:
+            self._hits_from = (pose, (width, fov), self._state["grid"])
+            self._since_full_trace = self._since_full_trace + 1 if reuse else 0
 
-        # Parallel raycasting using ProcessPoolExecutor
-        with ProcessPoolExecutor(max_workers=self.num_workers) as executor:
-            results = list(executor.map(raycast_column, columns))
+        frame = self.framebuffer.pixels[:width, :height]
+        if self.world is not None:
+            render_sprites(
+                frame, self.depth.array[:width], self.world, pose, params.fov
+            )
+            if prof is not None:
+                started = prof.lap("render.sprites", started)
 
-        # Draw the results
-        for x, color in results:
-            pygame.draw.line(self.screen, color, (x, 0), (x, height - 1))
+        self._present(frame)
+        if prof is not None:
+            prof.lap("render.blit", started)
+        if self.scaler is not None:
+            self.scaler.update(clock() - frame_start)
+            self.render_size = self.scaler.size(self.config.resolution)
+        # Post-render plugins may invalidate() to ask for another frame
+        self._drawn = key
+        self._invalidated = False
 
         # Call post-render hooks
         for plugin in self.plugins:
+            if prof is not None:
+                started = clock()
             try:
                 if hasattr(plugin, "post_render"):
                     plugin.post_render(self)
             except Exception as e:
                 print(f"[Renderer] Plugin post_render error: {e}")
+            if prof is not None:
+                prof.lap(prof.label("plugin_post_render", plugin), started)
+
+    def _present(self, frame: np.ndarray):
+        """
+        Put frame on the screen: a plain blit at full size, else one
+        blit into an intermediate surface and one scale onto the screen.
+        """
+        size = frame.shape[:2]
+        if size == self.screen.get_size():
+            pygame.surfarray.blit_array(self.screen, frame)
+            return
+        surface = self._scaled_surface
+        if surface is None or surface.get_size() != size:
+            surface = self._scaled_surface = pygame.Surface(size)
+        pygame.surfarray.blit_array(surface, frame)
+        pygame.transform.scale(
+            surface, self.screen.get_size(), dest_surface=self.screen
+        )
 
+    def flip(self):
+        pygame.display.flip()
+
+    def tick(self, framerate: int):
+        self.clock.tick(framerate)
+
+    def cleanup(self):
+        """
+        Shut down the render worker pool, free the shared framebuffer,
+        z-buffer and hit buffer and release the display.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._state.clear()
+        if self._shared_view is not None:
+            self._shared_view.close()
+            self._shared_view = None
+        self.framebuffer.close()
+        self.depth.close()
+        if self.hits is not None:
+            self.hits.close()
+        pygame.quit()
@@ -0,0 +1,212 @@
+"""
+Temporal reprojection: rebuilds a frame's ray hits from the previous
+frame's for a camera that moved a little, so only a few columns need
+tracing.
+
+Every hit of the previous frame is a point on a wall face. Those points
+are projected into the new camera. Two neighbouring columns that hit
+the same face bound a stretch of it, and the new columns landing
+between them see that face too. Their hits are then exact: the new ray
+is intersected with the face's grid line. Columns the stretches don't
+cover exactly once are ambiguous: newly revealed areas, depth edges,
+where projections overlap, or faces with a gap. Those are returned
+for re-tracing.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+from .raycast import CameraTable, RayHits, rotate_rays
+
+# Hit points closer to the new camera plane than this are not reused.
+NEAR_PLANE = 1e-6
+
+
+def _faces(hits: RayHits, ray_dx: np.ndarray, ray_dy: np.ndarray):
+    """
+    Grid line coordinate and facing of each hit's wall face: x = line
+    for x-side hits, y = line for y-side hits, entered from below when
+    facing is True.
+    """
+    y_side = hits.side == 1
+    facing = np.where(y_side, ray_dy > 0, ray_dx > 0)
+    line = np.where(y_side, hits.map_y, hits.map_x) + ~facing
+    return y_side, line, facing
+
+
+def _spread(items: np.ndarray, first: np.ndarray, stop: np.ndarray):
+    """
+    (item, column) for every column of every range [first, stop), as
+    two flat arrays.
+    """
+    spans = np.maximum(stop - first, 0)
+    item = np.repeat(items, spans)
+    span_start = np.repeat(np.cumsum(spans) - spans, spans)
+    column = np.repeat(first, spans) + np.arange(len(item)) - span_start
+    return item, column
+
+
+def _crosses(
+    apex_x: float,
+    apex_y: float,
+    edge_x: float,
+    edge_y: float,
+    seg_x: np.ndarray,
+    seg_y: np.ndarray,
+    skip: float,
+) -> np.ndarray:
+    """
+    Whether each segment from the origin to (seg_x, seg_y) crosses the
+    ray from (apex_x, apex_y) along (edge_x, edge_y) further than skip
+    from the apex.
+    """
+    with np.errstate(invalid="ignore", divide="ignore"):
+        denom = seg_x * edge_y - seg_y * edge_x
+        s = (apex_x * edge_y - apex_y * edge_x) / denom
+        u = (apex_x * seg_y - apex_y * seg_x) / denom
+    reach = u * np.hypot(edge_x, edge_y)
+    return (s >= 0.0) & (s <= 1.0) & (reach > skip)
+
+
+def reproject_hits(
+    hits: RayHits,
+    previous_pose: Tuple[float, float, float],
+    pose: Tuple[float, float, float],
+    table: CameraTable,
+    grid: np.ndarray,
+) -> Tuple[RayHits, np.ndarray]:
+    """
+    Hits for every column at pose, from the hits traced at
+    previous_pose with the same CameraTable. Poses are in grid
+    coordinates. Returns (hits, retrace). Where the boolean mask retrace
+    is set, the returned hits are invalid and the columns must be
+    traced again.
+    """
+    width = len(hits.distance)
+    # offset runs from -tan(fov / 2) at column 0
+    half = -float(table.offset[0])
+    old_x, old_y, old_angle = previous_pose
+    pos_x, pos_y, angle = pose
+    old_dx, old_dy = rotate_rays(table, old_angle)
+    # Rays that hit nothing (infinite distance) have no point to reuse
+    valid = np.isfinite(hits.distance) & (hits.wall != 0)
+    old_distance = np.where(valid, hits.distance, 0.0)
+    hit_x = old_x + old_distance * old_dx
+    hit_y = old_y + old_distance * old_dy
+    y_side, line, facing = _faces(hits, old_dx, old_dy)
+
+    # Old hit points in the new camera: depth along the view and the
+    # continuous screen column they land on (column x looks at x.0)
+    dir_x, dir_y = np.cos(angle), np.sin(angle)
+    rel_x, rel_y = hit_x - pos_x, hit_y - pos_y
+    depth = dir_x * rel_x + dir_y * rel_y
+    valid &= depth > NEAR_PLANE
+    with np.errstate(invalid="ignore", divide="ignore"):
+        lateral = (dir_x * rel_y - dir_y * rel_x) / depth
+    screen = (lateral / half + 1.0) * (width / 2.0)
+    screen[~valid] = np.nan
+
+    # Stretches between neighbours on one face, in left-to-right order
+    left = np.arange(width - 1)
+    right = left + 1
+    pair = valid[left] & valid[right]
+    pair &= (y_side[left] == y_side[right]) & (line[left] == line[right])
+    pair &= facing[left] == facing[right]
+    pair &= screen[right] > screen[left]
+    pairs = np.flatnonzero(pair)
+    first = np.clip(np.ceil(screen[pairs]), 0, width).astype(np.int64)
+    stop = np.clip(np.ceil(screen[pairs + 1]), 0, width).astype(np.int64)
+
+    # Columns covered by exactly one stretch take its face
+    owner, columns = _spread(pairs, first, stop)
+    coverage = np.bincount(columns, minlength=width)
+    face = np.full(width, -1, dtype=np.int64)
+    face[columns] = owner
+    retrace = coverage != 1
+    # Around depth edges (neighbours on different faces) and hits on no
+    # stretch at all, a nearer wall may show a face the old frame missed
+    edge = np.flatnonzero(valid[left] & valid[right] & ~pair)
+    paired = np.zeros(width, dtype=bool)
+    paired[pairs] = True
+    paired[pairs + 1] = True
+    lone = np.flatnonzero(valid & ~paired)
+    low = np.concatenate(
+        [np.fmin(screen[edge], screen[edge + 1]), screen[lone]]
+    )
+    high = np.concatenate(
+        [np.fmax(screen[edge], screen[edge + 1]), screen[lone]]
+    )
+    low = np.clip(np.floor(low) - 1, 0, width).astype(np.int64)
+    high = np.clip(np.ceil(high) + 2, 0, width).astype(np.int64)
+    retrace[_spread(low, low, high)[1]] = True
+
+    # Intersect the new rays with their face's grid line
+    face[retrace] = 0
+    ray_dx, ray_dy = rotate_rays(table, angle)
+    face_y = y_side[face]
+    toward = np.where(face_y, ray_dy, ray_dx)
+    start = np.where(face_y, pos_y, pos_x)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        distance = (line[face] - start) / toward
+        # Hit points on the face; inf * 0 for rays parallel to it
+        hit_dx, hit_dy = distance * ray_dx, distance * ray_dy
+    retrace |= (toward > 0) != facing[face]
+    retrace |= ~(distance > 0)
+    along = np.where(face_y, pos_x + hit_dx, pos_y + hit_dy)
+    retrace |= ~np.isfinite(along)
+    along[retrace] = 0.0
+
+    # The cell behind the line must be a wall (or the map edge) and the
+    # one in front of it empty, else the face has a gap or is inside a
+    # block
+    rows, cols = grid.shape
+    line_cell = line[face] - ~facing[face]
+    front_cell = line[face] - facing[face]
+    other = np.floor(along).astype(np.int64)
+    map_x = np.where(face_y, other, line_cell)
+    map_y = np.where(face_y, line_cell, other)
+    front_x = np.where(face_y, other, front_cell)
+    front_y = np.where(face_y, front_cell, other)
+    other_size = np.where(face_y, cols, rows)
+    retrace |= (other < 0) | (other >= other_size)
+    inside = (map_x >= 0) & (map_x < cols) & (map_y >= 0) & (map_y < rows)
+    wall = np.full(width, -1, dtype=np.int32)
+    wall[inside] = grid[
+        np.where(inside, map_y, 0), np.where(inside, map_x, 0)
+    ][inside]
+    retrace |= wall == 0
+    front = (front_x >= 0) & (front_x < cols) & (front_y >= 0)
+    front &= front_y < rows
+    retrace |= ~front
+    retrace[front] |= grid[front_y[front], front_x[front]] != 0
+
+    # Walls outside the old view may have moved in front of the reused
+    # hits: retrace rays that cross its left or right edge ray on the
+    # way to their hit (near its apex, the old camera, such crossings
+    # only come from the camera moving)
+    moved = np.hypot(pos_x - old_x, pos_y - old_y)
+    for edge_x, edge_y in zip(old_dx[[0, -1]], old_dy[[0, -1]]):
+        retrace |= _crosses(
+            old_x - pos_x,
+            old_y - pos_y,
+            float(edge_x),
+            float(edge_y),
+            hit_dx,
+            hit_dy,
+            4.0 * moved,
+        )
+
+    tex_u = along - np.floor(along)
+    tex_u = np.where(face_y != facing[face], 1.0 - tex_u, tex_u)
+    return (
+        RayHits(
+            distance,
+            wall,
+            face_y.astype(np.int8),
+            tex_u,
+            map_x.astype(np.int32),
+            map_y.astype(np.int32),
+        ),
+        retrace,
+    )
@@ -0,0 +1,65 @@
+"""
+ResolutionScaler: picks the render scale that holds a target frame time.
+
+Render cost is roughly proportional to the pixel count, i.e. to scale
+squared, so the scaler aims for scale * sqrt(target / measured), using
+a smoothed frame time. Scales are quantized to `step` and changed at
+most once every `cooldown` frames, so the resolution doesn't flicker
+between neighbouring sizes.
+"""
+
+import math
+from typing import Optional, Tuple
+
+
+class ResolutionScaler:
+    def __init__(
+        self,
+        target_frame_time: float,
+        min_scale: float = 0.5,
+        max_scale: float = 1.0,
+        step: float = 1 / 32,
+        cooldown: int = 15,
+        smoothing: float = 0.2,
+    ):
+        self.target_frame_time = target_frame_time
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.step = step
+        self.cooldown = cooldown
+        self.smoothing = smoothing
+        # Start at full quality and back off if the frames say so
+        self.scale = self._quantize(min(1.0, max_scale))
+        # Smoothed render time (seconds); None until the first sample
+        self.frame_time: Optional[float] = None
+        self._since_change = 0
+
+    def _quantize(self, scale: float) -> float:
+        scale = round(scale / self.step) * self.step
+        return min(max(scale, self.min_scale), self.max_scale)
+
+    def update(self, frame_time: float) -> float:
+        """Record one frame's render time and return the scale to use."""
+        if self.frame_time is None:
+            self.frame_time = frame_time
+        else:
+            self.frame_time += self.smoothing * (frame_time - self.frame_time)
+        self._since_change += 1
+        if self._since_change < self.cooldown or self.frame_time <= 0:
+            return self.scale
+        ratio = self.target_frame_time / self.frame_time
+        scale = self._quantize(self.scale * math.sqrt(ratio))
+        if scale != self.scale:
+            self.scale = scale
+            self._since_change = 0
+            # Frames at the old scale say little about the new one
+            self.frame_time = None
+        return self.scale
+
+    def size(self, resolution: Tuple[int, int]) -> Tuple[int, int]:
+        """The (width, height) to render for resolution at this scale."""
+        width, height = resolution
+        return (
+            max(1, round(width * self.scale)),
+            max(1, round(height * self.scale)),
+        )
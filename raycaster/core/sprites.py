@@ -0,0 +1,176 @@
+"""
+Sprite pass: draws ECS entities with a Position and a Renderable as
+camera-facing billboards over the wall pass.
+
+The whole pass is batched. Sprites are projected, culled and sorted in
+a few array operations, then expanded into one list of covered pixels
+that is depth-tested against the wall z-buffer and resolved nearest
+first. Its cost grows with the screen area the sprites cover, not with
+how many of them there are.
+"""
+
+import math
+from typing import NamedTuple, Tuple
+
+import numpy as np
+
+from ..ecs.components import Position, Renderable
+
+# Sprites closer to the camera plane than this are culled.
+NEAR_PLANE = 0.05
+
+
+class SpriteBatch(NamedTuple):
+    """World-space sprites gathered from the ECS, one element each."""
+
+    x: np.ndarray  # float64 world position
+    y: np.ndarray
+    size: np.ndarray  # float64 height in wall units (1.0 = one wall)
+    color: np.ndarray  # uint8 (n, 3)
+
+
+class ProjectedSprites(NamedTuple):
+    """Visible sprites in screen space, sorted nearest first."""
+
+    sprite: np.ndarray  # int64 row in the SpriteBatch
+    depth: np.ndarray  # float64 perpendicular distance
+    x0: np.ndarray  # int64 screen columns [x0, x1), clipped
+    x1: np.ndarray
+    y0: np.ndarray  # int64 screen rows [y0, y1), clipped
+    y1: np.ndarray
+
+
+def collect_sprites(world) -> SpriteBatch:
+    """Gather every Position + Renderable entity of world."""
+    chunks = list(world.query(Position, Renderable).chunks())
+    if not chunks:
+        empty = np.empty(0, dtype=np.float64)
+        return SpriteBatch(
+            empty, empty, empty, np.empty((0, 3), dtype=np.uint8)
+        )
+
+    def gather(component, field):
+        return np.concatenate(
+            [arch.column(component, field) for arch in chunks]
+        )
+
+    color = np.stack(
+        [
+            gather(Renderable, "r"),
+            gather(Renderable, "g"),
+            gather(Renderable, "b"),
+        ],
+        axis=1,
+    )
+    return SpriteBatch(
+        gather(Position, "x"),
+        gather(Position, "y"),
+        gather(Renderable, "size"),
+        color,
+    )
+
+
+def project_sprites(
+    sprites: SpriteBatch,
+    pose: Tuple[float, float, float],
+    width: int,
+    height: int,
+    fov: float,
+) -> ProjectedSprites:
+    """
+    Transform sprites into camera space, cull those behind the camera or
+    off screen, and return screen rectangles sorted by depth.
+
+    Scales match the wall pass: a sprite of size 1 at distance d is as
+    tall as a wall slice at d and stands on the same floor line.
+    """
+    pos_x, pos_y, angle = pose
+    dir_x, dir_y = math.cos(angle), math.sin(angle)
+    half = math.tan(math.radians(fov) / 2.0)
+    rel_x = sprites.x - pos_x
+    rel_y = sprites.y - pos_y
+    depth = dir_x * rel_x + dir_y * rel_y
+    lateral = dir_x * rel_y - dir_y * rel_x
+
+    index = np.flatnonzero(depth > NEAR_PLANE)
+    depth = depth[index]
+    size = sprites.size[index]
+    center = (width / 2.0) * (1.0 + lateral[index] / (half * depth))
+    half_width = size * width / (4.0 * half * depth)
+    x0 = np.floor(center - half_width).astype(np.int64)
+    x1 = np.floor(center + half_width).astype(np.int64)
+    bottom = np.floor((height + height / depth) / 2.0).astype(np.int64)
+    top = np.floor(bottom - size * height / depth).astype(np.int64)
+
+    # Frustum cull: keep sprites with at least one column and row on
+    # screen
+    visible = (x1 > 0) & (x0 < width) & (bottom > 0) & (top < height)
+    visible &= x1 > x0
+    order = np.argsort(depth[visible], kind="stable")
+    pick = np.flatnonzero(visible)[order]
+    return ProjectedSprites(
+        index[pick],
+        depth[pick],
+        np.clip(x0[pick], 0, width),
+        np.clip(x1[pick], 0, width),
+        np.clip(top[pick], 0, height),
+        np.clip(bottom[pick], 0, height),
+    )
+
+
+def draw_sprites(
+    pixels: np.ndarray,
+    zbuffer: np.ndarray,
+    projected: ProjectedSprites,
+    colors: np.ndarray,
+) -> int:
+    """
+    Draw projected sprites into pixels ((width, height, 3), indexed
+    [x, y]). A sprite column is drawn only where the sprite is nearer
+    than the wall in zbuffer (per-column perpendicular distance), and
+    where sprites overlap the nearest wins. colors holds one (r, g, b)
+    row per SpriteBatch entry. Returns the number of pixels written.
+    """
+    height = pixels.shape[1]
+    spans = projected.x1 - projected.x0
+    if not spans.sum():
+        return 0
+    # One strip per (sprite, screen column)
+    rank = np.repeat(np.arange(len(spans)), spans)
+    strip_start = np.repeat(np.cumsum(spans) - spans, spans)
+    column = projected.x0[rank] + np.arange(len(rank)) - strip_start
+    in_front = projected.depth[rank] < zbuffer[column]
+    rank, column = rank[in_front], column[in_front]
+
+    # One entry per covered pixel, still ordered nearest sprite first
+    lengths = (projected.y1 - projected.y0)[rank]
+    total = int(lengths.sum())
+    if not total:
+        return 0
+    pixel_strip = np.repeat(np.arange(len(rank)), lengths)
+    run_start = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    rows = projected.y0[rank][pixel_strip] + np.arange(total) - run_start
+    keys = column[pixel_strip] * height + rows
+    # First occurrence of each pixel belongs to the nearest sprite
+    keys, first = np.unique(keys, return_index=True)
+    owner = projected.sprite[rank[pixel_strip[first]]]
+    # Index both axes: pixels may be a strided view (e.g. the scaled
+    # render area of the framebuffer), which reshape would copy
+    pixels[keys // height, keys % height] = colors[owner]
+    return len(keys)
+
+
+def render_sprites(
+    pixels: np.ndarray,
+    zbuffer: np.ndarray,
+    world,
+    pose: Tuple[float, float, float],
+    fov: float,
+) -> int:
+    """Collect, project and draw every sprite of world."""
+    sprites = collect_sprites(world)
+    if not len(sprites.x):
+        return 0
+    width, height = pixels.shape[:2]
+    projected = project_sprites(sprites, pose, width, height, fov)
+    return draw_sprites(pixels, zbuffer, projected, sprites.color)
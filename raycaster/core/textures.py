@@ -0,0 +1,137 @@
+"""
+Wall textures: every texture and all of its mip levels packed into one
+NumPy atlas, built once at load time.
+
+Textures are square, resized to a power-of-two edge on load, and stored
+column-major ([u, v], like pygame.surfarray) so the texels of one wall
+column are contiguous. Each mip level halves the edge with a 2x2 box
+filter, down to 1x1. See backend.fill_textured_columns for how walls
+are sampled.
+"""
+
+import os
+from typing import List, Sequence
+
+import numpy as np
+
+# Wall textures shipped with (or dropped into) the package.
+DEFAULT_TEXTURE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "assets", "textures"
+)
+IMAGE_EXTENSIONS = (".png", ".bmp", ".jpg", ".jpeg", ".tga", ".gif")
+
+
+def build_mips(texture: np.ndarray) -> List[np.ndarray]:
+    """texture and its box-filtered mip chain, largest first."""
+    levels = [texture]
+    while levels[-1].shape[0] > 1:
+        level = levels[-1].astype(np.uint16)
+        level = (
+            level[0::2, 0::2]
+            + level[1::2, 0::2]
+            + level[0::2, 1::2]
+            + level[1::2, 1::2]
+            + 2
+        ) // 4
+        levels.append(level.astype(np.uint8))
+    return levels
+
+
+class TextureAtlas:
+    """
+    textures: equally sized (size, size, 3) uint8 arrays indexed [u, v],
+    size a power of two. Wall id w is drawn with texture
+    (w - 1) % count.
+
+    texels holds every level of every texture as one (n, 3) array; level
+    l starts at level_offsets[l] and has edge level_sizes[l], with
+    texture t's texel (u, v) at offset + (t * size + u) * size + v.
+    """
+
+    def __init__(self, textures: Sequence[np.ndarray]):
+        if not textures:
+            raise ValueError("TextureAtlas needs at least one texture")
+        size = textures[0].shape[0]
+        if size & (size - 1) or any(
+            t.shape != (size, size, 3) for t in textures
+        ):
+            raise ValueError(
+                "textures must all be (size, size, 3) with size a power of 2"
+            )
+        self.size = size
+        self.count = len(textures)
+        chains = [build_mips(np.asarray(t, dtype=np.uint8)) for t in textures]
+        self.levels = len(chains[0])
+        self.level_sizes = np.array(
+            [size >> level for level in range(self.levels)], dtype=np.int64
+        )
+        per_level = self.count * self.level_sizes**2
+        self.level_offsets = np.concatenate([[0], np.cumsum(per_level)[:-1]])
+        self.texels = np.empty((int(per_level.sum()), 3), dtype=np.uint8)
+        for level in range(self.levels):
+            self.level(level)[...] = [chain[level] for chain in chains]
+
+    def level(self, level: int) -> np.ndarray:
+        """Mip level as a (count, size, size, 3) view into texels."""
+        size = int(self.level_sizes[level])
+        start = int(self.level_offsets[level])
+        stop = start + self.count * size * size
+        return self.texels[start:stop].reshape(self.count, size, size, 3)
+
+    @classmethod
+    def from_directory(cls, directory: str, size: int = 64) -> "TextureAtlas":
+        """
+        Load every image in directory, sorted by file name (so the first
+        is wall id 1), each scaled to size x size.
+        """
+        import pygame
+
+        names = sorted(
+            name
+            for name in os.listdir(directory)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        if not names:
+            raise FileNotFoundError(f"No texture images in {directory}")
+        textures = []
+        for name in names:
+            image = pygame.image.load(os.path.join(directory, name))
+            if image.get_size() != (size, size):
+                image = pygame.transform.smoothscale(image, (size, size))
+            textures.append(pygame.surfarray.array3d(image))
+        return cls(textures)
+
+    @classmethod
+    def procedural(cls, palette: np.ndarray, size: int = 64) -> "TextureAtlas":
+        """
+        Brick textures tinted by palette entries 1.. (entry 0 is "no
+        wall"), used when no texture images are available.
+        """
+        u = np.arange(size)[:, None]
+        v = np.arange(size)[None, :]
+        course = max(size // 4, 2)
+        brick = max(size // 2, 2)
+        # Alternate courses are offset by half a brick
+        shift = (v // course) % 2 * (brick // 2)
+        mortar = (v % course == 0) | ((u + shift) % brick == 0)
+        rng = np.random.default_rng(0)
+        grain = rng.uniform(0.8, 1.0, (size, size))
+        shade = np.where(mortar, 0.45, grain)[:, :, None]
+        textures = [
+            (shade * color[None, None, :]).astype(np.uint8)
+            for color in np.asarray(palette[1:], dtype=np.float64)
+        ]
+        return cls(textures)
+
+
+def load_textures(
+    directory: str, palette: np.ndarray, size: int = 64
+) -> TextureAtlas:
+    """
+    Wall textures from directory, or procedural ones from palette when it
+    holds no images (or doesn't exist).
+    """
+    try:
+        return TextureAtlas.from_directory(directory, size)
+    except FileNotFoundError:
+        return TextureAtlas.procedural(palette, size)
@@ -1,17 +1,52 @@
+"""
+Built-in components. Numeric fields are declared in `fields` so the World
+stores them column-wise (see ecs.Archetype).
+"""
+
+import numpy as np
+
 from .ecs import Component
 
+
 class Position(Component):
-    def __init__(self, x: int, y: int):
+    fields = {"x": np.float64, "y": np.float64}
+
+    def __init__(self, x: float, y: float):
         self.x = x
         self.y = y
 
+
 class Health(Component):
+    fields = {"hp": np.int32}
+
     def __init__(self, hp: int):
         self.hp = hp
 
+
 class Velocity(Component):
-    def __init__(self, dx: int, dy: int):
+    fields = {"dx": np.float64, "dy": np.float64}
+
+    def __init__(self, dx: float, dy: float):
         self.dx = dx
         self.dy = dy
 
-# Add more components as needed (Renderable, Inventory, etc.)
\ No newline at end of file
+
+class Renderable(Component):
+    """
+    Drawn as a camera-facing billboard by the sprite pass; size is its
+    height in wall units.
+    """
+
+    fields = {
+        "r": np.uint8,
+        "g": np.uint8,
+        "b": np.uint8,
+        "size": np.float64,
+    }
+
+    def __init__(self, color=(255, 255, 255), size: float = 0.5):
+        self.r, self.g, self.b = color
+        self.size = size
+
+
+# Add more components as needed (Inventory, etc.)
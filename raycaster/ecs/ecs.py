@@ -1,42 +1,766 @@
-from typing import Type, Dict, Any, List
+"""
+Entity-component-system core with archetype (struct-of-arrays) storage.
+
+Entities with the same set of component types share an Archetype: one
+contiguous NumPy column per component field, one row per entity.
+Systems run vectorized over those columns instead of visiting entities
+one by one, e.g. for MovementSystem:
+
+    for arch in world.query(Position, Velocity).chunks():
+        arch.column(Position, "x")[:] += arch.column(Velocity, "dx")
+
+Component classes declare their numeric fields in `fields`; components
+without fields (tags, or ones holding arbitrary Python objects) are kept
+as instances in an object column.
+
+Entity ids are generational handles (slot index in the low 32 bits,
+slot generation above): despawned slots are recycled through a free
+list and bump their generation, so stale ids are detected rather than
+aliasing a new entity.
+"""
+
+import inspect
+import warnings
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+
+import numpy as np
+
+from .scheduler import Scheduler
+
+INDEX_BITS = 32
+INDEX_MASK = (1 << INDEX_BITS) - 1
+
+
+def make_id(index: int, generation: int) -> int:
+    return (generation << INDEX_BITS) | index
+
+
+class _Field:
+    """
+    Descriptor for a declared component field. Detached components keep
+    the value on the instance; components of an entity in a World read
+    and write the entity's row in its archetype column.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        entity = obj._entity
+        if entity is None:
+            return obj.__dict__[self.name]
+        arch, row = entity.world.locate(entity.id)
+        return arch.columns[type(obj)][self.name][row]
+
+    def __set__(self, obj, value):
+        entity = obj._entity
+        if entity is None:
+            obj.__dict__[self.name] = value
+        else:
+            world = entity.world
+            arch, row = world.locate(entity.id)
+            arch.columns[type(obj)][self.name][row] = value
+            world.version += 1
+
 
 class Component:
-    """Base class for all components."""
-    pass
+    """
+    Base class for all components.
+
+    Subclasses may declare `fields = {"name": dtype, ...}`; those fields
+    are stored column-wise by the World.
+    """
+
+    fields: Dict[str, Any] = {}
+    _entity: Optional["Entity"] = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.fields = {
+            name: np.dtype(dtype) for name, dtype in cls.fields.items()
+        }
+        for name in cls.fields:
+            setattr(cls, name, _Field(name))
+
+    @classmethod
+    def _bound(cls, entity: "Entity") -> "Component":
+        """A view of entity's stored fields for this component type."""
+        view = cls.__new__(cls)
+        view._entity = entity
+        return view
+
 
 class Entity:
-    _next_id = 1
+    """
+    Handle to an entity. A new Entity() is detached: components added to
+    it are held on the handle until World.add_entity stores them and
+    assigns the id. Handles compare equal when they name the same id in
+    the same world; detached handles are only equal to themselves.
+    """
 
-    def __init__(self):
-        self.id = Entity._next_id
-        Entity._next_id += 1
+    __slots__ = ("id", "world", "components")
+
+    def __init__(self, world: Optional["World"] = None, id: int = -1):
+        self.id = id
+        self.world = world
+        # Components of an entity not (yet) in a World
         self.components: Dict[Type[Component], Component] = {}
 
+    def __eq__(self, other):
+        if self.world is None:
+            return self is other
+        return (
+            isinstance(other, Entity)
+            and self.id == other.id
+            and self.world is other.world
+        )
+
+    def __hash__(self):
+        if self.world is None:
+            return id(self)
+        return hash((id(self.world), self.id))
+
+    def __repr__(self):
+        index, generation = self.id & INDEX_MASK, self.id >> INDEX_BITS
+        return f"Entity({index}v{generation})"
+
+    @property
+    def alive(self) -> bool:
+        return self.world is not None and self.world.is_alive(self.id)
+
     def add(self, component: Component):
-        self.components[type(component)] = component
+        if self.world is not None:
+            self.world.add_component(self, component)
+        else:
+            self.components[type(component)] = component
 
     def get(self, component_type: Type[Component]) -> Any:
-        return self.components.get(component_type)
+        if self.world is None:
+            return self.components.get(component_type)
+        arch, row = self.world.locate(self.id)
+        if component_type not in arch.types:
+            return None
+        if component_type.fields:
+            return component_type._bound(self)
+        return arch.objects[component_type][row]
 
     def has(self, component_type: Type[Component]) -> bool:
-        return component_type in self.components
+        if self.world is None:
+            return component_type in self.components
+        return component_type in self.world.locate(self.id)[0].types
+
+    def remove(self, component_type: Type[Component]):
+        if self.world is not None:
+            self.world.remove_component(self, component_type)
+        else:
+            self.components.pop(component_type, None)
+
+
+EntityRef = Union[Entity, int]
+
+
+class Archetype:
+    """
+    Storage for every entity with exactly the component types in
+    `types`: entity ids in `ids`, field components in NumPy columns
+    (`columns[T][field]`), fieldless ones in object columns
+    (`objects[T]`). Rows [0, count) are live; removal swaps the last row
+    into the hole.
+    """
+
+    def __init__(self, index: int, types: FrozenSet[Type[Component]]):
+        self.index = index
+        self.types = types
+        self.count = 0
+        self.capacity = 0
+        self.ids = np.empty(0, dtype=np.int64)
+        self.columns: Dict[Type[Component], Dict[str, np.ndarray]] = {
+            t: {name: np.empty(0, dtype) for name, dtype in t.fields.items()}
+            for t in types
+            if t.fields
+        }
+        self.objects: Dict[Type[Component], np.ndarray] = {
+            t: np.empty(0, dtype=object) for t in types if not t.fields
+        }
+        # Archetype reached by adding/removing one type, filled lazily
+        self.add_edges: Dict[Type[Component], "Archetype"] = {}
+        self.remove_edges: Dict[Type[Component], "Archetype"] = {}
+
+    def __len__(self) -> int:
+        return self.count
+
+    def column(self, component_type: Type[Component], field: str):
+        """Live rows of one field column (a view: writes go to storage)."""
+        return self.columns[component_type][field][: self.count]
+
+    def live_ids(self) -> np.ndarray:
+        return self.ids[: self.count]
+
+    def _arrays(self) -> Iterator[np.ndarray]:
+        yield self.ids
+        for fields in self.columns.values():
+            yield from fields.values()
+        yield from self.objects.values()
+
+    def _reserve(self, needed: int):
+        if needed <= self.capacity:
+            return
+        capacity = max(needed, 2 * self.capacity, 16)
+        count = self.count
+
+        def grow(old):
+            new = np.empty(capacity, old.dtype)
+            new[:count] = old[:count]
+            return new
+
+        self.ids = grow(self.ids)
+        for fields in self.columns.values():
+            for name in fields:
+                fields[name] = grow(fields[name])
+        for t in self.objects:
+            self.objects[t] = grow(self.objects[t])
+        self.capacity = capacity
+
+    def append(self, ids: np.ndarray) -> int:
+        """
+        Add rows for ids (column values left unset); returns the first
+        new row.
+        """
+        start = self.count
+        end = start + len(ids)
+        self._reserve(end)
+        self.ids[start:end] = ids
+        self.count = end
+        return start
+
+    def set_component(self, rows, component: Component):
+        """
+        Store a component's values in rows (a row or a slice). Field
+        values may be scalars or arrays with one value per row.
+        """
+        t = type(component)
+        if t.fields:
+            fields = self.columns[t]
+            for name in t.fields:
+                fields[name][rows] = getattr(component, name)
+        else:
+            self.objects[t][rows] = component
+
+    def copy_row(self, row: int, dest: "Archetype", dest_row: int):
+        """Copy the components dest shares with self from row to dest_row."""
+        for t, fields in self.columns.items():
+            dest_fields = dest.columns.get(t)
+            if dest_fields is not None:
+                for name, column in fields.items():
+                    dest_fields[name][dest_row] = column[row]
+        for t, column in self.objects.items():
+            dest_column = dest.objects.get(t)
+            if dest_column is not None:
+                dest_column[dest_row] = column[row]
+
+    def swap_remove(self, row: int) -> int:
+        """
+        Drop row, moving the last row into its place. Returns the id of
+        the moved entity, or -1 if row was the last one.
+        """
+        last = self.count - 1
+        moved = -1
+        if row != last:
+            for array in self._arrays():
+                array[row] = array[last]
+            moved = int(self.ids[row])
+        for column in self.objects.values():
+            column[last] = None
+        self.count = last
+        return moved
+
+    def remove_rows(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Drop many rows at once, compacting the survivors in order.
+        Returns the ids now at rows [0, count) for relocation.
+        """
+        count = self.count
+        keep = np.ones(count, dtype=bool)
+        keep[rows] = False
+        kept = int(keep.sum())
+        for array in self._arrays():
+            array[:kept] = array[:count][keep]
+        for column in self.objects.values():
+            column[kept:count] = None
+        self.count = kept
+        return self.ids[:kept]
+
+
+class Query:
+    """
+    The archetypes holding all of `include` and none of `exclude`.
+
+    Queries are cached by World.query and kept current as archetypes are
+    created, so iterating one costs O(matching entities) no matter how
+    many other entities the world holds. Entities gaining or losing
+    components move between archetypes and so in and out of the query
+    by themselves.
+    """
+
+    def __init__(
+        self,
+        world: "World",
+        include: FrozenSet[Type[Component]],
+        exclude: FrozenSet[Type[Component]],
+    ):
+        self.world = world
+        self.include = include
+        self.exclude = exclude
+        self.archetypes: List[Archetype] = []
+
+    def matches(self, types: FrozenSet[Type[Component]]) -> bool:
+        return self.include <= types and not (self.exclude & types)
+
+    def chunks(self) -> Iterator[Archetype]:
+        """Matching archetypes that currently hold entities."""
+        for arch in self.archetypes:
+            if arch.count:
+                yield arch
+
+    def ids(self) -> np.ndarray:
+        """Ids of every matching entity."""
+        parts = [arch.live_ids() for arch in self.chunks()]
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(parts)
+
+    def __iter__(self) -> Iterator[Entity]:
+        world = self.world
+        # ids() copies, so callers may change the world while iterating
+        for entity_id in self.ids().tolist():
+            yield Entity(world, entity_id)
+
+    def __len__(self) -> int:
+        return sum(arch.count for arch in self.archetypes)
+
+    def entities(self) -> List[Entity]:
+        return list(self)
+
 
 class System:
-    """Base class for all systems."""
-    def update(self, entities: List[Entity]):
+    """
+    Base class for all systems. update receives the World and should
+    work on whole archetypes (see World.query).
+
+    `reads` and `writes` declare the component types the system uses, so
+    the Scheduler can run non-conflicting systems concurrently. Shared
+    resources a system rebuilds, such as a SpatialHash, are declared the
+    same way, by their type. Leaving reads as None means "may touch
+    anything": the system then runs alone, in registration order.
+
+    A system that changes archetype columns directly must call
+    world.touch() when it does, so unchanged frames can be skipped
+    (see World.version). Field writes through components and
+    structural changes are tracked on their own.
+
+    Systems written for the old update(entities) signature still work:
+    World.add_system spots the parameter name, warns, and wraps them in
+    an EntityListSystem. The entity list is built per update, so port
+    them to update(world) and World.query.
+    """
+
+    reads: Optional[Tuple[type, ...]] = None
+    writes: Tuple[type, ...] = ()
+
+    @property
+    def name(self) -> str:
+        """Name used for this system's timings (see Scheduler)."""
+        return type(self).__name__
+
+    def update(self, world: "World"):
         raise NotImplementedError
 
+
+class EntityListSystem(System):
+    """
+    Adapter for a system written against the old update(entities): each
+    update passes it world.entities. It keeps the wrapped system's reads,
+    writes and name.
+    """
+
+    def __init__(self, system: Any):
+        self.system = system
+        self.reads = system.reads
+        self.writes = system.writes
+
+    @property
+    def name(self) -> str:
+        return type(self.system).__name__
+
+    def update(self, world: "World"):
+        self.system.update(world.entities)
+
+
+def _takes_entities(system: System) -> bool:
+    """True for a system written against the old update(entities)."""
+    try:
+        params = list(inspect.signature(system.update).parameters)
+    except (TypeError, ValueError):
+        return False
+    return params[:1] == ["entities"]
+
+
+class CommandBuffer:
+    """
+    Structural changes recorded now and applied by World.flush, in order.
+    Systems use world.commands to spawn, despawn and add or remove
+    components safely while iterating or running in parallel (recording
+    is a list append, which is thread-safe).
+    """
+
+    def __init__(self, world: "World"):
+        self.world = world
+        self._commands: List[Tuple[Callable, tuple]] = []
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    def spawn(self, *components: Component):
+        self._commands.append((self.world.spawn, components))
+
+    def spawn_many(self, count: int, *components: Component):
+        self._commands.append((self.world.spawn_many, (count, *components)))
+
+    def despawn(self, entity: EntityRef):
+        self._commands.append((self.world.despawn, (entity,)))
+
+    def despawn_many(self, ids):
+        self._commands.append((self.world.despawn_many, (ids,)))
+
+    def add(self, entity: EntityRef, component: Component):
+        self._commands.append((self.world.add_component, (entity, component)))
+
+    def remove(self, entity: EntityRef, component_type: Type[Component]):
+        self._commands.append(
+            (self.world.remove_component, (entity, component_type))
+        )
+
+    def flush(self):
+        """Apply and clear the recorded commands."""
+        # Commands may record further commands; they run in this flush
+        while self._commands:
+            commands, self._commands = self._commands, []
+            for command, args in commands:
+                command(*args)
+
+
 class World:
-    def __init__(self):
-        self.entities: List[Entity] = []
+    """
+    Entities, their archetype storage and the systems that update them.
+    max_workers sizes the scheduler's thread pool (None = default,
+    1 = run every system serially on the calling thread).
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.archetypes: Dict[FrozenSet[Type[Component]], Archetype] = {}
+        self._archetype_list: List[Archetype] = []
         self.systems: List[System] = []
+        self._queries: Dict[Tuple[FrozenSet, FrozenSet], Query] = {}
+        self.scheduler = Scheduler(max_workers)
+        self.commands = CommandBuffer(self)
+        # Per slot: generation, archetype index (-1 = free) and row
+        self._generation = np.zeros(0, dtype=np.int64)
+        self._arch_index = np.zeros(0, dtype=np.int32)
+        self._row = np.zeros(0, dtype=np.int64)
+        self._free: List[int] = []
+        self._slots = 0
+        self._empty = self._archetype(frozenset())
+        # Bumped by every change that may alter what the world looks like
+        # (see touch); renderers compare it to skip unchanged frames
+        self.version = 0
+
+    # --- entity slots ---
+
+    def _allocate(self, count: int) -> np.ndarray:
+        """Ids for count new entities, recycling free slots first."""
+        reused = min(count, len(self._free))
+        indexes = np.empty(count, dtype=np.int64)
+        if reused:
+            keep = len(self._free) - reused
+            indexes[:reused] = self._free[keep:]
+            del self._free[keep:]
+        fresh = count - reused
+        if fresh:
+            start = self._slots
+            needed = start + fresh
+            if needed > len(self._generation):
+                capacity = max(needed, 2 * len(self._generation), 64)
+                for name in ("_generation", "_arch_index", "_row"):
+                    old = getattr(self, name)
+                    new = np.zeros(capacity, old.dtype)
+                    new[: len(old)] = old
+                    setattr(self, name, new)
+            indexes[reused:] = np.arange(start, needed)
+            self._slots = needed
+        return (self._generation[indexes] << INDEX_BITS) | indexes
+
+    def _place(self, ids: np.ndarray, arch: Archetype) -> int:
+        """Append ids to arch and record their location; first row."""
+        self.version += 1
+        start = arch.append(ids)
+        indexes = ids & INDEX_MASK
+        self._arch_index[indexes] = arch.index
+        self._row[indexes] = np.arange(start, start + len(ids))
+        return start
+
+    def _index(self, entity_id: int) -> int:
+        index = entity_id & INDEX_MASK
+        if (
+            index >= self._slots
+            or self._arch_index[index] < 0
+            or self._generation[index] != entity_id >> INDEX_BITS
+        ):
+            raise KeyError(f"Entity {entity_id} is not alive.")
+        return index
+
+    def is_alive(self, entity: EntityRef) -> bool:
+        entity_id = entity.id if isinstance(entity, Entity) else entity
+        index = entity_id & INDEX_MASK
+        return (
+            0 <= entity_id
+            and index < self._slots
+            and self._arch_index[index] >= 0
+            and self._generation[index] == entity_id >> INDEX_BITS
+        )
+
+    def locate(self, entity: EntityRef) -> Tuple[Archetype, int]:
+        """(archetype, row) of a live entity; KeyError if it is stale."""
+        entity_id = entity.id if isinstance(entity, Entity) else entity
+        index = self._index(entity_id)
+        return (
+            self._archetype_list[self._arch_index[index]],
+            int(self._row[index]),
+        )
+
+    def entity(self, entity_id: int) -> Entity:
+        """Handle for an id returned by spawn_many or Query.ids."""
+        return Entity(self, int(entity_id))
+
+    @property
+    def entities(self) -> List[Entity]:
+        """Every entity in the world (built on demand)."""
+        return [
+            Entity(self, entity_id)
+            for arch in self._archetype_list
+            for entity_id in arch.live_ids().tolist()
+        ]
+
+    def _archetype(self, types: FrozenSet[Type[Component]]) -> Archetype:
+        arch = self.archetypes.get(types)
+        if arch is None:
+            arch = Archetype(len(self._archetype_list), types)
+            self.archetypes[types] = arch
+            self._archetype_list.append(arch)
+            for query in self._queries.values():
+                if query.matches(types):
+                    query.archetypes.append(arch)
+        return arch
+
+    # --- spawning and despawning ---
 
     def add_entity(self, entity: Entity):
-        self.entities.append(entity)
+        """Move a detached entity and its components into the world."""
+        if entity.world is not None:
+            raise ValueError(f"{entity!r} is already in a world.")
+        components = entity.components
+        arch = self._archetype(frozenset(components))
+        entity_id = int(self._allocate(1)[0])
+        row = self._place(np.array([entity_id]), arch)
+        entity.id = entity_id
+        entity.world = self
+        for component in components.values():
+            arch.set_component(row, component)
+            component._entity = entity
+        entity.components = {}
+
+    def spawn(self, *components: Component) -> Entity:
+        """Create an entity with components and add it to the world."""
+        entity = Entity()
+        for component in components:
+            entity.components[type(component)] = component
+        self.add_entity(entity)
+        return entity
+
+    def spawn_many(self, count: int, *components: Component) -> np.ndarray:
+        """
+        Create count entities sharing one archetype in a single call and
+        return their ids. Each component's field values may be scalars
+        (shared) or arrays of length count, e.g.
+            world.spawn_many(n, Position(xs, ys), Velocity(0.0, 1.0))
+        Fieldless components are shared by all the new entities.
+        """
+        arch = self._archetype(frozenset(type(c) for c in components))
+        ids = self._allocate(count)
+        start = self._place(ids, arch)
+        rows = slice(start, start + count)
+        for component in components:
+            arch.set_component(rows, component)
+        return ids
+
+    def despawn(self, entity: EntityRef):
+        """Remove an entity; its id becomes stale and the slot reusable."""
+        entity_id = entity.id if isinstance(entity, Entity) else entity
+        index = self._index(entity_id)
+        arch = self._archetype_list[self._arch_index[index]]
+        moved = arch.swap_remove(int(self._row[index]))
+        if moved >= 0:
+            self._row[moved & INDEX_MASK] = self._row[index]
+        self._release(np.array([index]))
+
+    def despawn_many(self, ids: Union[Sequence[int], np.ndarray]):
+        """
+        Remove many entities at once (stale or repeated ids are skipped),
+        compacting each affected archetype a single time.
+        """
+        ids = np.unique(np.asarray(ids, dtype=np.int64))
+        indexes = ids & INDEX_MASK
+        valid = indexes < self._slots
+        ids, indexes = ids[valid], indexes[valid]
+        live = (self._arch_index[indexes] >= 0) & (
+            self._generation[indexes] == ids >> INDEX_BITS
+        )
+        indexes = indexes[live]
+        if not len(indexes):
+            return
+        arch_of = self._arch_index[indexes]
+        for arch_index in np.unique(arch_of):
+            arch = self._archetype_list[arch_index]
+            rows = self._row[indexes[arch_of == arch_index]]
+            survivors = arch.remove_rows(rows)
+            self._row[survivors & INDEX_MASK] = np.arange(len(survivors))
+        self._release(indexes)
+
+    def _release(self, indexes: np.ndarray):
+        self.version += 1
+        self._arch_index[indexes] = -1
+        self._generation[indexes] += 1
+        self._free.extend(indexes.tolist())
+
+    def flush(self):
+        """Apply the structural changes recorded in world.commands."""
+        self.commands.flush()
+
+    # --- components ---
+
+    def _move(self, entity_id: int, dest: Archetype) -> int:
+        self.version += 1
+        index = self._index(entity_id)
+        src = self._archetype_list[self._arch_index[index]]
+        src_row = int(self._row[index])
+        dest_row = dest.append(np.array([entity_id]))
+        src.copy_row(src_row, dest, dest_row)
+        moved = src.swap_remove(src_row)
+        if moved >= 0:
+            self._row[moved & INDEX_MASK] = src_row
+        self._arch_index[index] = dest.index
+        self._row[index] = dest_row
+        return dest_row
+
+    def add_component(self, entity: EntityRef, component: Component):
+        """Add (or replace) a component of an entity in this world."""
+        if not isinstance(entity, Entity):
+            entity = Entity(self, entity)
+        t = type(component)
+        arch, row = self.locate(entity.id)
+        if t not in arch.types:
+            dest = arch.add_edges.get(t)
+            if dest is None:
+                dest = arch.add_edges[t] = self._archetype(arch.types | {t})
+            row = self._move(entity.id, dest)
+            arch = dest
+        arch.set_component(row, component)
+        component._entity = entity
+        self.version += 1
+
+    def remove_component(
+        self, entity: EntityRef, component_type: Type[Component]
+    ):
+        """Remove a component type from an entity in this world."""
+        entity_id = entity.id if isinstance(entity, Entity) else entity
+        arch, _ = self.locate(entity_id)
+        if component_type not in arch.types:
+            return
+        dest = arch.remove_edges.get(component_type)
+        if dest is None:
+            dest = self._archetype(arch.types - {component_type})
+            arch.remove_edges[component_type] = dest
+        self._move(entity_id, dest)
+
+    def query(
+        self,
+        *types: Type[Component],
+        exclude: Iterable[Type[Component]] = (),
+    ) -> Query:
+        """
+        The cached Query for entities with all of types and none of
+        exclude, e.g. world.query(Position, Velocity).
+        """
+        key = (frozenset(types), frozenset(exclude))
+        query = self._queries.get(key)
+        if query is None:
+            query = self._queries[key] = Query(self, *key)
+            query.archetypes = [
+                arch
+                for arch in self._archetype_list
+                if query.matches(arch.types)
+            ]
+        return query
+
+    # --- systems ---
 
     def add_system(self, system: System):
+        if _takes_entities(system):
+            warnings.warn(
+                f"{type(system).__name__}.update(entities) is deprecated;"
+                " systems now receive the World",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+            system = EntityListSystem(system)
         self.systems.append(system)
 
+    def touch(self):
+        """
+        Mark the world as changed. Needed after writing archetype columns
+        directly, in a system or outside one; field writes through a
+        component and structural changes do it themselves.
+        """
+        self.version += 1
+
     def update(self):
-        for system in self.systems:
-            system.update(self.entities)
\ No newline at end of file
+        """
+        Run every system once (see Scheduler for ordering), then apply
+        the commands they recorded. version changes only if a system
+        actually changed something (see System).
+        """
+        self.scheduler.run(self, self.systems)
+        self.commands.flush()
+
+    @property
+    def timings(self) -> Dict[str, float]:
+        """Seconds each system took in the last update, by system name."""
+        return self.scheduler.timings
+
+    def close(self):
+        """Release the scheduler's threads."""
+        self.scheduler.shutdown()
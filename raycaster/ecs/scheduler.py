@@ -0,0 +1,117 @@
+"""
+Scheduler: runs a World's systems, in parallel where their declared
+component reads and writes allow it.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence
+
+from ..core.profiler import FrameProfiler, clock
+
+if TYPE_CHECKING:
+    from .ecs import System
+
+
+def conflicts(first: "System", second: "System") -> bool:
+    """
+    True if the two systems may not run at the same time: one writes a
+    component type the other reads or writes. A system without declared
+    reads (reads is None) is assumed to touch everything.
+    """
+    if first.reads is None or second.reads is None:
+        return True
+    first_writes = set(first.writes)
+    second_writes = set(second.writes)
+    return bool(
+        first_writes & (set(second.reads) | second_writes)
+        or second_writes & set(first.reads)
+    )
+
+
+def build_stages(systems: Sequence["System"]) -> List[List["System"]]:
+    """
+    Group systems into stages that run one after another; systems within
+    a stage don't conflict. Each system lands in the stage after the
+    last earlier system it conflicts with, so every conflicting pair
+    keeps its registration order and results match a serial run.
+    """
+    stages: List[List["System"]] = []
+    level: Dict[int, int] = {}
+    for index, system in enumerate(systems):
+        stage = 0
+        for earlier in systems[:index]:
+            if conflicts(earlier, system):
+                stage = max(stage, level[id(earlier)] + 1)
+        level[id(system)] = stage
+        if stage == len(stages):
+            stages.append([])
+        stages[stage].append(system)
+    return stages
+
+
+class Scheduler:
+    """
+    Runs systems stage by stage (see build_stages), each stage's systems
+    concurrently on a persistent thread pool. This pays off for systems
+    that spend their time in NumPy or other code that releases the GIL.
+
+    Systems in the same stage run at the same time, so they must not add
+    or remove entities or components directly; they record such changes
+    in world.commands, which World.update applies after the run.
+
+    `timings` holds each system's duration (seconds) from the last run,
+    keyed by System.name (the class name); with a FrameProfiler attached
+    they are also recorded there as "system:<Name>".
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers
+        self.timings: Dict[str, float] = {}
+        self.profiler: Optional[FrameProfiler] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._plan_key: tuple = ()
+        self._stages: List[List["System"]] = []
+
+    def stages(self, systems: Sequence["System"]) -> List[List["System"]]:
+        """The stage plan for systems, rebuilt only when they change."""
+        key = tuple((id(s), s.reads, s.writes) for s in systems)
+        if key != self._plan_key:
+            self._stages = build_stages(systems)
+            self._plan_key = key
+        return self._stages
+
+    def _timed(self, system: "System", world) -> float:
+        start = clock()
+        system.update(world)
+        return clock() - start
+
+    def run(self, world, systems: Sequence["System"]):
+        prof = self.profiler
+        if prof is not None and not prof.enabled:
+            prof = None
+        for stage in self.stages(systems):
+            if len(stage) == 1 or self.max_workers == 1:
+                durations = [self._timed(s, world) for s in stage]
+            else:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="ecs-system",
+                    )
+                futures = [
+                    self._executor.submit(self._timed, s, world) for s in stage
+                ]
+                wait(futures)
+                # Re-raises the first system error, like a serial run
+                durations = [f.result() for f in futures]
+            for system, seconds in zip(stage, durations):
+                name = system.name
+                self.timings[name] = seconds
+                if prof is not None:
+                    prof.record(f"system:{name}", seconds)
+
+    def shutdown(self):
+        """Stop the thread pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,248 @@
+"""
+Uniform-grid spatial index for entities with a Position.
+
+Buckets are square cells of cell_size map units with integer corners, so
+with the default cell_size of 1 a bucket is exactly one GameMap cell and
+ray queries step through the same cells as the wall raycaster.
+
+The index is a snapshot: update(world) re-buckets only the entities that
+changed cell (or appeared, or were despawned) since the last update, and
+queries answer from the positions seen then. SpatialIndexSystem keeps it
+current as part of World.update.
+"""
+
+import math
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+
+from .components import Position
+from .ecs import INDEX_MASK, System
+
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+def cell_key(cx, cy):
+    """Bucket key of cell (cx, cy); works on ints and int64 arrays."""
+    return (cx << 32) + cy
+
+
+def key_cell(key: int):
+    """Inverse of cell_key for a single key."""
+    cy = ((key + (1 << 31)) & 0xFFFFFFFF) - (1 << 31)
+    return (key - cy) >> 32, cy
+
+
+class SpatialHash:
+    """
+    Maps entity ids to grid buckets. Query methods return int64 arrays
+    of entity ids (see World.entity).
+    """
+
+    def __init__(self, cell_size: int = 1):
+        if not isinstance(cell_size, int) or cell_size <= 0:
+            raise ValueError("cell_size must be a positive integer")
+        self.cell_size = cell_size
+        self.buckets: Dict[int, Set[int]] = {}
+        # Per entity slot: indexed id (-1 = none), bucket key, position
+        self._ids = np.full(0, -1, dtype=np.int64)
+        self._keys = np.zeros(0, dtype=np.int64)
+        self._x = np.zeros(0, dtype=np.float64)
+        self._y = np.zeros(0, dtype=np.float64)
+        self._stamp = np.zeros(0, dtype=np.int64)
+        self._generation = 0
+        # Entities re-bucketed by the last update, for diagnostics
+        self.moved = 0
+
+    def __len__(self) -> int:
+        return int((self._ids >= 0).sum())
+
+    def _reserve(self, slots: int):
+        if slots <= len(self._ids):
+            return
+        capacity = max(slots, 2 * len(self._ids), 64)
+        for name in ("_ids", "_keys", "_x", "_y", "_stamp"):
+            old = getattr(self, name)
+            new = np.full(capacity, -1 if name == "_ids" else 0, old.dtype)
+            new[: len(old)] = old
+            setattr(self, name, new)
+
+    def _cells(self, xs: np.ndarray, ys: np.ndarray):
+        size = self.cell_size
+        cx = np.floor(xs / size).astype(np.int64)
+        cy = np.floor(ys / size).astype(np.int64)
+        return cx, cy
+
+    def _unlink(self, entity_id: int, key: int):
+        bucket = self.buckets.get(key)
+        if bucket is not None:
+            bucket.discard(entity_id)
+            if not bucket:
+                del self.buckets[key]
+
+    def update(self, world):
+        """
+        Bring the index up to date with every Position in world. Only
+        entities whose bucket changed touch the bucket table; the rest
+        cost a few vectorized array operations per archetype.
+        """
+        self._generation += 1
+        stamp = self._generation
+        self._reserve(world._slots)
+        moved = 0
+        for arch in world.query(Position).chunks():
+            ids = arch.live_ids()
+            slots = ids & INDEX_MASK
+            xs = arch.column(Position, "x")
+            ys = arch.column(Position, "y")
+            keys = cell_key(*self._cells(xs, ys))
+            old_ids = self._ids[slots]
+            old_keys = self._keys[slots]
+            changed = np.flatnonzero((old_ids != ids) | (old_keys != keys))
+            for i in changed.tolist():
+                if old_ids[i] >= 0:
+                    self._unlink(int(old_ids[i]), int(old_keys[i]))
+                entity_id = int(ids[i])
+                self.buckets.setdefault(int(keys[i]), set()).add(entity_id)
+            moved += len(changed)
+            self._ids[slots] = ids
+            self._keys[slots] = keys
+            self._x[slots] = xs
+            self._y[slots] = ys
+            self._stamp[slots] = stamp
+        # Indexed entities not seen this time were despawned or lost
+        # their Position
+        gone = np.flatnonzero((self._ids >= 0) & (self._stamp != stamp))
+        for slot in gone.tolist():
+            self._unlink(int(self._ids[slot]), int(self._keys[slot]))
+        self._ids[gone] = -1
+        self.moved = moved + len(gone)
+
+    def cell(self, cx: int, cy: int) -> np.ndarray:
+        """Ids in bucket (cx, cy)."""
+        bucket = self.buckets.get(cell_key(cx, cy))
+        if not bucket:
+            return _EMPTY
+        return np.fromiter(bucket, dtype=np.int64, count=len(bucket))
+
+    def _gather(self, cx0: int, cy0: int, cx1: int, cy1: int) -> np.ndarray:
+        """Ids in every bucket of the inclusive cell rectangle."""
+        buckets = self.buckets
+        found: List[int] = []
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(buckets):
+            # Rectangle larger than the occupied set: scan buckets instead
+            for key, bucket in buckets.items():
+                cx, cy = key_cell(key)
+                if cx0 <= cx <= cx1 and cy0 <= cy <= cy1:
+                    found.extend(bucket)
+        else:
+            for cx in range(cx0, cx1 + 1):
+                for cy in range(cy0, cy1 + 1):
+                    ids = buckets.get(cell_key(cx, cy))
+                    if ids:
+                        found.extend(ids)
+        return np.array(found, dtype=np.int64)
+
+    def query_aabb(
+        self, x0: float, y0: float, x1: float, y1: float
+    ) -> np.ndarray:
+        """Ids of entities inside the box [x0, x1] x [y0, y1]."""
+        size = self.cell_size
+        ids = self._gather(
+            math.floor(x0 / size),
+            math.floor(y0 / size),
+            math.floor(x1 / size),
+            math.floor(y1 / size),
+        )
+        slots = ids & INDEX_MASK
+        xs, ys = self._x[slots], self._y[slots]
+        return ids[(xs >= x0) & (xs <= x1) & (ys >= y0) & (ys <= y1)]
+
+    def query_radius(self, x: float, y: float, radius: float) -> np.ndarray:
+        """Ids of entities within radius of (x, y), nearest first."""
+        size = self.cell_size
+        ids = self._gather(
+            math.floor((x - radius) / size),
+            math.floor((y - radius) / size),
+            math.floor((x + radius) / size),
+            math.floor((y + radius) / size),
+        )
+        slots = ids & INDEX_MASK
+        dist2 = (self._x[slots] - x) ** 2 + (self._y[slots] - y) ** 2
+        inside = dist2 <= radius * radius
+        ids, dist2 = ids[inside], dist2[inside]
+        return ids[np.argsort(dist2, kind="stable")]
+
+    def query_ray(
+        self,
+        x: float,
+        y: float,
+        angle: float,
+        max_distance: float,
+        game_map=None,
+    ) -> np.ndarray:
+        """
+        Ids of entities in the buckets a ray from (x, y) along angle
+        crosses, in traversal order (DDA, as in raycast.cast_ray), that
+        lie between 0 and max_distance along the ray. With
+        game_map given, the ray stops after the first wall cell, so
+        hidden entities are left out; this needs buckets of one map cell.
+        """
+        size = self.cell_size
+        if game_map is not None and size != 1:
+            raise ValueError("query_ray with game_map needs cell_size 1")
+        dir_x, dir_y = math.cos(angle), math.sin(angle)
+        gx, gy = x / size, y / size
+        cx, cy = math.floor(gx), math.floor(gy)
+        delta_x = abs(1.0 / dir_x) if dir_x else math.inf
+        delta_y = abs(1.0 / dir_y) if dir_y else math.inf
+        if dir_x < 0:
+            step_x, side_x = -1, (gx - cx) * delta_x
+        else:
+            step_x, side_x = 1, (cx + 1.0 - gx) * delta_x
+        if dir_y < 0:
+            step_y, side_y = -1, (gy - cy) * delta_y
+        else:
+            step_y, side_y = 1, (cy + 1.0 - gy) * delta_y
+
+        limit = max_distance / size
+        travelled = 0.0
+        parts: List[np.ndarray] = []
+        while travelled <= limit:
+            ids = self.cell(cx, cy)
+            if len(ids):
+                slots = ids & INDEX_MASK
+                along = (self._x[slots] - x) * dir_x + (
+                    self._y[slots] - y
+                ) * dir_y
+                ahead = (along >= 0.0) & (along <= max_distance)
+                ids, along = ids[ahead], along[ahead]
+                parts.append(ids[np.argsort(along, kind="stable")])
+            if game_map is not None and game_map.is_wall(cx + 0.5, cy + 0.5):
+                break
+            if side_x < side_y:
+                travelled = side_x
+                side_x += delta_x
+                cx += step_x
+            else:
+                travelled = side_y
+                side_y += delta_y
+                cy += step_y
+        return np.concatenate(parts) if parts else _EMPTY
+
+
+class SpatialIndexSystem(System):
+    """
+    Runs SpatialHash.update every World.update. The index is declared as
+    written, so systems that query it should list SpatialHash in their
+    reads: the scheduler then keeps them out of the rebuild's stage.
+    """
+
+    reads = (Position,)
+    writes = (SpatialHash,)
+
+    def __init__(self, index: Optional[SpatialHash] = None):
+        self.index = index if index is not None else SpatialHash()
+
+    def update(self, world):
+        self.index.update(world)
@@ -1,13 +1,30 @@
-from .ecs import System, Entity
+"""
+Built-in systems. Each one works on whole archetypes at once.
+"""
+
 from .components import Position, Velocity
+from .ecs import System
+
 
 class MovementSystem(System):
-    def update(self, entities):
-        for entity in entities:
-            pos = entity.get(Position)
-            vel = entity.get(Velocity)
-            if pos and vel:
-                pos.x += vel.dx
-                pos.y += vel.dy
-
-# Add more systems as needed (RenderingSystem, HealthSystem, etc.)
\ No newline at end of file
+    """Position += Velocity for every entity that has both."""
+
+    reads = (Velocity,)
+    writes = (Position,)
+
+    def update(self, world):
+        moved = False
+        for arch in world.query(Position, Velocity).chunks():
+            dx = arch.column(Velocity, "dx")
+            dy = arch.column(Velocity, "dy")
+            # Resting entities leave the world (and the frame) unchanged
+            if not (dx.any() or dy.any()):
+                continue
+            arch.column(Position, "x")[:] += dx
+            arch.column(Position, "y")[:] += dy
+            moved = True
+        if moved:
+            world.touch()
+
+
+# Add more systems as needed (RenderingSystem, HealthSystem, etc.)
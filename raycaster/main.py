@@ -1,11 +1,11 @@
 """
 Entry point for the Raycaster Engine.
 Allows configuration via command-line arguments and plugin selection.
+`raycaster bench ...` runs the headless benchmark instead (see bench.py).
 """
 
 import argparse
-import tkinter as tk
-from tkinter import simpledialog
+import sys
 
 from .core.config import EngineConfig
 from .core.engine import RaycastingEngine
@@ -16,6 +16,10 @@ def select_backend() -> str:
     Prompt the user to select a backend using a Tkinter dialog.
     Returns the selected backend as a string.
     """
+    # Imported here so headless runs never need a display or Tk
+    import tkinter as tk
+    from tkinter import simpledialog
+
     root = tk.Tk()
     root.withdraw()  # Hide the main window
     backend = simpledialog.askstring(
@@ -27,10 +31,17 @@ def select_backend() -> str:
     return backend or "pygame"
 
 
-def main():
+def main(argv=None):
     """
     Parse command-line arguments, select backend, and start the engine.
     """
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "bench":
+        from .bench import main as bench_main
+
+        bench_main(argv[1:])
+        return
+
     parser = argparse.ArgumentParser(description="Raycaster Engine")
     parser.add_argument(
         "--resolution",
@@ -45,13 +56,18 @@ def main():
         help="Path to map file",
     )
     parser.add_argument("--fps", action="store_true", help="Show FPS counter")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Time every frame phase and show p50/p95/p99 on screen",
+    )
     parser.add_argument(
         "--backend",
         type=str,
         choices=["pygame", "renderer"],
         help="Backend to use (overrides GUI prompt)",
     )
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # Allow CLI override for backend (useful for CI/testing)
     backend = args.backend or select_backend()
@@ -63,10 +79,17 @@ def main():
         return
 
     config = EngineConfig(
-        resolution=(width, height), map_path=args.map, show_fps=args.fps
+        resolution=(width, height),
+        map_path=args.map,
+        show_fps=args.fps,
+        profile=args.profile,
     )
     try:
         engine = RaycastingEngine(config, backend=backend)
+        if args.profile and hasattr(engine.renderer, "register_plugin"):
+            from .ui.hud import ProfilerOverlay
+
+            engine.renderer.register_plugin(ProfilerOverlay(engine.profiler))
         print(
             "Starting Raycaster Engine at "
             f"{width}x{height} with map {args.map} "
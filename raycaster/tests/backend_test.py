@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+
+from raycaster import backend
+from raycaster.backend import api
+from raycaster.core.floorcast import FloorCaster
+from raycaster.core.raycast import camera_rays
+from raycaster.core.renderer import WALL_COLORS
+from raycaster.core.textures import TextureAtlas
+
+GRID = np.array(
+    [
+        [1, 1, 1, 1, 1],
+        [1, 0, 0, 0, 1],
+        [1, 0, 3, 0, 1],
+        [1, 0, 0, 0, 1],
+        [1, 1, 1, 1, 1],
+    ],
+    dtype=np.int32,
+)
+PALETTE = np.array([(0, 0, 0), (200, 100, 50), (10, 20, 30)], dtype=np.uint8)
+
+
+def test_loader_exports_api():
+    assert backend.BACKEND in ("cython", "numpy")
+    for name in (
+        "cast_rays",
+        "fill_wall_columns",
+        "fill_textured_columns",
+        "fill_floor_ceiling",
+    ):
+        assert callable(getattr(backend, name))
+
+
+def test_fill_floor_ceiling():
+    frame = np.zeros((4, 6, 3), dtype=np.uint8)
+    api.fill_floor_ceiling(frame, 1, 3, (1, 2, 3), (4, 5, 6))
+    assert (frame[0] == 0).all() and (frame[3] == 0).all()
+    assert (frame[1:3, :3] == (1, 2, 3)).all()
+    assert (frame[1:3, 3:] == (4, 5, 6)).all()
+
+
+def test_fill_wall_columns():
+    frame = np.zeros((3, 8, 3), dtype=np.uint8)
+    distance = np.array([1.0, 2.0, np.inf])
+    side = np.array([0, 1, 0], dtype=np.int8)
+    wall = np.array([1, 1, 0], dtype=np.int32)
+    api.fill_wall_columns(frame, 0, distance, side, wall, PALETTE)
+    assert (frame[0] == (200, 100, 50)).all()
+    assert (frame[1, 2:6] == (100, 50, 25)).all()
+    assert (frame[1, :2] == 0).all() and (frame[1, 6:] == 0).all()
+    assert (frame[2] == 0).all()
+
+
+@pytest.mark.skipif(backend.BACKEND != "cython", reason="extension not built")
+def test_compiled_backend_matches_reference():
+    ray_dx, ray_dy = camera_rays(97, 75.0, 2.1)
+    expected = api.cast_rays(GRID, 1.2, 3.4, ray_dx, ray_dy)
+    result = backend.cast_rays(GRID, 1.2, 3.4, ray_dx, ray_dy)
+    for field in expected._fields:
+        assert np.allclose(getattr(result, field), getattr(expected, field))
+
+    frames = []
+    for impl in (api, backend):
+        frame = np.zeros((97, 40, 3), dtype=np.uint8)
+        impl.fill_floor_ceiling(frame, 0, 97, (1, 2, 3), (4, 5, 6))
+        impl.fill_wall_columns(
+            frame, 0, expected.distance, expected.side, expected.wall, PALETTE
+        )
+        frames.append(frame)
+    assert (frames[0] == frames[1]).all()
+
+
+@pytest.mark.parametrize("dtype", [np.int8, np.int16, np.uint32, bool])
+def test_cast_rays_accepts_any_integer_grid(dtype):
+    ray_dx, ray_dy = camera_rays(31, 75.0, 0.4)
+    expected = api.cast_rays(GRID, 1.2, 3.4, ray_dx, ray_dy)
+    grid = GRID.astype(dtype)
+    result = backend.cast_rays(grid, 1.2, 3.4, ray_dx, ray_dy)
+    assert np.allclose(result.distance, expected.distance)
+    assert (result.wall == expected.wall.astype(dtype)).all()
+
+
+def test_compiled_floor_matches_reference():
+    floors = FloorCaster(TextureAtlas.procedural(WALL_COLORS, 16), 2, 5)
+    table = floors.table(37, 30, 70.0)
+    ray_dx, ray_dy = camera_rays(37, 70.0, 2.2)
+    frames = []
+    for impl in (api, backend):
+        frame = np.zeros((40, 30, 3), dtype=np.uint8)
+        impl.fill_textured_floor(
+            frame,
+            3,
+            ray_dx,
+            ray_dy,
+            -3.7,
+            12.1,
+            int(table.rows[2]),
+            table.scale[2:],
+            table.offset[2:],
+            table.size[2:],
+            floors.atlas.texels,
+            floors.floor_texture,
+            floors.ceiling_texture,
+        )
+        frames.append(frame)
+    assert frames[0][3:].any() and not frames[0][:3].any()
+    assert (frames[0] == frames[1]).all()
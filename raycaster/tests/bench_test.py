@@ -0,0 +1,92 @@
+import json
+import sys
+
+from raycaster import bench
+from raycaster.core.map import GameMap
+
+MAP = {"grid": [[0, 0, 0], [0, 1, 0], [0, 0, 0]], "start_position": [0.5, 0.5]}
+
+
+def test_walk_path_is_deterministic_and_avoids_walls():
+    game_map = GameMap(data=MAP)
+    poses = bench.walk_path(game_map, game_map.start_position, 200, seed=3)
+    assert poses == bench.walk_path(game_map, (0.5, 0.5), 200, seed=3)
+    assert len(poses) == 200
+    assert not any(game_map.is_wall(x, y) for x, y, _ in poses)
+
+
+def test_recorded_path_cycles(tmp_path):
+    path = tmp_path / "path.json"
+
+    class Player:
+        x, y, angle = 1.0, 2.0, 0.5
+
+    recorder = bench.PathRecorder(Player())
+    recorder()
+    Player.x = 1.5
+    recorder()
+    recorder.save(str(path))
+    poses = bench.load_path(str(path), 3)
+    assert poses == [(1.0, 2.0, 0.5), (1.5, 2.0, 0.5), (1.0, 2.0, 0.5)]
+
+
+def test_bench_entry_point_writes_report(tmp_path, monkeypatch):
+    map_path = tmp_path / "map.json"
+    map_path.write_text(json.dumps(MAP))
+    out = tmp_path / "bench.json"
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "raycaster",
+            "bench",
+            "--map",
+            str(map_path),
+            "--resolution",
+            "32x24",
+            "--engine",
+            "numpy",
+            "python",
+            "--frames",
+            "5",
+            "--warmup",
+            "1",
+            "--path",
+            "spin",
+            "--output",
+            str(out),
+        ],
+    )
+    import raycaster.main as main_mod
+
+    main_mod.main()
+    report = json.loads(out.read_text())
+    assert [run["engine"] for run in report["runs"]] == ["numpy", "python"]
+    run = report["runs"][0]
+    assert run["resolution"] == [32, 24] and run["frames"] == 5
+    assert run["fps"] > 0
+    assert run["phases"]["frame"]["count"] == 5
+    assert "render.columns" in run["phases"]
+    assert "max_rss" in run["peak_memory_mb"]
+
+
+def test_main_does_not_need_tkinter_at_import():
+    import raycaster.main as main_mod
+
+    assert "tk" not in vars(main_mod)
+
+
+def test_isolated_runs_report_their_own_peak(tmp_path):
+    import numpy as np
+
+    map_path = tmp_path / "map.json"
+    map_path.write_text(json.dumps(MAP))
+    ballast = np.ones(64 * 1024 * 1024, dtype=np.uint8)  # 64 MiB touched
+    parent_peak = bench._max_rss_mb()["self"]
+    run = bench.run_isolated(
+        str(map_path), (32, 24), 1, "numpy", [(0.5, 0.5, 0.0)] * 3, warmup=0
+    )
+    del ballast
+    child_peak = run["peak_memory_mb"]["max_rss"]["self"]
+    if parent_peak is not None:
+        assert child_peak < parent_peak
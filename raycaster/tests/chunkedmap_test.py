@@ -0,0 +1,174 @@
+import math
+import time
+
+import numpy as np
+import pytest
+
+from raycaster.core.chunkedmap import ChunkedGameMap
+from raycaster.core.map import GameMap
+from raycaster.core.mapformat import write_chunked_map
+from raycaster.core.renderer import Renderer
+
+
+def make_world(seed=0, shape=(37, 45)):
+    rng = np.random.default_rng(seed)
+    cells = (rng.random(shape) < 0.2).astype(np.uint8) * rng.integers(
+        1, 6, shape, dtype=np.uint8
+    )
+    cells[20:30] = 0  # sparse: some tiles are entirely empty
+    return cells
+
+
+@pytest.fixture
+def world(tmp_path):
+    cells = make_world()
+    write_chunked_map(str(tmp_path), cells, tile_size=8)
+    return cells, str(tmp_path)
+
+
+def test_is_wall_matches_whole_map(world):
+    cells, path = world
+    chunked = ChunkedGameMap(
+        path, view_radius=1, cache_tiles=9, prefetch=False
+    )
+    whole = GameMap(data={"grid": cells.tolist()})
+    rng = np.random.default_rng(1)
+    xs = rng.uniform(-3, cells.shape[1] + 3, 500)
+    ys = rng.uniform(-3, cells.shape[0] + 3, 500)
+    for x, y in zip(xs, ys):
+        assert chunked.is_wall(x, y) == whole.is_wall(x, y)
+    assert (chunked.is_wall_many(xs, ys) == whole.is_wall_many(xs, ys)).all()
+    # The LRU cache stays bounded while lookups wander over every tile
+    assert len(chunked.cached_tiles()) <= 9
+
+
+def test_view_window_and_origin(world):
+    cells, path = world
+    chunked = ChunkedGameMap(path, view_radius=1, prefetch=False)
+    grid, origin_x, origin_y = chunked.raycast_view(20.5, 12.5)
+    assert (origin_x, origin_y) == (8, 0)
+    assert grid.shape == (24, 24)
+    assert (grid[:24, :] == cells[0:24, 8:32]).all()
+    assert chunked.raycast_view(21.5, 13.5)[0] is grid  # same tile
+    # Windows reaching past the world edge read as walls there
+    grid, origin_x, origin_y = chunked.raycast_view(1.5, 1.5)
+    assert (origin_x, origin_y) == (-8, -8)
+    assert (grid[:8] == 1).all() and (grid[:, :8] == 1).all()
+
+
+def test_prefetch_loads_tiles_ahead(world):
+    cells, path = world
+    chunked = ChunkedGameMap(path, view_radius=1)
+    try:
+        chunked.raycast_view(12.5, 12.5)
+        chunked.raycast_view(13.0, 12.5)  # moving +x
+        deadline = time.monotonic() + 5
+        ahead = {(3, 0), (3, 1), (3, 2), (3, 3)}
+        while not ahead <= set(chunked.cached_tiles()):
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+    finally:
+        chunked.close()
+
+
+def test_renderer_follows_streamed_view(world):
+    cells, path = world
+
+    class Player:
+        x, y, angle = 4.5, 22.5, 0.0
+
+    class Config:
+        resolution = (32, 24)
+        num_workers = 1
+
+    class PoolConfig(Config):
+        num_workers = 2
+        chunk_size = 8
+
+    whole = GameMap(data={"grid": cells.tolist()})
+    # The window is wide enough to hold the whole world from every pose,
+    # so the frames must match the unchunked map exactly.
+    renderers = [
+        Renderer(whole, Player(), Config(), headless=True),
+        Renderer(
+            ChunkedGameMap(path, view_radius=6, cache_tiles=256),
+            Player(),
+            Config(),
+            headless=True,
+        ),
+        Renderer(
+            ChunkedGameMap(path, view_radius=6, cache_tiles=256),
+            Player(),
+            PoolConfig(),
+            headless=True,
+        ),
+    ]
+    try:
+        for x in (4.5, 12.5, 20.5):
+            frames = []
+            for renderer in renderers:
+                renderer.player.x = x
+                renderer.render_frame()
+                frames.append(renderer.framebuffer.pixels.copy())
+            assert (frames[1] == frames[0]).all()
+            assert (frames[2] == frames[0]).all()
+    finally:
+        for renderer in renderers:
+            renderer.cleanup()
+            if hasattr(renderer.game_map, "close"):
+                renderer.game_map.close()
+
+
+def test_window_edge_draws_no_wall(world):
+    cells, path = world
+
+    class Player:
+        x, y, angle = 2.5, 25.5, 0.0
+
+    class Config:
+        resolution = (48, 24)
+        num_workers = 1
+
+    whole = Renderer(
+        GameMap(data={"grid": cells.tolist()}),
+        Player(),
+        Config(),
+        headless=True,
+    )
+    chunked = Renderer(
+        ChunkedGameMap(path, view_radius=1, prefetch=False),
+        Player(),
+        Config(),
+        headless=True,
+    )
+    # Walk along the open rows 20..29, looking both ways
+    escaped = 0
+    try:
+        for x in np.arange(2.5, 43.0, 0.75):
+            for angle in (0.1, math.pi - 0.1):
+                depths, frames = [], []
+                for renderer in (whole, chunked):
+                    renderer.player.x, renderer.player.angle = x, angle
+                    renderer.render_frame()
+                    depths.append(renderer.depth.array[:48].copy())
+                    frames.append(renderer.framebuffer.pixels.copy())
+                beyond = np.isinf(depths[1])
+                escaped += beyond.sum()
+                # Walls inside the window match the whole map exactly
+                assert (depths[1][~beyond] == depths[0][~beyond]).all()
+                assert (frames[1][~beyond] == frames[0][~beyond]).all()
+                # Rays that left the window saw no wall within it: the
+                # window reaches at least one tile (8 cells) from the
+                # player, perpendicular distance 8 * cos(fov / 2)
+                assert (depths[0][beyond] > 8 * math.cos(math.pi / 6)).all()
+    finally:
+        whole.cleanup()
+        chunked.cleanup()
+        chunked.game_map.close()
+    assert escaped
+
+
+def test_cache_must_hold_window(world):
+    _, path = world
+    with pytest.raises(ValueError):
+        ChunkedGameMap(path, view_radius=2, cache_tiles=30)
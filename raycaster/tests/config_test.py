@@ -41,3 +41,16 @@ def test_config_invalid_map_path():
         EngineConfig(map_path="")
     with pytest.raises(ValueError):
         EngineConfig(map_path=None)
+
+
+def test_config_worker_pool_options():
+    config = EngineConfig()
+    assert config.num_workers is None
+    assert config.chunk_size == 32
+    config = EngineConfig(num_workers=4, chunk_size=16)
+    assert config.num_workers == 4
+    assert config.chunk_size == 16
+    with pytest.raises(ValueError):
+        EngineConfig(num_workers=0)
+    with pytest.raises(ValueError):
+        EngineConfig(chunk_size=0)
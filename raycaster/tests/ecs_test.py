@@ -0,0 +1,214 @@
+import numpy as np
+import pytest
+
+from raycaster.ecs.components import Health, Position, Velocity
+from raycaster.ecs.ecs import INDEX_MASK, Component, Entity, System, World
+from raycaster.ecs.systems import MovementSystem
+
+
+class Tag(Component):
+    pass
+
+
+def test_entities_with_same_components_share_archetype():
+    world = World()
+    a = world.spawn(Position(1, 2), Velocity(3, 4))
+    b = world.spawn(Position(5, 6), Velocity(7, 8))
+    c = world.spawn(Position(0, 0))
+    arch = world.locate(a)[0]
+    assert world.locate(b)[0] is arch
+    assert world.locate(c)[0] is not arch
+    assert arch.column(Position, "x").tolist() == [1.0, 5.0]
+    assert arch.column(Velocity, "dy").dtype == np.float64
+    assert len(world.entities) == 3
+
+
+def test_component_views_read_and_write_storage():
+    world = World()
+    entity = Entity()
+    entity.add(Position(1, 2))
+    world.add_entity(entity)
+    pos = entity.get(Position)
+    pos.x += 10
+    assert world.locate(entity)[0].column(Position, "x")[0] == 11
+    assert entity.get(Velocity) is None and not entity.has(Velocity)
+
+
+def test_adding_and_removing_components_moves_rows():
+    world = World()
+    first = world.spawn(Position(1, 1))
+    second = world.spawn(Position(2, 2))
+    tag = Tag()
+    first.add(Health(30))
+    first.add(tag)
+    assert first.get(Health).hp == 30 and first.get(Tag) is tag
+    assert first.get(Position).x == 1
+    # The row left behind was refilled by the last entity
+    assert world.locate(second)[1] == 0 and second.get(Position).x == 2
+    first.remove(Health)
+    assert not first.has(Health) and first.get(Tag) is tag
+    assert first.get(Position).x == 1
+
+
+def test_movement_system_is_vectorized_over_archetypes():
+    world = World()
+    movers = [
+        world.spawn(Position(i, 0), Velocity(1, 0.5)) for i in range(100)
+    ]
+    with_health = world.spawn(Position(0, 0), Velocity(2, 2), Health(5))
+    still = world.spawn(Position(9, 9))
+    world.add_system(MovementSystem())
+    world.update()
+    world.update()
+    assert [e.get(Position).x for e in movers[:3]] == [2.0, 3.0, 4.0]
+    assert movers[0].get(Position).y == 1.0
+    assert (with_health.get(Position).x, with_health.get(Position).y) == (4, 4)
+    assert still.get(Position).x == 9
+
+
+def test_systems_receive_world():
+    seen = []
+
+    class Counter(System):
+        def update(self, world):
+            seen.append(len(world.query(Position)))
+
+    world = World()
+    world.spawn(Position(0, 0))
+    world.add_system(Counter())
+    world.update()
+    assert seen == [1]
+
+
+def test_query_tracks_component_changes_incrementally():
+    world = World()
+    query = world.query(Position, Velocity)
+    untagged = world.query(Position, exclude=[Tag])
+    assert world.query(Velocity, Position) is query
+    a = world.spawn(Position(0, 0), Velocity(1, 1))
+    b = world.spawn(Position(0, 0))
+    assert list(query) == [a] and len(untagged) == 2
+    b.add(Velocity(0, 1))
+    assert set(query) == {a, b}
+    a.remove(Velocity)
+    a.add(Tag())
+    assert list(query) == [b]
+    assert list(untagged) == [b]
+    # Only the archetypes that can match are visited
+    world.spawn(Health(1))
+    assert all(Position in arch.types for arch in query.archetypes)
+
+
+def test_despawned_slots_are_recycled_with_a_new_generation():
+    world = World()
+    a = world.spawn(Position(1, 1))
+    b = world.spawn(Position(2, 2))
+    world.despawn(a)
+    assert not a.alive and b.alive and b.get(Position).x == 2
+    c = world.spawn(Position(3, 3))
+    # Same slot, different id: the stale handle does not alias c
+    assert c.id & INDEX_MASK == a.id & INDEX_MASK and c != a
+    assert not world.is_alive(a.id)
+    with pytest.raises(KeyError):
+        a.get(Position)
+    assert sorted(e.get(Position).x for e in world.query(Position)) == [2, 3]
+
+
+def test_spawn_many_and_despawn_many():
+    world = World()
+    xs = np.arange(1000, dtype=np.float64)
+    ids = world.spawn_many(1000, Position(xs, 0.0), Velocity(1.0, 2.0))
+    assert len(ids) == len(set(ids.tolist())) == 1000
+    arch = world.locate(ids[0])[0]
+    assert arch.column(Position, "x").tolist() == xs.tolist()
+    assert (arch.column(Velocity, "dy") == 2.0).all()
+    world.despawn_many(ids[::2])
+    # Stale and repeated ids are ignored
+    world.despawn_many(np.concatenate([ids[::2], ids[1:2], ids[1:2]]))
+    assert len(world.query(Position)) == 499
+    survivors = world.query(Position).ids()
+    assert all(world.is_alive(i) for i in survivors.tolist())
+    assert sorted(world.entity(i).get(Position).x for i in survivors) == (
+        xs[3::2].tolist()
+    )
+    # Freed slots are reused before the slot table grows
+    slots = world._slots
+    world.spawn_many(501, Position(0.0, 0.0))
+    assert world._slots == slots and len(world.query(Position)) == 1000
+
+
+def test_command_buffer_defers_changes_until_after_update():
+    class Reaper(System):
+        def update(self, world):
+            for entity in world.query(Health):
+                if entity.get(Health).hp <= 0:
+                    world.commands.despawn(entity)
+                    world.commands.spawn(Position(0, 0), Tag())
+            assert len(world.query(Health)) == 3
+
+    world = World()
+    dead = world.spawn(Health(0))
+    world.spawn(Health(5))
+    world.spawn(Health(-1))
+    world.add_system(Reaper())
+    world.update()
+    assert len(world.commands) == 0
+    assert not dead.alive
+    assert len(world.query(Health)) == 1 and len(world.query(Tag)) == 2
+
+
+def test_world_version_tracks_changes():
+    world = World(1)
+    version = world.version
+    entity = world.spawn(Position(0.0, 0.0))
+    assert world.version > version
+    version = world.version
+    entity.get(Position).x = 2.0
+    assert world.version > version
+    version = world.version
+    # Systems bump it only when they change something
+
+    class Observer(System):
+        reads = (Position,)
+
+        def update(self, world):
+            pass
+
+    world.add_system(Observer())
+    world.add_system(MovementSystem())
+    resting = world.spawn(Position(0.0, 0.0), Velocity(0.0, 0.0))
+    version = world.version
+    world.update()
+    assert world.version == version
+    resting.get(Velocity).dx = 1.0
+    version = world.version
+    world.update()
+    assert world.version > version
+    assert resting.get(Position).x == 1.0
+    version = world.version
+    world.despawn(entity)
+    assert world.version > version
+    world.close()
+
+
+def test_detached_entities_equal_only_themselves():
+    first, second = Entity(), Entity()
+    assert first == first and first != second
+    assert len({first, second, first}) == 2
+
+
+def test_old_style_systems_get_the_entity_list():
+    class Mover(System):
+        def update(self, entities):
+            for entity in entities:
+                entity.get(Position).x += 1
+
+    world = World()
+    entity = world.spawn(Position(0.0, 0.0))
+    mover = Mover()
+    with pytest.warns(DeprecationWarning):
+        world.add_system(mover)
+    world.update()
+    assert entity.get(Position).x == 1.0
+    assert "update" not in vars(mover)
+    assert "Mover" in world.timings
@@ -144,3 +144,96 @@ def test_event_dispatcher_error_handling(monkeypatch, capsys):
     assert count == 2
     captured = capsys.readouterr()
     assert "[EventDispatcher] Error in listener for 'test_event':" in captured.out
+
+
+def test_unchanged_frames_are_skipped(monkeypatch):
+    monkeypatch.setattr("raycaster.core.engine.GameMap", lambda path: DummyMap())
+    monkeypatch.setattr("raycaster.core.engine.Player", lambda pos: DummyPlayer(pos))
+
+    class TrackingRenderer(DummyRenderer):
+        frames = flips = ticks = 0
+        dirty = True
+
+        def needs_redraw(self):
+            return self.dirty
+
+        def invalidate(self):
+            self.dirty = True
+
+        def render_frame(self):
+            self.frames += 1
+            self.dirty = False
+
+        def flip(self):
+            self.flips += 1
+
+        def tick(self, framerate):
+            self.ticks += 1
+            if self.ticks == 3:
+                engine.invalidate()
+            if self.ticks == 5:
+                engine.running = False
+
+    monkeypatch.setattr("raycaster.core.engine.Renderer", TrackingRenderer)
+    engine = RaycastingEngine(
+        EngineConfig(map_path="dummy.json"), backend="renderer"
+    )
+    engine.run()
+    renderer = engine.renderer
+    # Drawn on the first frame and once after the invalidate
+    assert renderer.frames == renderer.flips == 2
+    assert engine.skipped_frames == 3
+
+
+def test_skipping_can_be_disabled(monkeypatch):
+    monkeypatch.setattr("raycaster.core.engine.GameMap", lambda path: DummyMap())
+    monkeypatch.setattr("raycaster.core.engine.Player", lambda pos: DummyPlayer(pos))
+
+    class StaticRenderer(DummyRenderer):
+        frames = 0
+
+        def needs_redraw(self):
+            return False
+
+        def render_frame(self):
+            self.frames += 1
+
+        def tick(self, framerate):
+            engine.running = False
+
+    monkeypatch.setattr("raycaster.core.engine.Renderer", StaticRenderer)
+    engine = RaycastingEngine(
+        EngineConfig(map_path="dummy.json", skip_unchanged_frames=False),
+        backend="renderer",
+    )
+    engine.run()
+    assert engine.renderer.frames == 1
+    assert engine.skipped_frames == 0
+
+
+def test_queued_events_are_drained_before_pre_render(monkeypatch):
+    monkeypatch.setattr("raycaster.core.engine.GameMap", lambda path: DummyMap())
+    monkeypatch.setattr("raycaster.core.engine.Player", lambda pos: DummyPlayer(pos))
+    monkeypatch.setattr("raycaster.core.engine.Renderer", DummyRenderer)
+    engine = RaycastingEngine(
+        EngineConfig(map_path="dummy.json", queue_events=True),
+        backend="renderer",
+    )
+    delivered = []
+    seen_before_render = []
+    engine.register_event_handler("resize", lambda e: delivered.append(e.data))
+    engine.event_queue.coalesce("resize")
+
+    def update():
+        assert engine.dispatch_event("resize", {"size": 1}) == 0
+        engine.dispatch_event("resize", {"size": 2})
+
+    def pre_render():
+        seen_before_render.extend(delivered)
+        engine.running = False
+
+    engine.register_pre_update(update)
+    engine.register_pre_render(pre_render)
+    engine.run()
+    assert seen_before_render == [{"size": 2}]
+    assert engine.event_queue.stats.coalesced == 1
@@ -1,4 +1,9 @@
-from raycaster.core.events import Event, EventDispatcher
+from raycaster.core.events import (
+    Event,
+    EventDispatcher,
+    EventQueue,
+    TypedEvent,
+)
 
 
 def test_event_creation():
@@ -82,3 +87,139 @@ def test_listener_exception_does_not_break_dispatch(capsys):
     assert count == 2
     out = capsys.readouterr().out
     assert "Error in listener" in out
+
+
+class Hit(TypedEvent):
+    __slots__ = ("target", "damage")
+
+
+class CriticalHit(Hit):
+    __slots__ = ()
+
+
+def test_typed_dispatch_reaches_base_listeners_and_reuses_events():
+    dispatcher = EventDispatcher()
+    seen = []
+    dispatcher.register_typed(Hit, lambda e: seen.append(("hit", e.damage)))
+    dispatcher.register_typed(
+        CriticalHit, lambda e: seen.append(("crit", e.damage))
+    )
+    event = dispatcher.acquire(CriticalHit)
+    event.target, event.damage = 1, 40
+    assert dispatcher.dispatch_typed(event) == 2
+    assert seen == [("hit", 40), ("crit", 40)]
+    assert event.name == "CriticalHit"
+    # Released to the pool and handed out again
+    assert dispatcher.acquire(CriticalHit) is event
+
+
+def test_dispatch_many_batches_and_isolates_errors(capsys):
+    dispatcher = EventDispatcher()
+    batches = []
+    damage = []
+
+    def flaky(event):
+        if event.damage == 2:
+            raise ValueError("bad hit")
+        damage.append(event.damage)
+
+    dispatcher.register_typed(Hit, batches.append, batch=True)
+    dispatcher.register_typed(Hit, flaky)
+    pool = dispatcher.pool(Hit, size=4)
+    events = []
+    for i in range(4):
+        event = dispatcher.acquire(Hit)
+        event.target, event.damage = i, i
+        events.append(event)
+    assert len(pool) == 0
+    assert dispatcher.dispatch_many(Hit, events) == 1 + 4
+    assert len(batches) == 1 and batches[0] is events
+    assert damage == [0, 1, 3]
+    assert "bad hit" in capsys.readouterr().out
+    assert len(pool) == 4
+
+
+def test_unregister_typed_listener():
+    dispatcher = EventDispatcher()
+    calls = []
+    dispatcher.register_typed(Hit, calls.append)
+    event = dispatcher.acquire(Hit)
+    dispatcher.dispatch_typed(event)
+    dispatcher.unregister_typed(Hit, calls.append)
+    assert dispatcher.dispatch_typed(dispatcher.acquire(Hit)) == 0
+    assert calls == [event]
+
+
+def test_queue_delivers_by_priority_on_drain():
+    dispatcher = EventDispatcher()
+    queue = EventQueue(dispatcher)
+    order = []
+
+    def listener(event):
+        order.append(event.data["n"])
+        if event.data["n"] == 0:
+            queue.push("evt", {"n": 9})
+
+    dispatcher.register("evt", listener)
+    queue.push("evt", {"n": 0})
+    queue.push("evt", {"n": 1}, priority=5)
+    queue.push("evt", {"n": 2})
+    queue.push("evt", {"n": 3}, priority=5)
+    assert order == []
+    assert queue.drain() == 4
+    assert order == [1, 3, 0, 2]
+    # Pushed during the drain: delivered by the next one
+    assert len(queue) == 1
+    queue.drain()
+    assert order[-1] == 9
+
+
+def test_queue_coalesces_repeats_and_reports_stats():
+    dispatcher = EventDispatcher()
+    queue = EventQueue(dispatcher)
+    moves = []
+    hits = []
+    dispatcher.register("moved", lambda e: moves.append(e.data))
+    dispatcher.register_typed(Hit, hits.append, batch=True)
+    queue.coalesce("moved", key=lambda data: data["entity"])
+    queue.coalesce(Hit)
+    for step in range(3):
+        queue.push("moved", {"entity": 1, "x": step})
+        queue.push("moved", {"entity": 2, "x": step})
+    first = dispatcher.acquire(Hit)
+    last = dispatcher.acquire(Hit)
+    last.damage = 7
+    queue.push_typed(first)
+    queue.push_typed(last, priority=1)
+    queue.drain()
+    assert moves == [{"entity": 1, "x": 2}, {"entity": 2, "x": 2}]
+    # The merged hit takes the higher priority and the earlier event's
+    # place; the replaced event is back in the pool
+    assert [[event.damage for event in batch] for batch in hits] == [[7]]
+    assert first in dispatcher.pool(Hit)._free
+    stats = queue.stats
+    assert (stats.queued, stats.coalesced, stats.delivered) == (8, 5, 3)
+    assert stats.drain_time >= 0.0
+    queue.drain()
+    assert queue.stats.delivered == 0
+
+
+def test_queue_wraps_and_grows():
+    dispatcher = EventDispatcher()
+    queue = EventQueue(dispatcher, capacity=4)
+    seen = []
+    dispatcher.register("evt", lambda e: seen.append(e.data["n"]))
+    queue.coalesce("last")
+    for n in range(3):
+        queue.push("evt", {"n": n})
+    queue.drain()
+    # Now wrapped around the end of the buffer, then past its capacity
+    queue.push("last", {"n": -1})
+    for n in range(3, 9):
+        queue.push("evt", {"n": n})
+    queue.push("last", {"n": -2})
+    assert queue.capacity == 8
+    dispatcher.register("last", lambda e: seen.append(e.data["n"]))
+    assert queue.drain() == 7
+    # The coalesced event kept its slot through the move
+    assert seen == [0, 1, 2, -2, 3, 4, 5, 6, 7, 8] and len(queue) == 0
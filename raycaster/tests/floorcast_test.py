@@ -0,0 +1,62 @@
+import math
+
+import numpy as np
+
+from raycaster.backend.api import wall_spans
+from raycaster.core.floorcast import FloorCaster
+from raycaster.core.raycast import camera_rays
+from raycaster.core.renderer import WALL_COLORS
+from raycaster.core.textures import TextureAtlas
+
+
+def atlas():
+    rng = np.random.default_rng(5)
+    return TextureAtlas(
+        [rng.integers(0, 256, (16, 16, 3), dtype=np.uint8) for _ in "abc"]
+    )
+
+
+def test_row_table_is_cached_per_resolution_and_fov():
+    floors = FloorCaster(atlas())
+    table = floors.table(64, 48, 60.0)
+    assert floors.table(64, 48, 60.0) is table
+    assert floors.table(64, 48, 90.0) is not table
+    assert floors.table(80, 48, 90.0) is not floors.table(64, 48, 90.0)
+    # A wall at a row's floor distance ends right at that row
+    _, bottom = wall_spans(table.distance, 48)
+    assert (bottom == table.rows + 1).all() or (bottom == table.rows).all()
+    # Rows nearer the horizon see further and use coarser mip levels
+    assert (np.diff(table.size) >= 0).all()
+    assert table.size[0] < table.size[-1] == 16
+
+
+def test_floor_and_ceiling_sample_world_texels():
+    tex = atlas()
+    floors = FloorCaster(tex, floor_texture=2, ceiling_texture=3)
+    width, height, fov = 40, 30, 60.0
+    pose = (2.3, 5.7, 0.8)
+    ray_dx, ray_dy = camera_rays(width, fov, pose[2])
+    pixels = np.zeros((width, height, 3), dtype=np.uint8)
+    floors.draw(pixels, 0, pose, ray_dx, ray_dy, fov)
+    table = floors.table(width, height, fov)
+    for x in (0, 17, 39):
+        for i in (0, 5, len(table.rows) - 1):
+            level = int(np.log2(16 // table.size[i]))
+            size = int(table.size[i])
+            wx = pose[0] + ray_dx[x] * table.distance[i]
+            wy = pose[1] + ray_dy[x] * table.distance[i]
+            u = int(math.floor(wx * size)) % size
+            v = int(math.floor(wy * size)) % size
+            row = int(table.rows[i])
+            assert (pixels[x, row] == tex.level(level)[1, u, v]).all()
+            mirror = height - 1 - row
+            assert (pixels[x, mirror] == tex.level(level)[2, u, v]).all()
+
+
+def test_first_row_skips_rows_walls_cover():
+    floors = FloorCaster(TextureAtlas.procedural(WALL_COLORS, 8))
+    ray_dx, ray_dy = camera_rays(10, 60.0, 0.0)
+    pixels = np.zeros((10, 20, 3), dtype=np.uint8)
+    floors.draw(pixels, 0, (1.5, 1.5, 0.0), ray_dx, ray_dy, 60.0, 15)
+    assert not pixels[:, 5:15].any()
+    assert pixels[:, 15:].any() and pixels[:, :5].any()
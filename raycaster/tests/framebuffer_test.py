@@ -0,0 +1,27 @@
+import numpy as np
+
+from raycaster.core.framebuffer import SharedArray, SharedFramebuffer
+
+
+def test_shared_framebuffer_shape_and_attach():
+    owner = SharedFramebuffer(8, 4)
+    assert owner.pixels.shape == (8, 4, 3)
+    assert owner.pixels.dtype == np.uint8
+
+    view = SharedFramebuffer(8, 4, name=owner.name)
+    view.pixels[2:4] = (10, 20, 30)
+    assert (owner.pixels[2:4] == (10, 20, 30)).all()
+    assert (owner.pixels[:2] == 0).all()
+
+    view.close()
+    owner.close()
+    owner.close()  # idempotent
+
+
+def test_shared_array_attach_by_name():
+    owner = SharedArray((3, 5), np.uint16)
+    owner.array[1, 2] = 4000
+    view = SharedArray((3, 5), np.uint16, name=owner.name)
+    assert view.array[1, 2] == 4000
+    view.close()
+    owner.close()
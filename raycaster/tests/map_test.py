@@ -1,5 +1,6 @@
 import json
 
+import numpy as np
 import pytest
 
 from raycaster.core.map import GameMap
@@ -11,7 +12,7 @@ def test_init_from_data():
         "start_position": (1.5, 1.5),
     }
     game_map = GameMap(data=data)
-    assert game_map.map_data == data["grid"]
+    assert game_map.map_data.tolist() == data["grid"]
     assert game_map.start_position == (1.5, 1.5)
 
 
@@ -20,7 +21,7 @@ def test_init_from_file(tmp_path):
     map_content = {"grid": [[1, 1], [0, 1]], "start_position": [0.5, 0.5]}
     map_file.write_text(json.dumps(map_content))
     game_map = GameMap(map_path=str(map_file))
-    assert game_map.map_data == map_content["grid"]
+    assert game_map.map_data.tolist() == map_content["grid"]
     assert game_map.start_position == (0.5, 0.5)
 
 
@@ -47,3 +48,57 @@ def test_is_wall_and_bounds():
     assert game_map.is_wall(1, -1)
     assert game_map.is_wall(3, 1)
     assert game_map.is_wall(1, 3)
+
+
+def test_grid_is_padded_array():
+    data = {"grid": [[0, 2, 0], [0, 0, 300]]}
+    game_map = GameMap(data=data)
+    assert game_map.width == 3
+    assert game_map.height == 2
+    assert game_map.grid.dtype == np.uint16
+    assert game_map.grid.shape == (4, 5)
+    assert (game_map.grid[0] == 1).all() and (game_map.grid[-1] == 1).all()
+    assert (game_map.grid[:, 0] == 1).all() and (
+        game_map.grid[:, -1] == 1
+    ).all()
+    assert game_map.grid[1, 2] == 2
+    assert GameMap(data={"grid": [[0, 1]]}).grid.dtype == np.uint8
+
+
+def test_is_wall_fractional_and_far_out_of_bounds():
+    game_map = GameMap(data={"grid": [[0, 0], [0, 1]]})
+    assert not game_map.is_wall(0.5, 0.5)
+    assert game_map.is_wall(1.5, 1.5)
+    assert game_map.is_wall(-0.5, 0.5)
+    assert game_map.is_wall(100.0, 0.5)
+    assert game_map.is_wall(0.5, -100.0)
+
+
+def test_is_wall_many_matches_is_wall():
+    game_map = GameMap(data={"grid": [[0, 1, 0], [0, 0, 0], [1, 0, 0]]})
+    xs = np.array([-5.0, -0.5, 0.2, 1.5, 2.9, 0.5, 3.0, 40.0])
+    ys = np.array([0.5, 0.5, 0.2, 0.5, 1.1, 2.5, 1.0, 1.0])
+    result = game_map.is_wall_many(xs, ys)
+    assert result.dtype == bool
+    assert result.tolist() == [game_map.is_wall(x, y) for x, y in zip(xs, ys)]
+
+
+def test_invalid_grids_raise():
+    with pytest.raises(ValueError):
+        GameMap(data={"grid": [[0, 1], [0]]})
+    with pytest.raises(ValueError):
+        GameMap(data={"grid": []})
+    with pytest.raises(ValueError):
+        GameMap(data={"grid": [[0, -1]]})
+
+
+def test_layers_padded_and_validated():
+    data = {"grid": [[0, 1]], "layers": {"floor": [[3, 4]]}}
+    game_map = GameMap(data=data)
+    assert game_map.layers["floor"].tolist() == [
+        [0, 0, 0, 0],
+        [0, 3, 4, 0],
+        [0, 0, 0, 0],
+    ]
+    with pytest.raises(ValueError):
+        GameMap(data={"grid": [[0, 1]], "layers": {"floor": [[3]]}})
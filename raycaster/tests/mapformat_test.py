@@ -0,0 +1,94 @@
+import json
+
+import numpy as np
+import pytest
+
+from raycaster.core.map import GameMap
+from raycaster.core.mapformat import (
+    attach_grid,
+    convert_json_map,
+    is_binary_map,
+    read_binary_map,
+    share_grid,
+    write_binary_map,
+)
+from raycaster.core.renderer import Renderer
+
+MAP = {
+    "grid": [[1, 1, 1, 1], [1, 0, 0, 1], [1, 0, 300, 1], [1, 1, 1, 1]],
+    "start_position": [1.5, 1.5],
+    "layers": {"floor": [[0, 0, 0, 0], [0, 2, 3, 0], [0, 4, 5, 0], [0] * 4]},
+}
+
+
+@pytest.fixture
+def binary_path(tmp_path):
+    json_path = tmp_path / "level.json"
+    json_path.write_text(json.dumps(MAP))
+    out_path = tmp_path / "level.rcmap"
+    convert_json_map(str(json_path), str(out_path))
+    return out_path
+
+
+def test_convert_round_trip(binary_path):
+    binary = read_binary_map(str(binary_path))
+    assert isinstance(binary.grid, np.memmap)
+    assert binary.grid.dtype == np.uint16
+    assert binary.grid[1:-1, 1:-1].tolist() == MAP["grid"]
+    assert (binary.grid[0] == 1).all() and (binary.grid[:, -1] == 1).all()
+    assert binary.start_position == (1.5, 1.5)
+    assert binary.layers["floor"].dtype == np.uint8
+    assert (
+        binary.layers["floor"][1:-1, 1:-1].tolist() == MAP["layers"]["floor"]
+    )
+
+
+def test_game_map_loads_binary_like_json(binary_path, tmp_path):
+    json_map = GameMap(data=MAP)
+    binary_map = GameMap(map_path=str(binary_path))
+    assert is_binary_map(str(binary_path))
+    assert (binary_map.grid == json_map.grid).all()
+    assert binary_map.start_position == json_map.start_position
+    assert (binary_map.layers["floor"] == json_map.layers["floor"]).all()
+    for x, y in [(0.5, 0.5), (1.5, 1.5), (2.5, 2.5), (-1.0, 2.0), (9.0, 1.0)]:
+        assert binary_map.is_wall(x, y) == json_map.is_wall(x, y)
+
+
+def test_share_grid_reopens_memmap(binary_path):
+    grid = read_binary_map(str(binary_path)).grid
+    handle = share_grid(grid)
+    assert handle[0] == "memmap"
+    assert (attach_grid(handle) == grid).all()
+    array = np.zeros((3, 3), dtype=np.uint8)
+    assert attach_grid(share_grid(array)) is array
+
+
+def test_pool_renders_binary_map(binary_path):
+    class Player:
+        x, y, angle = 1.5, 1.5, 0.3
+
+    class Config:
+        resolution = (32, 24)
+        num_workers = 1
+
+    class PoolConfig(Config):
+        num_workers = 2
+        chunk_size = 8
+
+    frames = []
+    for config in (Config(), PoolConfig()):
+        game_map = GameMap(map_path=str(binary_path))
+        renderer = Renderer(game_map, Player(), config, headless=True)
+        renderer.render_frame()
+        frames.append(renderer.framebuffer.pixels.copy())
+        renderer.cleanup()
+    assert (frames[0] == frames[1]).all()
+
+
+def test_invalid_binary_maps(tmp_path):
+    bad = tmp_path / "bad.rcmap"
+    bad.write_bytes(b"not a map")
+    with pytest.raises(ValueError):
+        read_binary_map(str(bad))
+    with pytest.raises(ValueError):
+        write_binary_map(str(bad), np.zeros((2, 2)), layers={"x": np.zeros(3)})
@@ -0,0 +1,136 @@
+import pytest
+
+from raycaster.core.config import EngineConfig
+from raycaster.core.engine import RaycastingEngine
+from raycaster.core.map import GameMap
+from raycaster.core.pipeline import (
+    Pipeline,
+    RateLimitedLogger,
+    Step,
+    hook_steps,
+)
+from raycaster.core.profiler import FrameProfiler
+
+
+def failing():
+    raise RuntimeError("boom")
+
+
+def test_logger_rate_limits_per_label(monkeypatch, capsys):
+    now = [0.0]
+    monkeypatch.setattr("raycaster.core.pipeline.clock", lambda: now[0])
+    logger = RateLimitedLogger(interval=1.0)
+    assert logger.error("Hook", RuntimeError("a"))
+    assert not logger.error("Hook", RuntimeError("b"))
+    assert not logger.error("Hook", RuntimeError("c"))
+    # Other labels are limited separately
+    assert logger.error("Other", RuntimeError("d"))
+    now[0] = 1.5
+    assert logger.error("Hook", RuntimeError("e"))
+    lines = capsys.readouterr().out.splitlines()
+    assert lines == [
+        "[Engine] Hook error: a",
+        "[Engine] Other error: d",
+        "[Engine] Hook error: e (2 more since last report)",
+    ]
+    assert logger.suppressed == 2
+
+
+def test_only_isolated_steps_catch_errors(capsys):
+    calls = []
+    logger = RateLimitedLogger()
+    isolated = Pipeline(
+        [
+            (
+                "phase",
+                [
+                    Step(failing, True, "Failing"),
+                    Step(lambda: calls.append(1)),
+                ],
+            )
+        ],
+        logger,
+    )
+    isolated.run()
+    assert calls == [1]
+    assert "Failing error: boom" in capsys.readouterr().out
+    strict = Pipeline([("phase", [Step(failing)])], logger)
+    with pytest.raises(RuntimeError):
+        strict.run()
+
+
+def test_profiled_run_laps_phases_and_hooks():
+    def hook():
+        pass
+
+    prof = FrameProfiler(enabled=True)
+    pipeline = Pipeline(
+        [("first", hook_steps([hook], "First")), ("empty", [])],
+        RateLimitedLogger(),
+    )
+    pipeline.run(prof)
+    stats = prof.stats()
+    assert stats["first"]["count"] == stats["empty"]["count"] == 1
+    assert any(name.startswith("first:") for name in stats)
+
+
+class OneFrameRenderer:
+    def __init__(self, engine, frames=3):
+        self.engine = engine
+        self.frames = 0
+        self.limit = frames
+
+    def render_frame(self):
+        self.frames += 1
+
+    def flip(self):
+        pass
+
+    def tick(self, framerate):
+        if self.frames >= self.limit:
+            self.engine.running = False
+
+
+def make_engine(monkeypatch):
+    monkeypatch.setattr(
+        "raycaster.core.engine.GameMap",
+        lambda path: GameMap(data={"grid": [[0, 0], [0, 0]]}),
+    )
+    monkeypatch.setattr("raycaster.core.engine.Renderer", lambda *a: None)
+    engine = RaycastingEngine(
+        EngineConfig(map_path="dummy.json"), backend="renderer"
+    )
+    engine.renderer = OneFrameRenderer(engine)
+    return engine
+
+
+def test_engine_pipelines_rebuilt_only_on_registration(monkeypatch):
+    engine = make_engine(monkeypatch)
+    first = engine.pipelines
+    assert engine.pipelines is first
+    calls = []
+    engine.register_pre_render(lambda: calls.append("pre"))
+    rebuilt = engine.pipelines
+    assert rebuilt is not first
+    assert len(rebuilt["pre_render"]) == 1
+    engine.run()
+    assert calls == ["pre"] * 3
+    assert engine.pipelines is rebuilt
+    hook = engine.pre_render_hooks[0]
+    engine.unregister_hook(hook)
+    assert len(engine.pipelines["pre_render"]) == 0
+
+
+def test_hook_errors_stop_the_engine_unless_isolated(monkeypatch, capsys):
+    engine = make_engine(monkeypatch)
+    engine.register_post_render(failing, isolate=True)
+    engine.run()
+    assert engine.renderer.frames == 3
+    # Logged once, the repeats are rate limited
+    assert capsys.readouterr().out.count("Post-render hook error") == 1
+
+    engine = make_engine(monkeypatch)
+    engine.register_post_render(failing)
+    engine.run()
+    assert engine.renderer.frames == 1
+    assert "Engine encountered an error: boom" in capsys.readouterr().out
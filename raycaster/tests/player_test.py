@@ -23,3 +23,15 @@ def test_player_update_stub():
     assert player.x == 0.0
     assert player.y == 0.0
     assert player.angle == 0.0
+
+
+def test_player_interpolates_between_ticks():
+    player = Player((1.0, 1.0))
+    player.angle = 3.0
+    player.save_state()
+    player.x, player.y = 2.0, 3.0
+    player.angle = -3.0  # crossed the +/-pi seam
+    x, y, angle = player.interpolate(0.5)
+    assert (x, y) == (1.5, 2.0)
+    assert abs(angle - (3.0 + (2 * 3.141592653589793 - 6.0) / 2)) < 1e-9
+    assert player.interpolate(1.0)[:2] == (2.0, 3.0)
@@ -0,0 +1,123 @@
+import numpy as np
+import pygame
+import pytest
+
+from raycaster.core.config import EngineConfig
+from raycaster.core.engine import RaycastingEngine
+from raycaster.core.map import GameMap
+from raycaster.core.profiler import FrameProfiler
+from raycaster.core.renderer import Renderer
+from raycaster.ui.hud import ProfilerOverlay
+
+
+def test_ring_buffer_keeps_last_window():
+    profiler = FrameProfiler(window=4, enabled=True)
+    for ms in range(1, 11):
+        profiler.record("phase", ms / 1000.0)
+    assert np.allclose(profiler.samples("phase"), [0.007, 0.008, 0.009, 0.010])
+    stats = profiler.percentiles("phase")
+    assert stats["count"] == 10
+    assert stats["p50"] == pytest.approx(8.5)
+    assert stats["p99"] == pytest.approx(9.97)
+    assert profiler.percentiles("missing") is None
+    profiler.reset()
+    assert profiler.stats() == {}
+
+
+def test_labels_name_hooks_and_plugins():
+    profiler = FrameProfiler()
+
+    def my_hook():
+        pass
+
+    class MyPlugin:
+        def post_render(self, renderer):
+            pass
+
+    plugin = MyPlugin()
+    assert profiler.label("pre_update", my_hook).endswith(
+        ":test_labels_name_hooks_and_plugins.<locals>.my_hook"
+    )
+    assert (
+        profiler.label("plugin_post_render", plugin)
+        == "plugin_post_render:MyPlugin"
+    )
+    assert (
+        profiler.label("post_render", plugin.post_render)
+        == "post_render:MyPlugin"
+    )
+
+
+class OneFrameRenderer:
+    profiler = None
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def render_frame(self):
+        pass
+
+    def flip(self):
+        pass
+
+    def tick(self, framerate):
+        self.engine.running = False
+
+
+def make_engine(monkeypatch, profile):
+    monkeypatch.setattr(
+        "raycaster.core.engine.GameMap",
+        lambda path: GameMap(data={"grid": [[0]]}),
+    )
+    config = EngineConfig(map_path="dummy.json", profile=profile)
+    monkeypatch.setattr("raycaster.core.engine.Renderer", lambda *a: None)
+    engine = RaycastingEngine(config, backend="renderer")
+    engine.renderer = OneFrameRenderer(engine)
+    return engine
+
+
+def test_engine_records_phases_and_hooks(monkeypatch):
+    engine = make_engine(monkeypatch, profile=True)
+
+    def slow_hook():
+        pass
+
+    engine.register_post_update(slow_hook)
+    engine.run()
+    stats = engine.profiler.stats()
+    for name in ("update", "render", "flip", "tick", "frame"):
+        assert stats[name]["count"] == 1
+    assert any(name.startswith("post_update:") for name in stats)
+
+
+def test_disabled_profiler_records_nothing(monkeypatch):
+    engine = make_engine(monkeypatch, profile=False)
+    engine.register_pre_render(lambda: None)
+    engine.run()
+    assert engine.profiler.stats() == {}
+
+
+def test_renderer_times_plugins_and_overlay_draws():
+    class Player:
+        x, y, angle = 0.5, 0.5, 0.0
+
+    class Config:
+        resolution = (160, 120)
+        num_workers = 1
+
+    renderer = Renderer(
+        GameMap(data={"grid": [[0]]}), Player(), Config(), headless=True
+    )
+    renderer.profiler = FrameProfiler(enabled=True)
+    overlay = ProfilerOverlay(renderer.profiler, refresh=1)
+    renderer.register_plugin(overlay)
+    renderer.render_frame()
+    before = renderer.framebuffer.pixels.copy()
+    renderer.render_frame()
+    stats = renderer.profiler.stats()
+    assert "render.columns" in stats and "render.blit" in stats
+    assert "plugin_post_render:ProfilerOverlay" in stats
+    screen = pygame.surfarray.array3d(renderer.screen)
+    # Overlay text was drawn over the frame
+    assert (screen != before).any()
+    renderer.cleanup()
@@ -0,0 +1,106 @@
+import math
+
+import numpy as np
+
+from raycaster.core.raycast import (
+    camera_rays,
+    camera_table,
+    cast_ray,
+    cast_rays,
+    rotate_rays,
+)
+
+GRID = np.array(
+    [
+        [1, 1, 1, 1, 1, 1],
+        [1, 0, 0, 0, 0, 1],
+        [1, 0, 2, 0, 0, 1],
+        [1, 0, 0, 0, 0, 1],
+        [1, 1, 1, 1, 1, 1],
+    ]
+)
+
+
+def test_cast_rays_straight_walls():
+    # East, south, west, north from the middle of cell (1, 1)
+    ray_dx = np.array([1.0, 0.0, -1.0, 0.0])
+    ray_dy = np.array([0.0, 1.0, 0.0, -1.0])
+    hits = cast_rays(GRID, 1.5, 1.5, ray_dx, ray_dy)
+    assert np.allclose(hits.distance, [3.5, 2.5, 0.5, 0.5])
+    assert list(hits.wall) == [1, 1, 1, 1]
+    assert list(hits.side) == [0, 1, 0, 1]
+    assert list(hits.map_x) == [5, 1, 0, 1]
+    assert list(hits.map_y) == [1, 4, 1, 0]
+    assert np.allclose(hits.tex_u, 0.5)
+
+
+def test_cast_rays_reports_wall_id():
+    hits = cast_rays(GRID, 1.5, 2.5, np.array([1.0]), np.array([0.0]))
+    assert hits.wall[0] == 2
+    assert math.isclose(hits.distance[0], 0.5)
+
+
+def test_cast_rays_out_of_bounds_is_boundary():
+    grid = np.zeros((3, 3), dtype=np.int32)
+    hits = cast_rays(grid, 1.5, 1.5, np.array([1.0]), np.array([0.0]))
+    assert hits.wall[0] == -1
+    assert math.isclose(hits.distance[0], 1.5)
+
+
+def test_vectorized_matches_scalar_reference():
+    ray_dx, ray_dy = camera_rays(64, 60.0, 0.7)
+    hits = cast_rays(GRID, 1.3, 3.2, ray_dx, ray_dy)
+    rows = GRID.tolist()
+    for i in range(64):
+        dist, wall, side, tex_u, map_x, map_y = cast_ray(
+            rows, 1.3, 3.2, ray_dx[i], ray_dy[i]
+        )
+        assert math.isclose(hits.distance[i], dist)
+        assert (hits.wall[i], hits.side[i]) == (wall, side)
+        assert (hits.map_x[i], hits.map_y[i]) == (map_x, map_y)
+        assert math.isclose(hits.tex_u[i], tex_u, abs_tol=1e-9)
+
+
+def test_camera_rays_center_column_looks_forward():
+    ray_dx, ray_dy = camera_rays(4, 90.0, 0.0)
+    assert np.allclose(ray_dx, 1.0)
+    assert np.allclose(ray_dy, [-1.0, -0.5, 0.0, 0.5])
+
+
+def test_camera_table_rotation_matches_camera_rays():
+    table = camera_table(97, 75.0)
+    for angle in (0.0, 1.1, -2.7):
+        expected = camera_rays(97, 75.0, angle, 10, 50)
+        rays = rotate_rays(table, angle, 10, 50)
+        assert np.allclose(rays, expected)
+    # The correction factor is the cosine of each ray's off-axis angle
+    dx, dy = camera_rays(97, 75.0, 0.0)
+    assert np.allclose(table.correction, dx / np.hypot(dx, dy))
+    assert not table.offset.flags.writeable
+
+
+def test_vectorized_matches_scalar_on_open_grids():
+    # Unwalled grids (rays leave them), axis-aligned rays, max_distance
+    rng = np.random.default_rng(3)
+    for _ in range(20):
+        grid = (rng.random((rng.integers(3, 20), 17)) < 0.15).astype(int)
+        pos_x = rng.uniform(0, grid.shape[1])
+        pos_y = rng.uniform(0, grid.shape[0])
+        ray_dx, ray_dy = camera_rays(48, 90.0, rng.uniform(0, 2 * math.pi))
+        ray_dx[::12] = 0.0
+        limit = rng.choice([None, 4.0])
+        hits = cast_rays(grid, pos_x, pos_y, ray_dx, ray_dy, limit)
+        rows = grid.tolist()
+        for i in range(48):
+            expected = cast_ray(
+                rows, pos_x, pos_y, ray_dx[i], ray_dy[i], limit
+            )
+            dist, wall, side, tex_u, map_x, map_y = expected
+            assert math.isclose(hits.distance[i], dist)
+            assert hits.wall[i] == wall
+            if math.isfinite(dist):
+                assert (hits.side[i], hits.map_x[i], hits.map_y[i]) == (
+                    side,
+                    map_x,
+                    map_y,
+                )
@@ -1,12 +1,15 @@
-from raycaster.core.renderer import Renderer
+import pygame
 
+from raycaster.core.map import GameMap
+from raycaster.core.renderer import Renderer, column_chunks
 
-class DummyMap:
-    pass
+
+def DummyMap():
+    return GameMap(data={"grid": [[0, 0], [0, 0]]})
 
 
 class DummyPlayer:
-    pass
+    x, y, angle = 1.5, 1.5, 0.0
 
 
 class DummyConfig:
@@ -33,14 +36,18 @@ class DummyPlugin:
 
 
 def test_renderer_init_headless():
-    renderer = Renderer(DummyMap(), DummyPlayer(), DummyConfig(), headless=True)
+    renderer = Renderer(
+        DummyMap(), DummyPlayer(), DummyConfig(), headless=True
+    )
     assert renderer.screen.get_width() == 32
     assert renderer.screen.get_height() == 32
     assert isinstance(renderer.plugins, list)
 
 
 def test_plugin_hooks(monkeypatch):
-    renderer = Renderer(DummyMap(), DummyPlayer(), DummyConfig(), headless=True)
+    renderer = Renderer(
+        DummyMap(), DummyPlayer(), DummyConfig(), headless=True
+    )
     plugin = DummyPlugin()
     renderer.register_plugin(plugin)
 
@@ -53,7 +60,9 @@ def test_plugin_hooks(monkeypatch):
 
 
 def test_plugin_post_render(monkeypatch):
-    renderer = Renderer(DummyMap(), DummyPlayer(), DummyConfig(), headless=True)
+    renderer = Renderer(
+        DummyMap(), DummyPlayer(), DummyConfig(), headless=True
+    )
     plugin = DummyPlugin()
     # Only implement post_render for this test
     plugin.render_override = lambda renderer: False
@@ -62,3 +71,203 @@ def test_plugin_post_render(monkeypatch):
     renderer.render_frame()
     assert plugin.pre_render_called
     assert plugin.post_render_called
+
+
+def test_column_chunks_cover_screen():
+    chunks = column_chunks(70, 32)
+    assert chunks == [(0, 32), (32, 64), (64, 70)]
+
+
+def test_single_worker_renders_in_process():
+    renderer = Renderer(
+        DummyMap(), DummyPlayer(), DummyConfig(), headless=True
+    )
+    assert renderer._executor is None
+    renderer.render_frame()
+    renderer.cleanup()
+
+
+def test_worker_pool_reused_and_shut_down():
+    class PoolConfig(DummyConfig):
+        num_workers = 2
+        chunk_size = 8
+
+    reference = Renderer(
+        DummyMap(), DummyPlayer(), DummyConfig(), headless=True
+    )
+    reference.render_frame()
+    expected = reference.framebuffer.pixels.copy()
+    reference.cleanup()
+
+    renderer = Renderer(DummyMap(), DummyPlayer(), PoolConfig(), headless=True)
+    executor = renderer._executor
+    assert executor is not None
+    renderer.render_frame()
+    renderer.render_frame()
+    assert renderer._executor is executor
+    # Workers wrote every strip into the shared framebuffer
+    assert (renderer.framebuffer.pixels == expected).all()
+    assert (pygame.surfarray.array3d(renderer.screen) == expected).all()
+    renderer.cleanup()
+    assert renderer._executor is None
+
+
+def test_raycast_engines_draw_same_frame():
+    frames = []
+    for engine in ("backend", "numpy", "python"):
+
+        class EngineConfig(DummyConfig):
+            raycast_engine = engine
+
+        renderer = Renderer(
+            DummyMap(), DummyPlayer(), EngineConfig(), headless=True
+        )
+        renderer.render_frame()
+        frames.append(pygame.surfarray.array3d(renderer.screen))
+        renderer.cleanup()
+    assert all((frame == frames[0]).all() for frame in frames)
+
+
+def test_textures_are_opt_in():
+    renderer = Renderer(
+        DummyMap(), DummyPlayer(), DummyConfig(), headless=True
+    )
+    assert renderer.textures is None and renderer.floors is None
+    renderer.cleanup()
+
+    frames = []
+    for engine in ("backend", "numpy"):
+
+        class TexturedConfig(DummyConfig):
+            textured = True
+            raycast_engine = engine
+
+        renderer = Renderer(
+            DummyMap(), DummyPlayer(), TexturedConfig(), headless=True
+        )
+        assert renderer.floors is not None
+        renderer.render_frame()
+        frames.append(pygame.surfarray.array3d(renderer.screen))
+        renderer.cleanup()
+    assert (frames[0] == frames[1]).all()
+
+
+def test_wall_and_floor_textures_switch_separately():
+    class WallsConfig(DummyConfig):
+        textured_walls = True
+
+    class FloorsConfig(DummyConfig):
+        textured = True
+        textured_walls = False
+
+    # A long corridor: walls at the far end, floor and ceiling in front
+    game_map = GameMap(data={"grid": [[1] * 9, [0] * 8 + [1], [1] * 9]})
+    frames = []
+    for config in (DummyConfig(), WallsConfig(), FloorsConfig()):
+        renderer = Renderer(game_map, DummyPlayer(), config, headless=True)
+        renderer.render_frame()
+        frames.append(pygame.surfarray.array3d(renderer.screen))
+        textured = (renderer.textures is not None, renderer.floors is not None)
+        renderer.cleanup()
+        if isinstance(config, WallsConfig):
+            assert textured == (True, False)
+        elif isinstance(config, FloorsConfig):
+            assert textured == (False, True)
+    flat, walls, floors = frames
+    # The middle column's bottom row is floor: textured only with floors
+    assert (walls != flat).any()
+    assert (walls[16, -1] == flat[16, -1]).all()
+    assert (floors[16, -1] != flat[16, -1]).any()
+
+
+def test_camera_table_is_cached_until_config_changes():
+    config = DummyConfig()
+    renderer = Renderer(DummyMap(), DummyPlayer(), config, headless=True)
+    try:
+        table = renderer.camera_table()
+        renderer.render_frame()
+        assert renderer.camera_table() is table
+        config.fov = 90.0
+        wider = renderer.camera_table()
+        assert wider is not table
+        assert wider.offset[0] < table.offset[0]
+    finally:
+        renderer.cleanup()
+
+
+def test_needs_redraw_only_after_changes():
+    player = DummyPlayer()
+    renderer = Renderer(DummyMap(), player, DummyConfig(), headless=True)
+    try:
+        assert renderer.needs_redraw()
+        renderer.render_frame()
+        assert not renderer.needs_redraw()
+        player.angle = 0.5
+        assert renderer.needs_redraw()
+        renderer.render_frame()
+        assert not renderer.needs_redraw()
+        renderer.invalidate()
+        assert renderer.needs_redraw()
+        renderer.render_frame()
+
+        class Animated:
+            frames = 0
+
+            def needs_redraw(self, renderer):
+                return self.frames < 2
+
+            def post_render(self, renderer):
+                self.frames += 1
+
+        plugin = Animated()
+        renderer.register_plugin(plugin)
+        while renderer.needs_redraw():
+            renderer.render_frame()
+        assert plugin.frames == 2
+    finally:
+        renderer.cleanup()
+
+
+def test_world_changes_need_redraw():
+    from raycaster.ecs.components import Position, Velocity
+    from raycaster.ecs.ecs import World
+    from raycaster.ecs.systems import MovementSystem
+
+    renderer = Renderer(
+        DummyMap(), DummyPlayer(), DummyConfig(), headless=True
+    )
+    renderer.world = world = World(1)
+    try:
+        entity = world.spawn(Position(1.0, 1.0))
+        renderer.render_frame()
+        assert not renderer.needs_redraw()
+        entity.get(Position).x = 1.25
+        assert renderer.needs_redraw()
+        renderer.render_frame()
+        # A registered MovementSystem with nothing moving changes nothing
+        world.add_system(MovementSystem())
+        entity.add(Velocity(0.0, 0.0))
+        renderer.render_frame()
+        world.update()
+        assert not renderer.needs_redraw()
+        entity.get(Velocity).dy = 0.1
+        world.update()
+        assert renderer.needs_redraw()
+    finally:
+        renderer.cleanup()
+        world.close()
+
+
+def test_pygame_renderer_needs_redraw():
+    from raycaster.core.pygame_backend import PygameRenderer
+
+    player = DummyPlayer()
+    renderer = PygameRenderer(DummyMap(), player, DummyConfig(), headless=True)
+    assert renderer.needs_redraw()
+    renderer.render_frame()
+    assert not renderer.needs_redraw()
+    player.angle = 0.5
+    assert renderer.needs_redraw()
+    renderer.render_frame()
+    renderer.invalidate()
+    assert renderer.needs_redraw()
@@ -0,0 +1,129 @@
+import math
+
+import numpy as np
+
+from raycaster.core.map import GameMap
+from raycaster.core.raycast import camera_table, cast_rays, rotate_rays
+from raycaster.core.renderer import (
+    FrameParams,
+    Renderer,
+    load_hits,
+    trace_columns,
+)
+from raycaster.core.reproject import reproject_hits
+
+
+def pillared_grid():
+    grid = np.ones((20, 20), dtype=np.int32)
+    grid[1:-1, 1:-1] = 0
+    rng = np.random.default_rng(3)
+    for _ in range(12):
+        grid[rng.integers(2, 18), rng.integers(2, 18)] = rng.integers(2, 8)
+    grid[9:12, 9:12] = 0
+    return grid
+
+
+def trace(grid, table, pose):
+    ray_dx, ray_dy = rotate_rays(table, pose[2])
+    return cast_rays(grid, pose[0], pose[1], ray_dx, ray_dy)
+
+
+def test_reprojected_hits_match_a_full_trace():
+    grid = pillared_grid()
+    table = camera_table(240, 60.0)
+    pose = (10.5, 10.5, 0.0)
+    previous = trace(grid, table, pose)
+    retraced = 0
+    for frame in range(120):
+        # Turn and strafe a little every frame
+        new = (
+            10.5 + 0.4 * math.sin(frame * 0.05),
+            10.5 + 0.3 * math.cos(frame * 0.07),
+            frame * 0.015,
+        )
+        hits, retrace = reproject_hits(previous, pose, new, table, grid)
+        full = trace(grid, table, new)
+        kept = ~retrace
+        assert np.allclose(hits.distance[kept], full.distance[kept])
+        for field in ("wall", "side", "map_x", "map_y"):
+            expected = getattr(full, field)[kept]
+            assert (getattr(hits, field)[kept] == expected).all()
+        assert np.allclose(hits.tex_u[kept], full.tex_u[kept])
+        retraced += retrace.sum()
+        previous, pose = full, new
+    # Most columns are reused
+    assert retraced < 120 * 240 // 3
+
+
+def test_still_camera_reuses_almost_everything():
+    grid = pillared_grid()
+    table = camera_table(240, 60.0)
+    pose = (10.5, 10.5, 1.0)
+    hits, retrace = reproject_hits(
+        trace(grid, table, pose), pose, pose, table, grid
+    )
+    assert retrace.sum() < 40
+
+
+class Player:
+    x, y, angle = 10.5, 10.5, 0.0
+
+
+class Config:
+    resolution = (96, 48)
+    map_path = "dummy.json"
+    num_workers = 1
+    reproject = True
+    reproject_interval = 4
+
+
+def test_renderer_reprojects_between_full_traces():
+    player = Player()
+    game_map = GameMap(data={"grid": pillared_grid().tolist()})
+    renderer = Renderer(game_map, player, Config(), headless=True)
+    try:
+        traced = []
+        for _ in range(8):
+            player.angle += 0.01
+            renderer.render_frame()
+            traced.append(renderer.rays_traced)
+            hits = load_hits(renderer.hits.array, 0, 96)
+            params = FrameParams(
+                96, 60.0, renderer.render_pose(), "numpy", None, None
+            )
+            full = trace_columns(renderer._state, 0, 96, params)
+            assert np.allclose(hits.distance, full.distance)
+            assert (hits.wall == full.wall).all()
+        # Every fourth frame is traced in full, the others mostly reused
+        assert traced[0] == traced[4] == 96
+        assert max(traced[1:4] + traced[5:]) < 48
+    finally:
+        renderer.cleanup()
+
+
+def test_fast_moves_get_a_full_trace():
+    player = Player()
+    player.x = 3.5
+    game_map = GameMap(data={"grid": pillared_grid().tolist()})
+    renderer = Renderer(game_map, player, Config(), headless=True)
+    try:
+        for speed in (0.05, 0.2):
+            traced = []
+            for _ in range(3):
+                player.x += speed
+                renderer.render_frame()
+                traced.append(renderer.rays_traced)
+                hits = load_hits(renderer.hits.array, 0, 96)
+                params = FrameParams(
+                    96, 60.0, renderer.render_pose(), "numpy", None, None
+                )
+                full = trace_columns(renderer._state, 0, 96, params)
+                assert np.allclose(hits.distance, full.distance)
+                assert (hits.wall == full.wall).all()
+            if speed < renderer.reproject_max_move:
+                assert min(traced) < 96
+            else:
+                # 0.2 cells a frame: past reproject_max_move every time
+                assert traced == [96, 96, 96]
+    finally:
+        renderer.cleanup()
@@ -0,0 +1,99 @@
+import pygame
+import pytest
+
+from raycaster.core.config import EngineConfig
+from raycaster.core.map import GameMap
+from raycaster.core.renderer import Renderer
+from raycaster.core.resolution import ResolutionScaler
+from raycaster.ecs.components import Position, Renderable
+from raycaster.ecs.ecs import World
+
+
+def test_scaler_backs_off_and_recovers():
+    scaler = ResolutionScaler(0.010, min_scale=0.25, max_scale=1.0, cooldown=3)
+    assert scaler.scale == 1.0
+    # Four times over budget: a quarter of the pixels, i.e. half scale
+    for _ in range(3):
+        scaler.update(0.040)
+    assert scaler.scale == 0.5
+    assert scaler.size((640, 480)) == (320, 240)
+    # No change during the cooldown, whatever the samples say
+    scaler.update(0.001)
+    assert scaler.scale == 0.5
+    for _ in range(3):
+        scaler.update(0.0025)
+    assert scaler.scale == 1.0
+    # Clamped to the configured range
+    for _ in range(10):
+        scaler.update(1.0)
+    assert scaler.scale == 0.25
+
+
+def test_scaler_holds_near_target():
+    scaler = ResolutionScaler(0.016, cooldown=1)
+    for _ in range(20):
+        scaler.update(0.0161)
+    assert scaler.scale == 1.0
+
+
+def test_config_validates_scaling_options():
+    config = EngineConfig(target_frame_time=1 / 60, min_scale=0.4)
+    assert config.target_frame_time == 1 / 60 and config.max_scale == 1.0
+    with pytest.raises(ValueError):
+        EngineConfig(target_frame_time=0)
+    with pytest.raises(ValueError):
+        EngineConfig(min_scale=0.8, max_scale=0.5)
+
+
+def test_renderer_scales_internal_buffer_to_screen():
+    class Config:
+        resolution = (64, 48)
+        num_workers = 1
+        target_frame_time = 1e-9  # unreachable: drop to min_scale
+        min_scale = 0.5
+        max_scale = 1.0
+
+    class Player:
+        x, y, angle = 2.5, 2.5, 0.4
+
+    game_map = GameMap(data={"grid": [[0, 0, 0, 0, 2]] * 5})
+    renderer = Renderer(game_map, Player(), Config(), headless=True)
+    try:
+        assert renderer.framebuffer.pixels.shape[:2] == (64, 48)
+        for _ in range(40):
+            renderer.render_frame()
+        assert renderer.render_size == (32, 24)
+        assert renderer.camera_table().offset.shape == (32,)
+        # The half-size frame was scaled up to fill the whole screen
+        screen = pygame.surfarray.array3d(renderer.screen)
+        frame = renderer.framebuffer.pixels[:32, :24]
+        assert (screen[::2, ::2] == frame).all()
+    finally:
+        renderer.cleanup()
+
+
+def test_sprites_survive_scaling():
+    class Config:
+        resolution = (160, 120)
+        num_workers = 1
+        target_frame_time = 1e-9
+        min_scale = 0.5
+        max_scale = 1.0
+
+    class Player:
+        x, y, angle = 1.5, 1.5, 0.0
+
+    game_map = GameMap(data={"grid": [[0] * 8] * 3})
+    renderer = Renderer(game_map, Player(), Config(), headless=True)
+    world = World()
+    world.spawn(Position(4.5, 1.5), Renderable((255, 0, 255), 0.5))
+    renderer.world = world
+    try:
+        for _ in range(40):
+            renderer.render_frame()
+        assert renderer.render_size == (80, 60)
+        renderer.render_frame()
+        frame = renderer.framebuffer.pixels[:80, :60]
+        assert (frame == (255, 0, 255)).all(axis=2).sum() > 0
+    finally:
+        renderer.cleanup()
@@ -0,0 +1,96 @@
+import threading
+
+import numpy as np
+
+from raycaster.ecs.components import Health, Position, Velocity
+from raycaster.ecs.ecs import System, World
+from raycaster.ecs.scheduler import build_stages
+from raycaster.ecs.systems import MovementSystem
+
+
+class Damping(System):
+    reads = ()
+    writes = (Velocity,)
+
+    def update(self, world):
+        for arch in world.query(Velocity).chunks():
+            arch.column(Velocity, "dx")[:] *= 0.5
+
+
+class Regen(System):
+    reads = ()
+    writes = (Health,)
+
+    def update(self, world):
+        for arch in world.query(Health).chunks():
+            arch.column(Health, "hp")[:] += 1
+
+
+class Legacy(System):
+    def update(self, world):
+        pass
+
+
+def test_stages_follow_declared_conflicts():
+    movement, damping, regen, legacy = (
+        MovementSystem(),
+        Damping(),
+        Regen(),
+        Legacy(),
+    )
+    stages = build_stages([movement, damping, regen, legacy])
+    # Damping writes what Movement reads; Regen is independent; an
+    # undeclared system runs alone after everything before it.
+    assert stages == [[movement, regen], [damping], [legacy]]
+
+
+def make_world(max_workers):
+    world = World(max_workers=max_workers)
+    rng = np.random.default_rng(0)
+    for x, dx in zip(rng.random(500), rng.random(500)):
+        world.spawn(Position(x, 0), Velocity(dx, 1), Health(10))
+    for system in (MovementSystem(), Damping(), Regen()):
+        world.add_system(system)
+    return world
+
+
+def snapshot(world):
+    arch = next(world.query(Position, Velocity, Health).chunks())
+    return [
+        arch.column(t, f).copy()
+        for t, f in ((Position, "x"), (Velocity, "dx"), (Health, "hp"))
+    ]
+
+
+def test_parallel_matches_serial_and_records_timings():
+    serial, parallel = make_world(1), make_world(4)
+    for _ in range(5):
+        serial.update()
+        parallel.update()
+    for a, b in zip(snapshot(serial), snapshot(parallel)):
+        assert (a == b).all()
+    assert set(parallel.timings) == {"MovementSystem", "Damping", "Regen"}
+    assert all(t >= 0 for t in parallel.timings.values())
+    parallel.close()
+
+
+def test_independent_systems_run_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+
+    class A(System):
+        reads, writes = (), (Position,)
+
+        def update(self, world):
+            barrier.wait()  # would time out if run one after the other
+
+    class B(System):
+        reads, writes = (), (Health,)
+
+        def update(self, world):
+            barrier.wait()
+
+    world = World(max_workers=2)
+    world.add_system(A())
+    world.add_system(B())
+    world.update()
+    world.close()
@@ -0,0 +1,113 @@
+import math
+
+import numpy as np
+import pytest
+
+from raycaster.core.map import GameMap
+from raycaster.ecs.components import Position, Velocity
+from raycaster.ecs.ecs import System, World
+from raycaster.ecs.scheduler import build_stages
+from raycaster.ecs.spatial import (
+    SpatialHash,
+    SpatialIndexSystem,
+    cell_key,
+    key_cell,
+)
+from raycaster.ecs.systems import MovementSystem
+
+
+def brute_radius(world, x, y, radius):
+    return {
+        e.id
+        for e in world.query(Position)
+        if math.hypot(e.get(Position).x - x, e.get(Position).y - y) <= radius
+    }
+
+
+def test_cell_keys_round_trip_negative_cells():
+    for cell in [(0, 0), (3, -1), (-7, 12), (-1, -1)]:
+        assert key_cell(cell_key(*cell)) == cell
+
+
+def test_radius_and_aabb_queries_match_brute_force():
+    rng = np.random.default_rng(1)
+    world = World()
+    xs, ys = rng.uniform(-5, 20, 500), rng.uniform(-5, 20, 500)
+    world.spawn_many(500, Position(xs, ys))
+    index = SpatialHash()
+    index.update(world)
+    assert len(index) == 500
+    found = index.query_radius(4.2, 7.7, 3.1)
+    assert set(found.tolist()) == brute_radius(world, 4.2, 7.7, 3.1)
+    dists = [
+        math.hypot(xs[i & 0xFFFFFFFF] - 4.2, ys[i & 0xFFFFFFFF] - 7.7)
+        for i in found.tolist()
+    ]
+    assert dists == sorted(dists)
+    box = index.query_aabb(-2.5, 1, 3, 9.5)
+    expected = {
+        e.id
+        for e in world.query(Position)
+        if -2.5 <= e.get(Position).x <= 3 and 1 <= e.get(Position).y <= 9.5
+    }
+    assert set(box.tolist()) == expected
+
+
+def test_update_rebuckets_only_moved_and_removed_entities():
+    world = World()
+    ids = world.spawn_many(100, Position(np.arange(100) + 0.5, 0.5))
+    mover = world.spawn(Position(0.5, 0.5), Velocity(1.0, 0.0))
+    index = SpatialHash()
+    world.add_system(MovementSystem())
+    world.add_system(SpatialIndexSystem(index))
+    world.update()
+    assert index.moved == 101
+    world.update()
+    assert index.moved == 1
+    assert mover.id in index.cell(2, 0).tolist()
+    assert mover.id not in index.cell(1, 0).tolist()
+    world.despawn_many(ids[:10])
+    world.update()
+    assert index.moved == 11 and len(index) == 91
+    assert index.cell(5, 0).tolist() == []
+
+
+def test_ray_traversal_orders_hits_and_stops_at_walls():
+    game_map = GameMap(data={"grid": [[0, 0, 0, 1, 0]]})
+    world = World()
+    near = world.spawn(Position(1.5, 0.5))
+    far = world.spawn(Position(2.2, 0.5))
+    world.spawn(Position(4.5, 0.5))  # behind the wall
+    world.spawn(Position(1.5, 3.5))  # off the ray
+    index = SpatialHash()
+    index.update(world)
+    hits = index.query_ray(0.5, 0.5, 0.0, 10.0)
+    assert hits.tolist()[:2] == [near.id, far.id] and len(hits) == 3
+    blocked = index.query_ray(0.5, 0.5, 0.0, 10.0, game_map=game_map)
+    assert blocked.tolist() == [near.id, far.id]
+    assert index.query_ray(0.5, 0.5, 0.0, 1.2).tolist() == [near.id]
+    with pytest.raises(ValueError):
+        SpatialHash(2).query_ray(0, 0, 0, 1, game_map=game_map)
+
+
+def test_ray_skips_entities_behind_or_past_max_distance():
+    world = World()
+    behind = world.spawn(Position(0.2, 0.5))  # same cell, behind origin
+    near = world.spawn(Position(1.5, 0.5))
+    world.spawn(Position(2.9, 0.5))  # in the last bucket, past the end
+    index = SpatialHash()
+    index.update(world)
+    assert behind.id not in index.query_ray(0.6, 0.5, 0.0, 10.0).tolist()
+    assert index.query_ray(0.6, 0.5, 0.0, 2.0).tolist() == [near.id]
+
+
+def test_index_rebuild_gets_its_own_stage():
+    class Seeker(System):
+        reads = (Position, SpatialHash)
+
+        def update(self, world):
+            pass
+
+    system = SpatialIndexSystem()
+    stages = build_stages([system, Seeker()])
+    assert len(stages) == 2 and stages[0] == [system]
@@ -0,0 +1,114 @@
+import math
+
+import numpy as np
+
+from raycaster.core.map import GameMap
+from raycaster.core.renderer import Renderer
+from raycaster.core.sprites import (
+    SpriteBatch,
+    collect_sprites,
+    draw_sprites,
+    project_sprites,
+)
+from raycaster.ecs.components import Position, Renderable
+from raycaster.ecs.ecs import World
+
+
+def batch(xs, ys, size=1.0):
+    n = len(xs)
+    colors = np.arange(n * 3, dtype=np.uint8).reshape(n, 3) + 1
+    return SpriteBatch(
+        np.asarray(xs, dtype=np.float64),
+        np.asarray(ys, dtype=np.float64),
+        np.full(n, size),
+        colors,
+    )
+
+
+def test_projection_culls_and_sorts_by_depth():
+    # Camera at the origin looking along +x
+    sprites = batch([5.0, 2.0, -3.0, 4.0], [0.0, 0.0, 0.0, 40.0])
+    projected = project_sprites(sprites, (0.0, 0.0, 0.0), 64, 48, 90.0)
+    # Behind the camera and far off to the side are culled
+    assert projected.sprite.tolist() == [1, 0]
+    assert projected.depth.tolist() == [2.0, 5.0]
+    # Centered sprites straddle the middle column; size 1 at distance 2
+    # spans half the screen height and stands on the wall's floor line
+    assert projected.x0[0] < 32 < projected.x1[0]
+    assert projected.y1[0] - projected.y0[0] == 24
+    assert projected.y1[0] == (48 + 48 // 2) // 2
+
+
+def test_projection_follows_camera_angle():
+    sprites = batch([0.0], [3.0])
+    ahead = project_sprites(sprites, (0.0, 0.0, math.pi / 2), 64, 48, 60.0)
+    assert ahead.depth.tolist() == [3.0]
+    behind = project_sprites(sprites, (0.0, 0.0, -math.pi / 2), 64, 48, 60.0)
+    assert len(behind.sprite) == 0
+
+
+def test_draw_respects_zbuffer_and_nearest_sprite():
+    sprites = batch([2.0, 4.0], [0.0, -1.5])
+    projected = project_sprites(sprites, (0.0, 0.0, 0.0), 64, 48, 90.0)
+    pixels = np.zeros((64, 48, 3), dtype=np.uint8)
+    zbuffer = np.full(64, np.inf)
+    # A wall at distance 3 hides everything right of the center
+    zbuffer[32:] = 3.0
+    written = draw_sprites(pixels, zbuffer, projected, sprites.color)
+    assert written > 0
+    near, far = sprites.color.tolist()
+    assert pixels[31, 30].tolist() == near
+    assert pixels[38, 30].tolist() == near  # nearer than the wall
+    # The far sprite only shows where the near one doesn't cover it
+    painted = {tuple(c) for c in pixels.reshape(-1, 3).tolist()}
+    assert tuple(far) in painted
+    zbuffer[:] = 1.0
+    pixels[:] = 0
+    assert draw_sprites(pixels, zbuffer, projected, sprites.color) == 0
+    assert not pixels.any()
+
+
+def test_thousands_of_sprites_batch():
+    rng = np.random.default_rng(3)
+    world = World()
+    n = 5000
+    world.spawn_many(
+        n,
+        Position(rng.uniform(1, 50, n), rng.uniform(-20, 20, n)),
+        Renderable((rng.integers(1, 255, n), 0, 0), 0.3),
+    )
+    sprites = collect_sprites(world)
+    assert len(sprites.x) == n and sprites.color.shape == (n, 3)
+    projected = project_sprites(sprites, (0.0, 0.0, 0.0), 320, 200, 60.0)
+    assert 0 < len(projected.sprite) < n
+    assert (np.diff(projected.depth) >= 0).all()
+    pixels = np.zeros((320, 200, 3), dtype=np.uint8)
+    draw_sprites(pixels, np.full(320, np.inf), projected, sprites.color)
+    assert pixels[..., 0].any() and not pixels[..., 1].any()
+
+
+def test_renderer_draws_world_sprites_over_walls():
+    class Config:
+        resolution = (64, 48)
+        map_path = "dummy.json"
+        num_workers = 1
+        fov = 60.0
+
+    class Player:
+        x, y, angle = 1.5, 1.5, 0.0
+
+    game_map = GameMap(data={"grid": [[0] * 8] * 3})
+    renderer = Renderer(game_map, Player(), Config(), headless=True)
+    try:
+        renderer.render_frame()
+        walls = renderer.framebuffer.pixels.copy()
+        assert renderer.depth.array[32] > 5
+        world = World()
+        world.spawn(Position(4.5, 1.5), Renderable((255, 0, 255), 0.5))
+        renderer.world = world
+        renderer.render_frame()
+        pixels = renderer.framebuffer.pixels
+        assert pixels[32, 30].tolist() == [255, 0, 255]
+        assert (pixels[:10] == walls[:10]).all()
+    finally:
+        renderer.cleanup()
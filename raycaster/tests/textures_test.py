@@ -0,0 +1,108 @@
+import numpy as np
+import pygame
+import pytest
+
+from raycaster.backend import api
+from raycaster.core.renderer import WALL_COLORS
+from raycaster.core.textures import (
+    TextureAtlas,
+    build_mips,
+    load_textures,
+)
+
+
+def test_mip_chain_box_filters_down_to_one_texel():
+    texture = np.zeros((4, 4, 3), dtype=np.uint8)
+    texture[:2] = 200
+    levels = build_mips(texture)
+    assert [level.shape[0] for level in levels] == [4, 2, 1]
+    assert levels[1][:, :, 0].tolist() == [[200, 200], [0, 0]]
+    assert levels[2][0, 0].tolist() == [100, 100, 100]
+
+
+def test_atlas_packs_levels_column_major():
+    rng = np.random.default_rng(0)
+    textures = [rng.integers(0, 256, (8, 8, 3), dtype=np.uint8) for _ in "ab"]
+    atlas = TextureAtlas(textures)
+    assert atlas.levels == 4 and atlas.level_sizes.tolist() == [8, 4, 2, 1]
+    assert len(atlas.texels) == 2 * (64 + 16 + 4 + 1)
+    # Texel (u, v) of texture t at offset + (t * size + u) * size + v
+    assert (atlas.texels[(1 * 8 + 3) * 8 + 5] == textures[1][3, 5]).all()
+    assert (atlas.level(0)[0] == textures[0]).all()
+    with pytest.raises(ValueError):
+        TextureAtlas([np.zeros((6, 6, 3), dtype=np.uint8)])
+
+
+def test_load_textures_from_directory_or_procedural(tmp_path):
+    atlas = load_textures(str(tmp_path), WALL_COLORS, size=16)
+    assert atlas.count == len(WALL_COLORS) - 1 and atlas.size == 16
+    for name, color in [("b.png", (0, 0, 255)), ("a.png", (255, 0, 0))]:
+        surface = pygame.Surface((16, 16))
+        surface.fill(color)
+        pygame.image.save(surface, str(tmp_path / name))
+    atlas = load_textures(str(tmp_path), WALL_COLORS, size=16)
+    assert atlas.count == 2 and atlas.size == 16
+    # Sorted by name: a.png is wall id 1
+    assert atlas.level(0)[0, 3, 3].tolist() == [255, 0, 0]
+    assert atlas.level(0)[1, 3, 3].tolist() == [0, 0, 255]
+
+
+def draw(impl, atlas, distance, tex_u, height=16):
+    frame = np.zeros((len(distance), height, 3), dtype=np.uint8)
+    impl.fill_textured_columns(
+        frame,
+        0,
+        np.asarray(distance, dtype=np.float64),
+        np.zeros(len(distance), dtype=np.int8),
+        np.ones(len(distance), dtype=np.int32),
+        np.asarray(tex_u, dtype=np.float64),
+        atlas.texels,
+        atlas.level_offsets,
+        atlas.level_sizes,
+        atlas.count,
+    )
+    return frame
+
+
+def test_textured_columns_sample_u_v_and_mip_level():
+    # Texture: red in the top half (v < 4), u encoded in green
+    texture = np.zeros((8, 8, 3), dtype=np.uint8)
+    texture[:, :4, 0] = 255
+    texture[:, :, 1] = (np.arange(8) * 30)[:, None]
+    atlas = TextureAtlas([texture])
+    frame = draw(api, atlas, [1.0, 1.0, 16.0], [0.0, 0.99, 0.5])
+    assert (frame[0, :8, 0] == 255).all() and (frame[0, 8:, 0] == 0).all()
+    assert frame[0, 0, 1] == 0 and frame[1, 0, 1] == 210
+    # One row tall at distance 16: the 1x1 level, the texture's average
+    assert frame[2, 7].tolist() == atlas.level(3)[0, 0, 0].tolist()
+    assert (frame[2, :7] == 0).all()
+
+
+def test_compiled_textured_columns_match_reference():
+    from raycaster import backend
+
+    if backend.BACKEND != "cython":
+        pytest.skip("extension not built")
+    atlas = TextureAtlas.procedural(WALL_COLORS, 32)
+    rng = np.random.default_rng(2)
+    distance = np.concatenate([rng.uniform(0.2, 40, 200), [np.inf]])
+    tex_u = rng.uniform(0, 1, 201)
+    side = (rng.uniform(size=201) > 0.5).astype(np.int8)
+    wall = rng.integers(-1, 9, 201).astype(np.int32)
+    frames = []
+    for impl in (api, backend):
+        frame = np.zeros((201, 120, 3), dtype=np.uint8)
+        impl.fill_textured_columns(
+            frame,
+            0,
+            distance,
+            side,
+            wall,
+            tex_u,
+            atlas.texels,
+            atlas.level_offsets,
+            atlas.level_sizes,
+            atlas.count,
+        )
+        frames.append(frame)
+    assert (frames[0] == frames[1]).all()
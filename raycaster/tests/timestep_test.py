@@ -0,0 +1,100 @@
+import pytest
+
+from raycaster.core.config import EngineConfig
+from raycaster.core.engine import RaycastingEngine
+from raycaster.core.map import GameMap
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class SlowRenderer:
+    """Each frame takes frame_times[i] seconds of fake time."""
+
+    def __init__(self, engine, fake_clock, frame_times):
+        self.engine = engine
+        self.clock = fake_clock
+        self.frame_times = list(frame_times)
+        self.alpha = 1.0
+        self.alphas = []
+        self.poses = []
+
+    def render_frame(self):
+        self.alphas.append(self.alpha)
+        self.poses.append(self.engine.player.interpolate(self.alpha)[0])
+        self.clock.now += self.frame_times.pop(0)
+
+    def flip(self):
+        pass
+
+    def tick(self, framerate):
+        if not self.frame_times:
+            self.engine.running = False
+
+
+def run_engine(monkeypatch, frame_times, **config):
+    fake_clock = FakeClock()
+    monkeypatch.setattr("raycaster.core.engine.clock", fake_clock)
+    monkeypatch.setattr(
+        "raycaster.core.engine.GameMap",
+        lambda path: GameMap(data={"grid": [[0] * 50]}),
+    )
+    monkeypatch.setattr("raycaster.core.engine.Renderer", lambda *a: None)
+    engine = RaycastingEngine(
+        EngineConfig(map_path="dummy.json", **config), backend="renderer"
+    )
+    engine.renderer = SlowRenderer(engine, fake_clock, frame_times)
+    ticks = []
+
+    def move():
+        engine.player.x += 1.0
+        ticks.append(fake_clock.now)
+
+    engine.player.update = move
+    engine.run()
+    return engine, ticks
+
+
+def test_simulation_rate_independent_of_frame_time(monkeypatch):
+    # Last frame starts at 0.5 s, rendered at 32 or at 4 frames/s
+    _, fast = run_engine(monkeypatch, [1 / 32] * 17, tick_rate=8.0)
+    _, slow = run_engine(monkeypatch, [0.25] * 3, tick_rate=8.0)
+    # One priming tick plus one per elapsed 1/8 s
+    assert len(fast) == len(slow) == 5
+
+
+def test_render_interpolates_between_ticks(monkeypatch):
+    engine, _ = run_engine(monkeypatch, [0.025] * 8, tick_rate=10.0)
+    alphas = engine.renderer.alphas
+    assert alphas[0] == pytest.approx(0.0)
+    assert alphas[1] == pytest.approx(0.25)
+    assert alphas[2] == pytest.approx(0.5)
+    # Drawn x advances smoothly, a quarter of a tick per frame
+    poses = engine.renderer.poses
+    steps = [b - a for a, b in zip(poses[1:], poses[2:])]
+    assert steps == pytest.approx([0.25] * len(steps))
+
+
+def test_spiral_of_death_cap_drops_updates(monkeypatch):
+    engine, ticks = run_engine(
+        monkeypatch,
+        [1.0, 0.01],
+        tick_rate=10.0,
+        max_updates_per_frame=3,
+    )
+    # Frame 1: priming tick; frame 2: 10 ticks due, 3 run, 7 dropped
+    assert len(ticks) == 4
+    assert engine.dropped_updates == 7
+    assert 0.0 <= engine.alpha < 1.0
+
+
+def test_invalid_timestep_config():
+    with pytest.raises(ValueError):
+        EngineConfig(tick_rate=0)
+    with pytest.raises(ValueError):
+        EngineConfig(max_updates_per_frame=0)
@@ -0,0 +1,75 @@
+"""
+HUD overlays drawn on top of the rendered frame.
+"""
+
+from typing import List, Optional
+
+import pygame
+
+from ..core.plugin import RendererPlugin
+from ..core.profiler import FrameProfiler
+
+
+class ProfilerOverlay(RendererPlugin):
+    """
+    Renderer plugin that prints the profiler's rolling p50/p95/p99 (ms)
+    in the top-left corner of the screen.
+
+    The text is re-rendered every `refresh` frames only; in between the
+    cached surfaces are just blitted.
+    """
+
+    def __init__(
+        self,
+        profiler: FrameProfiler,
+        names: Optional[List[str]] = None,
+        refresh: int = 30,
+        font_size: int = 16,
+        color=(255, 255, 255),
+    ):
+        self.profiler = profiler
+        # None shows the engine phases plus every other recorded name
+        self.names = names
+        self.refresh = refresh
+        self.font_size = font_size
+        self.color = color
+        self._font: Optional[pygame.font.Font] = None
+        self._lines: List[pygame.Surface] = []
+        self._frame = 0
+
+    def _text_lines(self) -> List[str]:
+        stats = self.profiler.stats()
+        names = self.names if self.names is not None else sorted(stats)
+        lines = []
+        for name in names:
+            s = stats.get(name)
+            if s is not None:
+                lines.append(
+                    f"{name:<24} {s['p50']:6.2f} {s['p95']:6.2f} "
+                    f"{s['p99']:6.2f}"
+                )
+        if lines:
+            lines.insert(0, f"{'ms':<24} {'p50':>6} {'p95':>6} {'p99':>6}")
+        return lines
+
+    def needs_redraw(self, renderer) -> bool:
+        # Live stats: keep frames coming while profiling
+        return self.profiler.enabled
+
+    def post_render(self, renderer) -> None:
+        if not self.profiler.enabled:
+            return
+        if self._frame % self.refresh == 0:
+            if self._font is None:
+                if not pygame.font.get_init():
+                    pygame.font.init()
+                self._font = pygame.font.Font(None, self.font_size)
+            self._lines = [
+                self._font.render(line, True, self.color)
+                for line in self._text_lines()
+            ]
+        self._frame += 1
+        y = 4
+        for surface in self._lines:
+            renderer.screen.blit(surface, (4, y))
+            y += surface.get_height()